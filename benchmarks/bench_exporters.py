@@ -0,0 +1,67 @@
+# benchmarks/bench_exporters.py
+#
+# Times the local file exporters writing a large catalogue in batches, and
+# the peak memory each one needs on top of the batch being written.
+#
+# Run from the project root:
+#     python -m benchmarks.bench_exporters [ROW_COUNT]
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Iterator
+
+from scraper.exporters.file_exporters import CsvExporter, JsonLinesExporter, ParquetExporter, pa
+from scraper.models.product_batch import ProductBatch
+
+DEFAULT_ROW_COUNT = 1_000_000
+BATCH_SIZE = 10_000
+
+
+def _batches(count: int) -> Iterator[ProductBatch]:
+    for start in range(0, count, BATCH_SIZE):
+        batch = ProductBatch()
+        for n in range(start, min(start + BATCH_SIZE, count)):
+            batch.append(f"Galvanised Angle {n % 500}mm", f"SKU{n:08d}", n * 0.25, n % 7 or None)
+        yield batch
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROW_COUNT
+    # Build the batches up front so only the export is timed
+    batches = list(_batches(count))
+    variants = [
+        ("csv", lambda path: CsvExporter(path), "prices.csv"),
+        ("csv gzip", lambda path: CsvExporter(path), "prices.csv.gz"),
+        ("jsonl", lambda path: JsonLinesExporter(path), "prices.jsonl"),
+        ("jsonl gzip", lambda path: JsonLinesExporter(path), "prices.jsonl.gz"),
+    ]
+    if pa is not None:
+        variants += [
+            ("parquet snappy", lambda path: ParquetExporter(path), "prices.parquet"),
+            ("parquet zstd", lambda path: ParquetExporter(path, "zstd"), "prices.zstd.parquet"),
+        ]
+    print(f"{count} rows in batches of {BATCH_SIZE}")
+    print(f"{'format':<16} {'seconds':>8} {'rows/s':>10} {'MiB':>8} {'peak MiB':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, make_exporter, file_name in variants:
+            path = os.path.join(directory, file_name)
+            started = time.perf_counter()
+            make_exporter(path).export_stream(iter(batches))
+            elapsed = time.perf_counter() - started
+            # tracemalloc slows the export down, so memory is measured in a
+            # second run
+            tracemalloc.start()
+            make_exporter(path).export_stream(iter(batches))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f"{label:<16} {elapsed:>8.2f} {count / elapsed:>10.0f}"
+                f" {os.path.getsize(path) / 2**20:>8.1f} {peak / 2**20:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# benchmarks/bench_html_parsing.py
+#
+# Compares HTML parsing backends on large synthetic catalogue pages (see
+# fake_supplier_site.render_catalogue_page): BeautifulSoup with html.parser,
+# as the suppliers' parsers were written, against the lxml backend and
+# precompiled selectors of scraper.parsing.html_toolkit, with and without
+# parsing only the product listing region.
+#
+# Run from the project root, e.g.:
+#     python -m benchmarks.bench_html_parsing --products-per-page 2000 --repeat 5
+
+from __future__ import annotations
+import argparse
+import time
+from typing import Callable, Dict, List
+
+from bs4 import BeautifulSoup
+
+from benchmarks.fake_supplier_site import CatalogueOptions, render_catalogue_page
+from scraper.models.product import ProductData
+from scraper.parsing.html_toolkit import (
+    DEFAULT_BACKEND,
+    HTML_PARSER,
+    LXML,
+    Selector,
+    extract_region,
+    parse_html,
+)
+
+PRODUCT = Selector("li.product")
+NAME = Selector(".name")
+SKU = Selector(".sku")
+PRICE = Selector(".price")
+STOCK = Selector(".stock")
+
+LISTING_START = '<ul class="products"'
+LISTING_END = "</ul>"
+
+
+def _price(text: str) -> float:
+    return float(text.lstrip("$").replace(",", ""))
+
+
+def parse_with_beautifulsoup(html_content: str) -> List[ProductData]:
+    """
+    The baseline: a full html.parser tree and selectors compiled per call.
+    """
+    soup = BeautifulSoup(html_content, "html.parser")
+    products = []
+    for item in soup.select("li.product"):
+        stock = item.select_one(".stock")
+        products.append(
+            ProductData(
+                name=item.select_one(".name").get_text(strip=True),
+                sku=item.select_one(".sku").get_text(strip=True),
+                price=_price(item.select_one(".price").get_text(strip=True)),
+                stock=int(stock.get_text()) if stock is not None else None,
+            )
+        )
+    return products
+
+
+def toolkit_parser(backend: str, region: bool) -> Callable[[str], List[ProductData]]:
+    """
+    Returns a parse function using the toolkit with the given backend.
+    """
+
+    def _parse(html_content: str) -> List[ProductData]:
+        if region:
+            html_content = extract_region(html_content, LISTING_START, LISTING_END)
+        root = parse_html(html_content, backend)
+        products = []
+        for item in PRODUCT.select(root):
+            stock = STOCK.text(item)
+            products.append(
+                ProductData(
+                    name=NAME.text(item),
+                    sku=SKU.text(item),
+                    price=_price(PRICE.text(item)),
+                    stock=int(stock) if stock is not None else None,
+                )
+            )
+        return products
+
+    return _parse
+
+
+def variants() -> Dict[str, Callable[[str], List[ProductData]]]:
+    parsers = {
+        "bs4 html.parser": parse_with_beautifulsoup,
+        "toolkit html.parser": toolkit_parser(HTML_PARSER, region=False),
+        "toolkit html.parser, region": toolkit_parser(HTML_PARSER, region=True),
+    }
+    if DEFAULT_BACKEND == LXML:
+        parsers["toolkit lxml"] = toolkit_parser(LXML, region=False)
+        parsers["toolkit lxml, region"] = toolkit_parser(LXML, region=True)
+    return parsers
+
+
+def run_benchmark(pages: List[str], repeat: int) -> List[dict]:
+    """
+    Times each variant over all pages, keeping the best of `repeat` rounds,
+    and checks every variant extracts the same products as the baseline.
+    """
+    expected = [parse_with_beautifulsoup(page) for page in pages]
+    total_bytes = sum(len(page.encode("utf-8")) for page in pages)
+    reports = []
+    for name, parse in variants().items():
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            results = [parse(page) for page in pages]
+            best = min(best, time.perf_counter() - started)
+        if results != expected:
+            raise AssertionError(f"{name} extracted different products")
+        reports.append(
+            {
+                "variant": name,
+                "seconds": best,
+                "mib_per_s": total_bytes / best / 2**20,
+                "products_per_s": sum(len(products) for products in results) / best,
+            }
+        )
+    baseline = reports[0]["seconds"]
+    for report in reports:
+        report["speedup"] = baseline / report["seconds"]
+    return reports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark HTML parsing backends.")
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--products-per-page", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    options = CatalogueOptions(page_count=args.pages, products_per_page=args.products_per_page)
+    pages = [render_catalogue_page(options, page) for page in range(1, args.pages + 1)]
+    reports = run_benchmark(pages, args.repeat)
+
+    print(f"{'variant':<28} {'seconds':>8} {'MiB/s':>7} {'products/s':>11} {'speedup':>8}")
+    for report in reports:
+        print(
+            f"{report['variant']:<28} {report['seconds']:>8.3f} {report['mib_per_s']:>7.1f}"
+            f" {report['products_per_s']:>11.0f} {report['speedup']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/bench_price_normalisation.py
+#
+# Times price normalisation of a large catalogue, as one columnar batch with
+# and without NumPy, and as lists of ProductData.
+#
+# Run from the project root:
+#     python -m benchmarks.bench_price_normalisation [ROW_COUNT]
+
+import sys
+import time
+
+from scraper.core import price_normalisation
+from scraper.core.price_normalisation import PriceNormaliser
+from scraper.models.product_batch import ProductBatch
+
+DEFAULT_ROW_COUNT = 1_000_000
+UNITS = ["m", "length", None, "kg", "sheet"]
+
+
+def _batch(count: int) -> ProductBatch:
+    batch = ProductBatch()
+    for n in range(count):
+        batch.append(f"Galvanised Angle {n % 500}mm", f"SKU{n:08d}", n * 0.25, None, UNITS[n % 5])
+    return batch
+
+
+def _time(label: str, function, count: int) -> None:
+    started = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<20} {elapsed * 1000:>10.1f} {count / elapsed:>14,.0f}")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROW_COUNT
+    normaliser = PriceNormaliser(
+        unit_sizes={"m": 1, "length": 6, "kg": 1},
+        default_unit="length",
+        gst_inclusive=True,
+        decimals=4,
+    )
+    batch = _batch(count)
+    products = list(batch)
+    print(f"{count} rows")
+    print(f"{'variant':<20} {'ms':>10} {'rows/s':>14}")
+    if price_normalisation.np is not None:
+        _time("batch numpy", lambda: normaliser.normalise(batch), count)
+    numpy = price_normalisation.np
+    price_normalisation.np = None
+    try:
+        _time("batch pure python", lambda: normaliser.normalise(batch), count)
+    finally:
+        price_normalisation.np = numpy
+    _time("ProductData list", lambda: normaliser.normalise(products), count)
+
+
+if __name__ == "__main__":
+    main()
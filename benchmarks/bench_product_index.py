@@ -0,0 +1,72 @@
+# benchmarks/bench_product_index.py
+#
+# Builds a product index over several suppliers' catalogues and times
+# opening it, SKU lookups and name searches.
+#
+# Run from the project root:
+#     python -m benchmarks.bench_product_index [PRODUCT_COUNT]
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from scraper.models.product_batch import ProductBatch
+from scraper.storage.product_index import ProductIndex, ProductIndexBuilder
+
+DEFAULT_PRODUCT_COUNT = 1_000_000
+SUPPLIERS = 4
+LOOKUPS = 10_000
+SEARCHES = ["galvanised angle 50x5mm", "stainless flat bar 120x10", "black pipe 200x3mm"]
+
+WORDS = [
+    "Galvanised", "Angle", "Flat", "Bar", "Channel", "Steel", "Aluminium", "Stainless",
+    "Tube", "Round", "Square", "Sheet", "Plate", "Mild", "Black", "Hot", "Rolled", "Pipe",
+]
+
+
+def _catalogue(rng: random.Random, count: int) -> ProductBatch:
+    # Every supplier lists the same SKUs, under different names and prices
+    batch = ProductBatch()
+    for n in range(count):
+        name = " ".join(rng.sample(WORDS, 3)) + f" {rng.randint(10, 300)}x{rng.randint(1, 20)}mm"
+        batch.append(name, f"SKU-{n:07d}", rng.uniform(1, 500), n % 5)
+    return batch
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PRODUCT_COUNT
+    per_supplier = count // SUPPLIERS
+    rng = random.Random(1)
+    builder = ProductIndexBuilder()
+    for supplier in range(SUPPLIERS):
+        builder.add(f"supplier{supplier}", _catalogue(rng, per_supplier))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "products.idx")
+        started = time.perf_counter()
+        builder.write(path)
+        print(f"build:   {time.perf_counter() - started:8.2f} s  ({len(builder)} products, "
+              f"{os.path.getsize(path) / 2**20:.0f} MiB)")
+
+        started = time.perf_counter()
+        index = ProductIndex.open(path)
+        print(f"open:    {(time.perf_counter() - started) * 1e3:8.2f} ms")
+
+        skus = [f"sku{rng.randrange(per_supplier):07d}" for _ in range(LOOKUPS)]
+        started = time.perf_counter()
+        for sku in skus:
+            index.cheapest(sku)
+        print(f"cheapest:{(time.perf_counter() - started) / LOOKUPS * 1e6:8.2f} us per lookup")
+
+        started = time.perf_counter()
+        for _ in range(10):
+            for query in SEARCHES:
+                index.search(query)
+        print(f"search:  {(time.perf_counter() - started) / (10 * len(SEARCHES)) * 1e3:8.2f} ms per query")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_product_memory.py
+#
+# Compares the memory needed to hold scraped products as plain dataclass
+# rows, slotted ProductData rows and a columnar ProductBatch.
+#
+# Run from the project root:
+#     python -m benchmarks.bench_product_memory [ROW_COUNT ...]
+
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from scraper.models.product import ProductData
+from scraper.models.product_batch import ProductBatch
+
+DEFAULT_ROW_COUNTS = (100_000, 1_000_000)
+
+
+@dataclass
+class DictProductData:
+    """
+    ProductData as it was before slots, for comparison.
+    """
+
+    name: str
+    sku: str
+    price: float
+    stock: Optional[int] = None
+
+
+def _row_values(n: int) -> tuple:
+    # Names repeat across sizes/lengths of the same product, SKUs are unique
+    return f"Galvanised Angle {n % 500}mm", f"SKU{n:08d}", n * 0.25, n % 7 or None
+
+
+def _build_dict_rows(count: int) -> list:
+    return [DictProductData(*_row_values(n)) for n in range(count)]
+
+
+def _build_slotted_rows(count: int) -> list:
+    return [ProductData(*_row_values(n)) for n in range(count)]
+
+
+def _build_batch(count: int) -> ProductBatch:
+    batch = ProductBatch()
+    for n in range(count):
+        batch.append(*_row_values(n))
+    return batch
+
+
+def measure(build: Callable[[int], object], count: int) -> tuple:
+    """
+    Returns (bytes retained, peak bytes, seconds) for building `count` rows.
+    """
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build(count)
+    elapsed = time.perf_counter() - started
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained, peak, elapsed
+
+
+def main() -> None:
+    row_counts = [int(arg) for arg in sys.argv[1:]] or DEFAULT_ROW_COUNTS
+    variants = [
+        ("dataclass (dict)", _build_dict_rows),
+        ("ProductData (slots)", _build_slotted_rows),
+        ("ProductBatch", _build_batch),
+    ]
+    print(f"{'rows':>10}  {'representation':<20} {'retained MiB':>12} {'bytes/row':>10} {'build s':>8}")
+    for count in row_counts:
+        for label, build in variants:
+            retained, _, elapsed = measure(build, count)
+            print(
+                f"{count:>10}  {label:<20} {retained / 2**20:>12.1f}"
+                f" {retained / count:>10.1f} {elapsed:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
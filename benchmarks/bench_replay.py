@@ -0,0 +1,82 @@
+# benchmarks/bench_replay.py
+#
+# Records a synthetic catalogue into a page archive, then times reading it
+# back and a full network-free scrape replaying it through the selector
+# parser.
+#
+# Run from the project root:
+#     python -m benchmarks.bench_replay [PAGE_COUNT]
+
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_supplier_site import CatalogueOptions, render_catalogue_page
+from scraper.core.scraper import Scraper
+from scraper.models.page import Page
+from scraper.parsing.selector_parser import SelectorParser
+from scraper.storage.page_archive import PageArchive, PageArchiveWriter
+
+DEFAULT_PAGE_COUNT = 2000
+
+REPLAY_CONFIG = {
+    "name": "bench_replay",
+    "parser_class": SelectorParser,
+    "listing_region": {"start": '<ul class="products"', "end": "</ul>"},
+    "selectors": {
+        "product": "li.product",
+        "name": ".name",
+        "sku": ".sku",
+        "price": ".price",
+        "stock": ".stock",
+    },
+}
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PAGE_COUNT
+    options = CatalogueOptions(page_count=count)
+    pages = [
+        Page(
+            render_catalogue_page(options, page),
+            url=f"https://supplier.example/catalogue?page={page}",
+            headers={"Content-Type": "text/html; charset=utf-8"},
+        )
+        for page in range(1, count + 1)
+    ]
+    raw_bytes = sum(len(page.encode("utf-8")) for page in pages)
+    print(f"{count} pages, {raw_bytes / 2**20:.1f} MiB of HTML")
+    print(f"{'step':<24} {'seconds':>8} {'pages/s':>10} {'MiB':>8}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalogue.arc")
+
+        started = time.perf_counter()
+        writer = PageArchiveWriter(path)
+        for page in pages:
+            writer.write(page)
+        writer.close()
+        elapsed = time.perf_counter() - started
+        size = os.path.getsize(path) / 2**20
+        print(f"{'record':<24} {elapsed:>8.2f} {count / elapsed:>10.0f} {size:>8.1f}")
+
+        archive = PageArchive(path)
+        started = time.perf_counter()
+        read = sum(1 for _ in archive)
+        elapsed = time.perf_counter() - started
+        archive.close()
+        print(f"{'read archive':<24} {elapsed:>8.2f} {read / elapsed:>10.0f}")
+
+        for workers in (0, os.cpu_count() or 1):
+            config = {**REPLAY_CONFIG, "replay_archive": path, "parse_workers": workers}
+            started = time.perf_counter()
+            products = Scraper().scrape_supplier(config)
+            elapsed = time.perf_counter() - started
+            label = f"replay scrape, {workers} workers"
+            print(f"{label:<24} {elapsed:>8.2f} {count / elapsed:>10.0f}")
+            assert len(products) == count * options.products_per_page
+
+
+if __name__ == "__main__":
+    main()
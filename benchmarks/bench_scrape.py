@@ -0,0 +1,373 @@
+# benchmarks/bench_scrape.py
+#
+# End-to-end throughput benchmark for Scraper.scrape_supplier against a
+# local fake supplier site (see fake_supplier_site.py).
+#
+# Run from the project root, e.g.:
+#     python -m benchmarks.bench_scrape --pages 200 --products-per-page 50 \
+#         --latency 0.02 --modes sync concurrent cached
+#
+# Each mode runs in a fresh process so peak RSS figures are comparable.
+
+from __future__ import annotations
+import argparse
+import json
+import logging
+import multiprocessing
+import queue
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from typing import AsyncIterator, Iterator, List, Optional
+
+import requests
+from bs4 import BeautifulSoup
+
+from benchmarks.fake_supplier_site import CatalogueOptions, FakeSupplierSite
+from scraper.core.metrics import metrics
+from scraper.core.scraper import Scraper
+from scraper.interfaces.async_page_fetcher import AsyncPageFetcher
+from scraper.interfaces.authenticator import Authenticator
+from scraper.interfaces.page_fetcher import PageFetcher
+from scraper.interfaces.parser import Parser
+from scraper.models.page import Page
+from scraper.models.product import ProductData
+
+MODES = ("sync", "concurrent", "cached")
+
+
+class BenchStats:
+    """
+    Per-stage counters shared with parse worker processes.
+    """
+
+    FIELDS = ("login_s", "fetch_s", "parse_s", "pages", "bytes", "retries")
+
+    def __init__(self: BenchStats) -> None:
+        self._values = {name: multiprocessing.Value("d", 0.0) for name in self.FIELDS}
+
+    def add(self: BenchStats, name: str, amount: float) -> None:
+        value = self._values[name]
+        with value.get_lock():
+            value.value += amount
+
+    def as_dict(self: BenchStats) -> dict:
+        return {name: value.value for name, value in self._values.items()}
+
+
+class BenchAuthenticator(Authenticator):
+    """
+    Logs in to the fake site with its login form.
+    """
+
+    def __init__(self: BenchAuthenticator, config: dict) -> None:
+        self.config = config
+        self._session = requests.Session()
+
+    def login(self: BenchAuthenticator) -> requests.Session:
+        started = time.perf_counter()
+        response = self._session.post(
+            f"{self.config['base_url']}/login",
+            data={"username": "bench", "password": "bench"},
+        )
+        response.raise_for_status()
+        self.config["bench_stats"].add("login_s", time.perf_counter() - started)
+        return self._session
+
+    def get_session(self: BenchAuthenticator) -> requests.Session:
+        return self._session
+
+
+def _get_with_retry(session: requests.Session, url: str, stats: BenchStats) -> requests.Response:
+    for _ in range(10):
+        response = session.get(url)
+        if response.status_code != 503:
+            response.raise_for_status()
+            return response
+        stats.add("retries", 1)
+    response.raise_for_status()
+    return response
+
+
+def _page_count(html: str) -> int:
+    marker = 'data-pages="'
+    start = html.index(marker) + len(marker)
+    return int(html[start : html.index('"', start)])
+
+
+class BenchPageFetcher(PageFetcher):
+    """
+    Walks the catalogue's pagination one page at a time.
+    """
+
+    def __init__(self: BenchPageFetcher, config: dict) -> None:
+        self.config = config
+
+    def fetch_pages(self: BenchPageFetcher, session: requests.Session) -> Iterator[str]:
+        stats: BenchStats = self.config["bench_stats"]
+        page, page_count = 1, 1
+        while page <= page_count:
+            started = time.perf_counter()
+            response = _get_with_retry(
+                session, f"{self.config['base_url']}/catalogue?page={page}", stats
+            )
+            stats.add("fetch_s", time.perf_counter() - started)
+            stats.add("pages", 1)
+            stats.add("bytes", len(response.content))
+            if page == 1:
+                page_count = _page_count(response.text)
+            yield Page.from_response(response)
+            page += 1
+
+
+class BenchAsyncPageFetcher(AsyncPageFetcher):
+    """
+    Reads the page count from the first page, then fetches the rest concurrently.
+    """
+
+    def __init__(self: BenchAsyncPageFetcher, config: dict) -> None:
+        self.config = config
+
+    async def fetch(
+        self: BenchAsyncPageFetcher, session: requests.Session, url: str, **kwargs
+    ) -> requests.Response:
+        for attempt in range(10):
+            try:
+                return await super().fetch(session, url, **kwargs)
+            except requests.HTTPError as e:
+                if e.response.status_code != 503 or attempt == 9:
+                    raise
+                self.config["bench_stats"].add("retries", 1)
+
+    async def fetch_pages(
+        self: BenchAsyncPageFetcher, session: requests.Session
+    ) -> AsyncIterator[str]:
+        stats: BenchStats = self.config["bench_stats"]
+        base_url = self.config["base_url"]
+        started = time.perf_counter()
+        first = await self.fetch(session, f"{base_url}/catalogue?page=1")
+        stats.add("fetch_s", time.perf_counter() - started)
+        stats.add("pages", 1)
+        stats.add("bytes", len(first.content))
+        yield Page.from_response(first)
+
+        urls = [
+            f"{base_url}/catalogue?page={page}"
+            for page in range(2, _page_count(first.text) + 1)
+        ]
+        started = time.perf_counter()
+        async for response in self.fetch_all(session, urls):
+            stats.add("fetch_s", time.perf_counter() - started)
+            stats.add("pages", 1)
+            stats.add("bytes", len(response.content))
+            yield Page.from_response(response)
+            started = time.perf_counter()
+
+
+class BenchParser(Parser):
+    """
+    Parses catalogue pages with BeautifulSoup's html.parser.
+    """
+
+    def __init__(self: BenchParser, config: dict) -> None:
+        self.config = config
+
+    def parse(self: BenchParser, html_content: str) -> List[ProductData]:
+        started = time.perf_counter()
+        soup = BeautifulSoup(html_content, "html.parser")
+        products = []
+        for item in soup.select("li.product"):
+            stock = item.select_one(".stock")
+            products.append(
+                ProductData(
+                    name=item.select_one(".name").get_text(strip=True),
+                    sku=item.select_one(".sku").get_text(strip=True),
+                    price=float(
+                        item.select_one(".price").get_text(strip=True).lstrip("$").replace(",", "")
+                    ),
+                    stock=int(stock.get_text()) if stock is not None else None,
+                )
+            )
+        self.config["bench_stats"].add("parse_s", time.perf_counter() - started)
+        return products
+
+
+def mode_config(mode: str, base_url: str, cache_dir: str, parse_workers: int) -> dict:
+    """
+    Builds the supplier configuration for one benchmark mode.
+    """
+    config = {
+        "name": "bench_supplier",
+        "base_url": base_url,
+        "authenticator_class": BenchAuthenticator,
+        "page_fetcher_class": BenchPageFetcher,
+        "parser_class": BenchParser,
+    }
+    if mode == "concurrent":
+        config.update(
+            page_fetcher_class=BenchAsyncPageFetcher,
+            max_connections_per_host=8,
+            parse_workers=parse_workers,
+        )
+    elif mode == "cached":
+        config.update(http_cache_dir=cache_dir)
+    return config
+
+
+def _run_mode(mode: str, base_url: str, parse_workers: int, results: multiprocessing.Queue) -> None:
+    # Retries are expected when --error-rate is set; keep the report readable
+    logging.basicConfig(level=logging.ERROR)
+    cache_dir = tempfile.mkdtemp(prefix="bench_http_cache_")
+    try:
+        config = mode_config(mode, base_url, cache_dir, parse_workers)
+        if mode == "cached":
+            # Warm the cache; the measured run then only revalidates
+            config["bench_stats"] = BenchStats()
+            Scraper().scrape_supplier(config)
+        config["bench_stats"] = BenchStats()
+        metrics.enable()
+        metrics.reset()
+        started = time.perf_counter()
+        products = Scraper().scrape_supplier(config)
+        elapsed = time.perf_counter() - started
+        stats = config["bench_stats"].as_dict()
+        # Retries made by the session's resilience layer
+        stats["retries"] += metrics.for_supplier(config["name"]).counters.get("retries", 0)
+        results.put(
+            {
+                "mode": mode,
+                "seconds": elapsed,
+                "pages": int(stats["pages"]),
+                "products": len(products),
+                "pages_per_s": stats["pages"] / elapsed,
+                "products_per_s": len(products) / elapsed,
+                "bytes": int(stats["bytes"]),
+                "retries": int(stats["retries"]),
+                "login_s": stats["login_s"],
+                "fetch_s": stats["fetch_s"],
+                "parse_s": stats["parse_s"],
+                # ru_maxrss is in KiB on Linux
+                "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                "peak_worker_rss_mib": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+                / 1024,
+            }
+        )
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def _wait_for_report(
+    mode: str, process: multiprocessing.Process, results, timeout: float
+) -> Optional[dict]:
+    """
+    Waits for a mode's process to report, and returns None (after printing
+    why) if it exits without a report or runs past `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return results.get(timeout=1.0)
+        except queue.Empty:
+            pass
+        if not process.is_alive():
+            # A report put just before exiting may still be in the pipe
+            try:
+                return results.get(timeout=1.0)
+            except queue.Empty:
+                print(
+                    f"error: mode {mode} exited with code {process.exitcode} "
+                    "without a report",
+                    file=sys.stderr,
+                )
+                return None
+        if time.monotonic() > deadline:
+            print(
+                f"error: mode {mode} did not finish in {timeout:.0f}s", file=sys.stderr
+            )
+            process.terminate()
+            return None
+
+
+def run_benchmark(
+    options: CatalogueOptions,
+    modes: List[str],
+    parse_workers: int,
+    timeout: float = 600.0,
+) -> List[dict]:
+    """
+    Serves the fake catalogue and runs each mode in its own process. Modes
+    that fail or run past `timeout` seconds are left out of the reports.
+    """
+    context = multiprocessing.get_context("spawn")
+    reports = []
+    with FakeSupplierSite(options) as site:
+        for mode in modes:
+            results = context.Queue()
+            process = context.Process(
+                target=_run_mode, args=(mode, site.base_url, parse_workers, results)
+            )
+            process.start()
+            report = _wait_for_report(mode, process, results, timeout)
+            process.join()
+            if report is not None:
+                reports.append(report)
+    return reports
+
+
+def print_report(reports: List[dict]) -> None:
+    columns = [
+        ("mode", 11, "{:<11}"),
+        ("seconds", 8, "{:>8.2f}"),
+        ("pages/s", 9, "{:>9.1f}"),
+        ("products/s", 11, "{:>11.0f}"),
+        ("login s", 8, "{:>8.3f}"),
+        ("fetch s", 8, "{:>8.2f}"),
+        ("parse s", 8, "{:>8.2f}"),
+        ("retries", 7, "{:>7}"),
+        ("RSS MiB", 8, "{:>8.1f}"),
+        ("worker RSS MiB", 14, "{:>14.1f}"),
+    ]
+    keys = [
+        "mode", "seconds", "pages_per_s", "products_per_s", "login_s", "fetch_s",
+        "parse_s", "retries", "peak_rss_mib", "peak_worker_rss_mib",
+    ]
+    print(" ".join(f"{title:>{width}}" for title, width, _ in columns))
+    for report in reports:
+        print(" ".join(fmt.format(report[key]) for key, (_, _, fmt) in zip(keys, columns)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the scrape pipeline.")
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--products-per-page", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds per response.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503s.")
+    parser.add_argument("--parse-workers", type=int, default=2)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument(
+        "--timeout", type=float, default=600.0, help="Seconds allowed per mode."
+    )
+    parser.add_argument("--json", help="Also write the results to this JSON file.")
+    args = parser.parse_args()
+
+    options = CatalogueOptions(
+        page_count=args.pages,
+        products_per_page=args.products_per_page,
+        latency=args.latency,
+        error_rate=args.error_rate,
+    )
+    reports = run_benchmark(options, args.modes, args.parse_workers, args.timeout)
+    print_report(reports)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"options": vars(args), "results": reports}, f, indent=2)
+    if any(report["products"] != args.pages * args.products_per_page for report in reports):
+        print("warning: product count does not match the catalogue size", file=sys.stderr)
+    if len(reports) != len(args.modes):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# benchmarks/fake_supplier_site.py
+#
+# A local HTTP stand-in for a supplier website, serving a synthetic
+# paginated catalogue behind a form login.
+
+from __future__ import annotations
+import hashlib
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+SESSION_COOKIE = "bench_session=ok"
+
+
+@dataclass
+class CatalogueOptions:
+    """
+    Shape and behaviour of the synthetic catalogue.
+    """
+
+    page_count: int = 100
+    products_per_page: int = 50
+    latency: float = 0.0  # seconds added to every response
+    error_rate: float = 0.0  # fraction of catalogue requests answered with 503
+    seed: int = 0
+
+
+def render_catalogue_page(options: CatalogueOptions, page: int) -> str:
+    """
+    Renders one listing page in the markup the benchmark parser expects.
+    """
+    first = (page - 1) * options.products_per_page
+    items = []
+    for n in range(first, first + options.products_per_page):
+        stock = "" if n % 5 == 0 else f'<span class="stock">{n % 40}</span>'
+        items.append(
+            '<li class="product">'
+            f'<a class="name" href="/products/{n}">Galvanised Angle {n % 97}x{n % 13}mm</a>'
+            f'<span class="sku">SKU{n:07d}</span>'
+            f'<span class="price">${n % 400 + 0.95:,.2f}</span>'
+            f"{stock}</li>"
+        )
+    return (
+        "<!DOCTYPE html><html><head><title>Catalogue</title></head><body>"
+        '<header><nav><a href="/">Home</a><a href="/account">Account</a></nav></header>'
+        f'<main><nav class="pagination" data-pages="{options.page_count}"></nav>'
+        f'<ul class="products">{"".join(items)}</ul></main>'
+        "<footer>" + "<p>Terms and conditions apply.</p>" * 20 + "</footer>"
+        "</body></html>"
+    )
+
+
+class _CatalogueHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    options: CatalogueOptions
+    rng: random.Random
+    rng_lock: threading.Lock
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes = b"", headers: Optional[dict] = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        form = parse_qs(self.rfile.read(length).decode())
+        if urlsplit(self.path).path != "/login":
+            self._send(404)
+        elif form.get("username") and form.get("password"):
+            self._send(200, b"welcome", {"Set-Cookie": f"{SESSION_COOKIE}; Path=/"})
+        else:
+            self._send(401)
+
+    def do_GET(self) -> None:
+        if self.options.latency:
+            time.sleep(self.options.latency)
+        parts = urlsplit(self.path)
+        if parts.path != "/catalogue":
+            self._send(404)
+            return
+        if SESSION_COOKIE not in (self.headers.get("Cookie") or ""):
+            self._send(403)
+            return
+        with self.rng_lock:
+            failed = self.rng.random() < self.options.error_rate
+        if failed:
+            self._send(503, headers={"Retry-After": "0"})
+            return
+        page = int(parse_qs(parts.query).get("page", ["1"])[0])
+        if not 1 <= page <= self.options.page_count:
+            self._send(404)
+            return
+        body = render_catalogue_page(self.options, page).encode()
+        etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, headers={"ETag": etag})
+            return
+        self._send(200, body, {"Content-Type": "text/html; charset=utf-8", "ETag": etag})
+
+
+class FakeSupplierSite:
+    """
+    Runs the fake catalogue on a local port in a background thread.
+
+    Usage:
+        with FakeSupplierSite(CatalogueOptions(page_count=10)) as site:
+            ... site.base_url ...
+    """
+
+    def __init__(self: FakeSupplierSite, options: CatalogueOptions) -> None:
+        handler = type(
+            "CatalogueHandler",
+            (_CatalogueHandler,),
+            {
+                "options": options,
+                "rng": random.Random(options.seed),
+                "rng_lock": threading.Lock(),
+            },
+        )
+        self.options = options
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self: FakeSupplierSite) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def __enter__(self: FakeSupplierSite) -> FakeSupplierSite:
+        self._thread.start()
+        return self
+
+    def __exit__(self: FakeSupplierSite, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -6,15 +6,25 @@
 import logging
 import argparse
 import os
+import signal
 import sys
+import threading
 
 # Configure basic logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+from scraper.core.metrics import metrics
+
 # Import functions from the supplier manager
-from scraper.supplier_manager import load_all_suppliers, get_available_suppliers, run_supplier
+from scraper.supplier_manager import (
+    load_all_suppliers,
+    get_available_suppliers,
+    get_supplier_config,
+    run_supplier,
+    run_suppliers,
+)
 
 
 def list_suppliers():
@@ -27,22 +37,106 @@ def list_suppliers():
         logging.info(f"- {supplier}")
 
 
-def start_scraping_process(supplier_name: str = None):
+def start_scraping_process(
+    supplier_name: str = None,
+    concurrency: int = 1,
+    resume: bool = False,
+    overrides: dict = None,
+):
     """
     Initiates the main scraper process for the specified supplier(s).
+
+    When scraping all suppliers, up to `concurrency` suppliers run at once.
+    With `resume` set, suppliers continue from their last checkpoint.
+    `overrides` are set in every supplier's configuration.
+    Returns True if every supplier finished successfully.
     """
     if supplier_name:
         logging.info(f"Initiating scraper process for supplier: {supplier_name}")
-        run_supplier(supplier_name)
+        run_supplier(supplier_name, resume=resume, overrides=overrides)
         logging.info(f"Scraping process finished for {supplier_name}.")
+        return True
     else:
         logging.info("Initiating scraper process for all configured suppliers.")
         available_suppliers = get_available_suppliers()
 
         logging.info(f"Scraping {len(available_suppliers)} suppliers: {', '.join(available_suppliers)}")
-        for supplier in available_suppliers:
-            run_supplier(supplier)
+        results = run_suppliers(
+            available_suppliers,
+            max_workers=concurrency,
+            resume=resume,
+            overrides=overrides,
+        )
         logging.info("Scraping process finished for all configured suppliers.")
+        return all(error is None for error in results.values())
+
+
+def run_profiled(
+    supplier_names: list, profile_dir: str, resume: bool = False, overrides: dict = None
+):
+    """
+    Runs suppliers one at a time under cProfile and tracemalloc, writing a
+    profile and allocation snapshot per supplier to `profile_dir` (see
+    SupplierProfiler). Returns True if every supplier finished successfully.
+    """
+    # Imported here so other commands do not pay for importing the profilers
+    from scraper.core.profiling import PROFILE_OVERRIDES, SupplierProfiler
+
+    succeeded = True
+    for supplier_name in supplier_names:
+        try:
+            with SupplierProfiler(profile_dir, supplier_name):
+                run_supplier(
+                    supplier_name,
+                    resume=resume,
+                    overrides={**(overrides or {}), **PROFILE_OVERRIDES},
+                )
+        except Exception as e:
+            logging.error(f"Scraper for supplier '{supplier_name}' failed: {e!r}", exc_info=e)
+            succeeded = False
+    return succeeded
+
+
+def run_daemon(
+    supplier_name: str = None,
+    concurrency: int = 1,
+    overrides: dict = None,
+    on_run_finished=None,
+):
+    """
+    Keeps scraping the specified supplier(s) on the intervals and priorities
+    set in suppliers.yaml until interrupted, with up to `concurrency`
+    suppliers running at once. `on_run_finished` is called after each run.
+    """
+    from scraper.scheduler import Scheduler
+
+    supplier_names = [supplier_name] if supplier_name else get_available_suppliers()
+
+    def _run(name):
+        try:
+            run_supplier(name, overrides=overrides)
+        finally:
+            if on_run_finished is not None:
+                on_run_finished()
+
+    scheduler = Scheduler.from_configs(
+        {name: get_supplier_config(name) for name in supplier_names},
+        _run,
+        max_concurrency=concurrency,
+    )
+    for name, due_in in scheduler.schedule():
+        logging.info(f"- {name}: first run in {due_in:.0f}s")
+
+    stop = threading.Event()
+
+    def _request_stop(signum, frame):
+        logging.info("Stopping after the runs in progress finish...")
+        stop.set()
+
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGTERM, _request_stop)
+    logging.info(f"Daemon scheduling {len(supplier_names)} supplier(s)")
+    scheduler.run_forever(stop)
 
 
 def set_up_argparse():
@@ -57,10 +151,77 @@ def set_up_argparse():
         action="store_true",
         help="List all configured suppliers instead of scraping.",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of suppliers to scrape in parallel when scraping all suppliers (default: 1).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue interrupted runs from their last checkpoint (suppliers configured with 'checkpoint_dir').",
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        metavar="DIR",
+        help="Profile each supplier run (one at a time) with cProfile and tracemalloc, writing the profiles and a report to DIR.",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and scrape each supplier on its 'schedule_interval' from suppliers.yaml, up to --concurrency at once.",
+    )
+    parser.add_argument(
+        "--work-queue",
+        type=str,
+        help="Scrape in distributed mode: split each supplier into work units on this SQLite queue file.",
+    )
+    parser.add_argument(
+        "--local-workers",
+        type=int,
+        help="Worker processes to start on this host in distributed mode (default: 1; 0 relies on --worker processes).",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Run as a worker, scraping work units from --work-queue until stopped.",
+    )
+    parser.add_argument(
+        "--worker-idle-timeout",
+        type=float,
+        help="Stop the worker after this many seconds without work.",
+    )
+
+    parser.add_argument(
+        "--metrics-json",
+        type=str,
+        help="Collect per-supplier timings and counters and write them to this JSON file.",
+    )
+    parser.add_argument(
+        "--metrics-prometheus",
+        type=str,
+        help="Collect per-supplier timings and counters and write them to this file in Prometheus text format.",
+    )
 
     return parser
 
 
+def write_metrics(json_path: str = None, prometheus_path: str = None):
+    """
+    Writes the collected run metrics to the requested files.
+    """
+    if json_path:
+        with open(json_path, "w") as f:
+            f.write(metrics.to_json())
+        logging.info(f"Wrote run metrics to {json_path}")
+    if prometheus_path:
+        with open(prometheus_path, "w") as f:
+            f.write(metrics.to_prometheus())
+        logging.info(f"Wrote run metrics to {prometheus_path}")
+
+
 def main():
     logging.info("Starting pricing scraper production run...")
 
@@ -70,13 +231,55 @@ def main():
     parser = set_up_argparse()
     args = parser.parse_args()
 
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.profile and (args.daemon or args.worker):
+        parser.error("--profile cannot be combined with --daemon or --worker")
+    if args.worker and not args.work_queue:
+        parser.error("--worker requires --work-queue")
+    if args.local_workers is not None and args.local_workers < 0:
+        parser.error("--local-workers must not be negative")
+    if args.metrics_json or args.metrics_prometheus:
+        metrics.enable()
+
+    overrides = {}
+    if args.work_queue:
+        overrides["work_queue"] = args.work_queue
+    if args.local_workers is not None:
+        overrides["local_workers"] = args.local_workers
+
+    succeeded = True
     if args.list_suppliers:
         list_suppliers()
+    elif args.profile:
+        supplier_names = [args.supplier] if args.supplier else get_available_suppliers()
+        succeeded = run_profiled(supplier_names, args.profile, args.resume, overrides)
+        write_metrics(args.metrics_json, args.metrics_prometheus)
+    elif args.daemon:
+        # Metrics accumulate across runs; rewrite the files after each one
+        metrics_lock = threading.Lock()
+
+        def _write_metrics():
+            with metrics_lock:
+                write_metrics(args.metrics_json, args.metrics_prometheus)
+
+        run_daemon(args.supplier, args.concurrency, overrides, on_run_finished=_write_metrics)
+    elif args.worker:
+        # Imported here as workers pull in the whole scraping stack
+        from scraper.distributed.worker import run_worker
+
+        run_worker(args.work_queue, idle_timeout=args.worker_idle_timeout)
+        write_metrics(args.metrics_json, args.metrics_prometheus)
     else:
         # Call the main process function with the parsed supplier name
-        start_scraping_process(args.supplier)
+        succeeded = start_scraping_process(
+            args.supplier, args.concurrency, resume=args.resume, overrides=overrides
+        )
+        write_metrics(args.metrics_json, args.metrics_prometheus)
 
     logging.info("Pricing scraper production script finished.")
+    if not succeeded:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,178 @@
+# scraper/core/checkpoint.py
+
+from __future__ import annotations
+import dataclasses
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from scraper.models.product import ProductData
+
+DEFAULT_CHECKPOINT_INTERVAL = 50
+
+
+@dataclass
+class Checkpoint:
+    """
+    How far a supplier's scrape got before it stopped.
+
+    Attributes:
+        cursor: The page fetcher's position after the last checkpointed page,
+                or None if the fetcher does not support cursors.
+        pages_done: Number of pages fetched and parsed.
+        product_count: Number of products saved so far.
+        products_bytes: Length of the products file at this checkpoint.
+    """
+
+    cursor: Any
+    pages_done: int
+    product_count: int
+    products_bytes: int
+
+
+class CheckpointStore:
+    """
+    Records a supplier scrape's progress so that an interrupted run can be
+    resumed instead of starting again.
+
+    Parsed products are appended to a JSON Lines file as they arrive. Every
+    `interval` pages the file is flushed to disk and a small state file is
+    atomically replaced with the fetcher's cursor and the number of products
+    written so far, so a crash loses at most `interval` pages of work.
+    """
+
+    def __init__(
+        self: CheckpointStore,
+        directory: str,
+        supplier_name: str,
+        interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+    ) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.state_path = os.path.join(directory, f"{supplier_name}.state.json")
+        self.products_path = os.path.join(directory, f"{supplier_name}.products.jsonl")
+        self.interval = max(1, interval)
+        self._products_file = None
+        self._pages_done = 0
+        self._product_count = 0
+        self._pages_since_commit = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional[CheckpointStore]:
+        """
+        Opens the supplier's checkpoint store if 'checkpoint_dir' is configured.
+
+        Supplier configuration keys:
+            - 'checkpoint_dir': Directory for checkpoint files.
+            - 'checkpoint_interval': Pages between checkpoints (default 50).
+        """
+        directory = config.get("checkpoint_dir")
+        if not directory:
+            return None
+        return cls(
+            directory,
+            config.get("name") or "default",
+            interval=int(config.get("checkpoint_interval", DEFAULT_CHECKPOINT_INTERVAL)),
+        )
+
+    def load(self: CheckpointStore) -> Optional[Checkpoint]:
+        """
+        Returns the last committed checkpoint, or None if there is none.
+        """
+        if not os.path.exists(self.state_path):
+            return None
+        with open(self.state_path) as f:
+            return Checkpoint(**json.load(f))
+
+    def iter_saved_products(
+        self: CheckpointStore, checkpoint: Checkpoint, batch_size: int = 1000
+    ) -> Iterator[List[ProductData]]:
+        """
+        Yields the products saved up to `checkpoint`, in batches.
+        """
+        batch: List[ProductData] = []
+        with open(self.products_path, "rb") as f:
+            remaining = checkpoint.products_bytes
+            for line in f:
+                remaining -= len(line)
+                if remaining < 0:
+                    break
+                batch.append(ProductData(**json.loads(line)))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def start(self: CheckpointStore, resume_from: Optional[Checkpoint] = None) -> None:
+        """
+        Begins recording, either afresh or continuing after `resume_from`.
+        """
+        if resume_from is None:
+            self._products_file = open(self.products_path, "wb")
+            self._pages_done = 0
+            self._product_count = 0
+            if os.path.exists(self.state_path):
+                os.remove(self.state_path)
+        else:
+            # Drop anything written after the checkpoint was committed
+            self._products_file = open(self.products_path, "r+b")
+            self._products_file.truncate(resume_from.products_bytes)
+            self._products_file.seek(resume_from.products_bytes)
+            self._pages_done = resume_from.pages_done
+            self._product_count = resume_from.product_count
+        self._pages_since_commit = 0
+
+    def record_page(
+        self: CheckpointStore, products: Iterable[ProductData], cursor: Any
+    ) -> None:
+        """
+        Saves the products parsed from one page, committing a checkpoint
+        every `interval` pages.
+        """
+        lines = [
+            json.dumps(dataclasses.asdict(product)).encode("utf-8") + b"\n"
+            for product in products
+        ]
+        self._products_file.write(b"".join(lines))
+        self._product_count += len(lines)
+        self._pages_done += 1
+        self._pages_since_commit += 1
+        if self._pages_since_commit >= self.interval:
+            self.commit(cursor)
+
+    def commit(self: CheckpointStore, cursor: Any) -> None:
+        """
+        Makes the progress so far durable.
+        """
+        self._products_file.flush()
+        os.fsync(self._products_file.fileno())
+        state = Checkpoint(
+            cursor=cursor,
+            pages_done=self._pages_done,
+            product_count=self._product_count,
+            products_bytes=self._products_file.tell(),
+        )
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(dataclasses.asdict(state), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.state_path)
+        self._pages_since_commit = 0
+        logging.debug(f"Checkpoint saved after {self._pages_done} page(s)")
+
+    def close(self: CheckpointStore) -> None:
+        if self._products_file is not None:
+            self._products_file.close()
+            self._products_file = None
+
+    def clear(self: CheckpointStore) -> None:
+        """
+        Removes the checkpoint after a run completes.
+        """
+        self.close()
+        for path in (self.state_path, self.products_path):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,104 @@
+# scraper/core/generic_supplier.py
+#
+# Runs suppliers described entirely in config/suppliers.yaml: an optional
+# form login, a list or template of listing page URLs, and the selectors
+# used by SelectorParser. The supplier manager uses this module for any
+# supplier whose configuration has 'selectors' but no directory of its own.
+
+from __future__ import annotations
+import logging
+
+import requests
+
+from scraper.core.scraper import Scraper
+from scraper.core.url_list_page_fetcher import UrlListPageFetcher
+from scraper.discovery.incremental_fetcher import (
+    IncrementalPageFetcher,
+    uses_incremental_discovery,
+)
+from scraper.exporters.registry import create_exporter
+from scraper.http.resilience import install_resilience
+from scraper.interfaces.authenticator import Authenticator
+from scraper.parsing.selector_parser import SelectorParser
+
+
+class FormLoginAuthenticator(Authenticator):
+    """
+    Logs in by posting a username and password to a login form, or uses an
+    anonymous session when no 'login_url' is configured.
+
+    Supplier configuration keys:
+        - 'login_url', 'username', 'password': The form and credentials.
+        - 'login_fields' (optional): Form field names for the credentials,
+          as a mapping with 'username' and 'password' (default the same).
+        - 'login_extra_fields' (optional): Other form fields to post.
+    """
+
+    def __init__(self: FormLoginAuthenticator, config: dict) -> None:
+        self.config = config
+        self._session = requests.Session()
+        install_resilience(self._session, config)
+
+    def login(self: FormLoginAuthenticator) -> requests.Session:
+        login_url = self.config.get("login_url")
+        if not login_url:
+            return self._session
+        username = self.config.get("username")
+        password = self.config.get("password")
+        if not username or not password:
+            raise ValueError(
+                f"Supplier '{self.config.get('name')}' has a login_url "
+                "but no username or password"
+            )
+        fields = self.config.get("login_fields") or {}
+        form = {
+            fields.get("username", "username"): username,
+            fields.get("password", "password"): password,
+            **(self.config.get("login_extra_fields") or {}),
+        }
+        try:
+            response = self._session.post(login_url, data=form)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logging.error(f"FormLoginAuthenticator: Login to {login_url} failed: {e}")
+            raise ValueError from e
+        logging.info(f"FormLoginAuthenticator: Logged in to {login_url}")
+        return self._session
+
+    def get_session(self: FormLoginAuthenticator) -> requests.Session:
+        return self._session
+
+
+def scraper_config(config: dict) -> dict:
+    """
+    Adds the generic components to a supplier's configuration. Suppliers
+    with sitemaps or 'listing_discovery' configured fetch only changed
+    product pages (see IncrementalPageFetcher).
+    """
+    if uses_incremental_discovery(config):
+        page_fetcher_class = IncrementalPageFetcher
+    else:
+        page_fetcher_class = UrlListPageFetcher
+    return {
+        'authenticator_class': FormLoginAuthenticator,
+        'page_fetcher_class': page_fetcher_class,
+        'parser_class': SelectorParser,
+        **config,
+    }
+
+
+def run(config):
+    """
+    Runs the scraper for a supplier configured only in suppliers.yaml.
+    """
+    logging.info(f"Running configured supplier {config.get('name')}...")
+    scraper = Scraper()
+    exporter = create_exporter(config)
+    if exporter is not None:
+        exported = scraper.scrape_and_export(scraper_config(config), exporter)
+        logging.info(f"Supplier {config.get('name')} finished. Exported {exported} product(s).")
+        return
+    scraped_data = scraper.scrape_supplier(scraper_config(config))
+    logging.info(
+        f"Supplier {config.get('name')} finished. Scraped {len(scraped_data)} product(s)."
+    )
@@ -0,0 +1,205 @@
+# scraper/core/metrics.py
+
+from __future__ import annotations
+import contextlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+
+@dataclass
+class TimerStats:
+    """
+    Accumulated timings for one stage.
+    """
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def observe(self: TimerStats, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+
+class SupplierMetrics:
+    """
+    Stage timers and counters for one supplier.
+
+    Timer names used by the core: 'login', 'fetch' (time spent waiting for
+    each page), 'parse' (each Parser.parse call), 'normalise' (each batch's
+    price normalisation), 'export' and 'run'.
+    Counter names: 'pages', 'bytes', 'products', 'parse_cache_hits',
+    'unchanged_pages', 'retries', 'logins', 'session_reuses' and 'errors'.
+    """
+
+    enabled = True
+
+    def __init__(self: SupplierMetrics) -> None:
+        self.timers: Dict[str, TimerStats] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self: SupplierMetrics, name: str, seconds: float) -> None:
+        """
+        Records one timing for the named stage.
+        """
+        with self._lock:
+            stats = self.timers.get(name)
+            if stats is None:
+                stats = self.timers[name] = TimerStats()
+            stats.observe(seconds)
+
+    @contextlib.contextmanager
+    def timer(self: SupplierMetrics, name: str) -> Iterator[None]:
+        """
+        Times the body of a with-block as one observation of `name`.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def incr(self: SupplierMetrics, name: str, amount: float = 1) -> None:
+        """
+        Adds `amount` to the named counter.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def to_dict(self: SupplierMetrics) -> dict:
+        with self._lock:
+            return {
+                "timers": {
+                    name: {"count": stats.count, "total_s": stats.total, "max_s": stats.max}
+                    for name, stats in self.timers.items()
+                },
+                "counters": dict(self.counters),
+            }
+
+
+class _DisabledSupplierMetrics(SupplierMetrics):
+    """
+    Stand-in used while metrics are disabled; every method does nothing.
+    """
+
+    enabled = False
+
+    def observe(self: _DisabledSupplierMetrics, name: str, seconds: float) -> None:
+        pass
+
+    def timer(self: _DisabledSupplierMetrics, name: str) -> contextlib.nullcontext:
+        return contextlib.nullcontext()
+
+    def incr(self: _DisabledSupplierMetrics, name: str, amount: float = 1) -> None:
+        pass
+
+
+_DISABLED = _DisabledSupplierMetrics()
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """
+    Holds SupplierMetrics for every supplier in a run.
+
+    Disabled by default, in which case for_supplier hands out a shared no-op
+    object and instrumented code pays almost nothing.
+    """
+
+    def __init__(self: MetricsRegistry) -> None:
+        self.enabled = False
+        self._suppliers: Dict[str, SupplierMetrics] = {}
+        self._lock = threading.Lock()
+
+    def enable(self: MetricsRegistry) -> None:
+        self.enabled = True
+
+    def reset(self: MetricsRegistry) -> None:
+        with self._lock:
+            self._suppliers.clear()
+
+    def for_supplier(self: MetricsRegistry, supplier_name: Optional[str]) -> SupplierMetrics:
+        """
+        Returns the metrics for a supplier, creating them on first use.
+        """
+        if not self.enabled:
+            return _DISABLED
+        supplier_name = supplier_name or "unknown"
+        with self._lock:
+            supplier_metrics = self._suppliers.get(supplier_name)
+            if supplier_metrics is None:
+                supplier_metrics = self._suppliers[supplier_name] = SupplierMetrics()
+            return supplier_metrics
+
+    def to_dict(self: MetricsRegistry) -> dict:
+        with self._lock:
+            suppliers = dict(self._suppliers)
+        return {name: supplier_metrics.to_dict() for name, supplier_metrics in suppliers.items()}
+
+    def to_json(self: MetricsRegistry) -> str:
+        return json.dumps(self.to_dict(), indent=2, sort_keys=True)
+
+    def to_prometheus(self: MetricsRegistry) -> str:
+        """
+        Renders the metrics in the Prometheus text exposition format.
+        """
+        data = self.to_dict()
+        lines = []
+
+        def _family(name: str, kind: str, help_text: str, samples: list) -> None:
+            if not samples:
+                return
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(
+                    f'{key}="{_escape_label(str(label))}"' for key, label in labels.items()
+                )
+                lines.append(f"{name}{{{label_text}}} {value!r}")
+
+        stage_samples = {"total_s": [], "count": [], "max_s": []}
+        counter_samples: Dict[str, list] = {}
+        for supplier, supplier_data in sorted(data.items()):
+            for stage, stats in sorted(supplier_data["timers"].items()):
+                labels = {"supplier": supplier, "stage": stage}
+                for key in stage_samples:
+                    stage_samples[key].append((labels, stats[key]))
+            for counter, value in sorted(supplier_data["counters"].items()):
+                counter_samples.setdefault(counter, []).append(({"supplier": supplier}, value))
+
+        _family(
+            "scraper_stage_seconds_total",
+            "counter",
+            "Total time spent in each scrape stage.",
+            stage_samples["total_s"],
+        )
+        _family(
+            "scraper_stage_calls_total",
+            "counter",
+            "Number of timed calls of each scrape stage.",
+            stage_samples["count"],
+        )
+        _family(
+            "scraper_stage_seconds_max",
+            "gauge",
+            "Longest single call of each scrape stage.",
+            stage_samples["max_s"],
+        )
+        for counter, samples in sorted(counter_samples.items()):
+            _family(
+                f"scraper_{counter}_total", "counter", f"Total {counter} per supplier.", samples
+            )
+        return "\n".join(lines) + "\n"
+
+
+# Metrics for the current process; enabled by main.py when requested
+metrics = MetricsRegistry()
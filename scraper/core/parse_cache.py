@@ -0,0 +1,171 @@
+# scraper/core/parse_cache.py
+
+from __future__ import annotations
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from scraper.interfaces.parser import Parser
+from scraper.models.page import page_url
+from scraper.models.product import ProductData
+
+DEFAULT_PARSE_CACHE_MAX_AGE_DAYS = 30
+
+
+def content_hash(page_content: str) -> str:
+    """
+    Returns a stable hash of a page's content.
+    """
+    return hashlib.blake2b(page_content.encode("utf-8"), digest_size=20).hexdigest()
+
+
+def parser_identity(parser_class: Type[Parser], config: Dict[str, Any]) -> str:
+    """
+    Identifies the parser that produced cached rows. Cached rows from another
+    parser, or another 'parser_version' of the same parser, are not reused.
+    """
+    version = config.get("parser_version", "")
+    return f"{parser_class.__module__}.{parser_class.__qualname__}:{version}"
+
+
+class ParseCache:
+    """
+    Persistent index from page content hashes to the ProductData rows parsed
+    from them, for one supplier.
+
+    Pages with a known URL are indexed by URL, so each URL keeps only the
+    rows for its latest content. Pages without a URL are indexed by their
+    content hash. Entries not seen for `max_age_days` are pruned on close.
+    """
+
+    def __init__(
+        self: ParseCache,
+        path: str,
+        parser_id: str,
+        max_age_days: float = DEFAULT_PARSE_CACHE_MAX_AGE_DAYS,
+    ) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.parser_id = parser_id
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS parsed_pages ("
+                " key TEXT PRIMARY KEY, content_hash TEXT NOT NULL,"
+                " parser TEXT NOT NULL, products TEXT NOT NULL,"
+                " last_seen REAL NOT NULL)"
+            )
+
+    @classmethod
+    def from_config(
+        cls, parser_class: Type[Parser], config: Dict[str, Any]
+    ) -> Optional[ParseCache]:
+        """
+        Opens the supplier's parse cache if 'parse_cache_dir' is configured.
+
+        Supplier configuration keys:
+            - 'parse_cache_dir': Directory holding one cache file per supplier.
+            - 'parser_version': Bump to invalidate rows after parser changes.
+            - 'parse_cache_max_age_days': Prune entries unseen for this long
+              (default 30).
+        """
+        cache_dir = config.get("parse_cache_dir")
+        if not cache_dir:
+            return None
+        supplier_name = config.get("name") or "default"
+        return cls(
+            os.path.join(cache_dir, f"{supplier_name}.sqlite"),
+            parser_identity(parser_class, config),
+            max_age_days=float(
+                config.get("parse_cache_max_age_days", DEFAULT_PARSE_CACHE_MAX_AGE_DAYS)
+            ),
+        )
+
+    def key_for(self: ParseCache, page_content: str) -> Tuple[str, str]:
+        """
+        Returns the (index key, content hash) pair for a page.
+        """
+        digest = content_hash(page_content)
+        url = page_url(page_content)
+        return (f"url:{url}" if url else f"hash:{digest}"), digest
+
+    def lookup(
+        self: ParseCache, key: str, digest: Optional[str]
+    ) -> Optional[List[ProductData]]:
+        """
+        Returns the previously parsed rows if the page content is unchanged.
+        A `digest` of None accepts whatever content was parsed last, for pages
+        the fetcher knows are unchanged.
+        """
+        row = self._conn.execute(
+            "SELECT content_hash, parser, products FROM parsed_pages WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if (
+            row is None
+            or (digest is not None and row[0] != digest)
+            or row[1] != self.parser_id
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self._conn:
+            self._conn.execute(
+                "UPDATE parsed_pages SET last_seen = ? WHERE key = ?", (time.time(), key)
+            )
+        return [ProductData(**fields) for fields in json.loads(row[2])]
+
+    def cached_urls(self: ParseCache, urls: Iterable[str]) -> Set[str]:
+        """
+        Returns those of `urls` with rows parsed by the current parser.
+        """
+        urls = list(urls)
+        cached: Set[str] = set()
+        # Well under SQLite's limit on query parameters
+        for start in range(0, len(urls), 500):
+            keys = [f"url:{url}" for url in urls[start : start + 500]]
+            rows = self._conn.execute(
+                "SELECT key FROM parsed_pages WHERE parser = ? AND key IN "
+                f"({', '.join('?' * len(keys))})",
+                (self.parser_id, *keys),
+            )
+            cached.update(row[0][len("url:"):] for row in rows)
+        return cached
+
+    def store(
+        self: ParseCache, key: str, digest: str, products: List[ProductData]
+    ) -> None:
+        """
+        Records the rows parsed from a page.
+        """
+        rows = json.dumps([dataclasses.asdict(product) for product in products])
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parsed_pages VALUES (?, ?, ?, ?, ?)",
+                (key, digest, self.parser_id, rows, time.time()),
+            )
+
+    def close(self: ParseCache, prune: bool = True) -> None:
+        """
+        Prunes stale entries (unless `prune` is False) and closes the cache.
+        """
+        if not prune:
+            self._conn.close()
+            return
+        cutoff = time.time() - self.max_age_days * 86400
+        with self._conn:
+            self._conn.execute("DELETE FROM parsed_pages WHERE last_seen < ?", (cutoff,))
+        self._conn.close()
+        logging.info(
+            f"Parse cache {self.path}: reused {self.hits} page(s), parsed {self.misses}"
+        )
@@ -0,0 +1,157 @@
+# scraper/core/parse_pipeline.py
+
+import collections
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Tuple, Type
+
+from scraper.core.metrics import metrics
+from scraper.core.parse_cache import ParseCache
+from scraper.interfaces.parser import Parser
+from scraper.models.page import is_unchanged, page_url
+from scraper.models.product import ProductData
+
+# Each parse worker (thread or process) builds its own Parser instance once
+_worker_state = threading.local()
+
+
+def _init_parse_worker(parser_class: Type[Parser], config: Dict[str, Any]) -> None:
+    """
+    Executor initializer: creates the parser used by this worker.
+    """
+    _worker_state.parser = parser_class(config)
+
+
+def _parse_in_worker(page_content: str) -> Tuple[List[ProductData], float]:
+    """
+    Parses one page with the worker's parser, returning the products and the
+    time the parse took (worker processes cannot record metrics directly).
+    """
+    started = time.perf_counter()
+    products = _worker_state.parser.parse(page_content)
+    return products, time.perf_counter() - started
+
+
+def _make_executor(
+    parser_class: Type[Parser], config: Dict[str, Any], workers: int
+) -> Executor:
+    """
+    Creates the parse worker pool described by the supplier configuration.
+    """
+    executor_kind = config.get("parse_executor", "process")
+    initargs = (parser_class, config)
+    if executor_kind == "process":
+        start_method = config.get("parse_start_method")
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_parse_worker,
+            initargs=initargs,
+        )
+    if executor_kind == "thread":
+        return ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="parser",
+            initializer=_init_parse_worker,
+            initargs=initargs,
+        )
+    raise ValueError(
+        f"Unknown parse_executor '{executor_kind}', expected 'process' or 'thread'"
+    )
+
+
+def _completed(products: List[ProductData], seconds: float = 0.0) -> Future:
+    future: Future = Future()
+    future.set_result((products, seconds))
+    return future
+
+
+def iter_parsed_pages(
+    pages: Iterable[str], parser_class: Type[Parser], config: Dict[str, Any]
+) -> Iterator[List[ProductData]]:
+    """
+    Parses pages and yields the products found on each page, in page order.
+
+    By default each page is parsed inline as soon as it is fetched. When the
+    supplier configuration sets 'parse_workers', pages are handed to a pool of
+    parse workers instead, so fetching the next pages overlaps with parsing
+    the previous ones. When 'parse_cache_dir' is set, pages whose content is
+    unchanged since an earlier run reuse the rows parsed then (see ParseCache);
+    so do pages the fetcher skipped as unchanged (see Page), which requires it.
+
+    Supplier configuration keys:
+        - 'parse_workers': Number of parse workers; 0 parses inline (default 0).
+        - 'parse_executor': 'process' (default, for CPU-heavy BeautifulSoup
+          parsing) or 'thread'.
+        - 'parse_queue_size': Maximum pages queued or being parsed at once
+          (default twice parse_workers). Fetching pauses when it is reached,
+          so memory use stays flat.
+        - 'parse_start_method': multiprocessing start method for process
+          workers (default: the platform default).
+    """
+    workers = int(config.get("parse_workers", 0))
+    max_pending = int(config.get("parse_queue_size", 2 * workers)) if workers > 0 else 1
+    if max_pending < 1:
+        raise ValueError("parse_queue_size must be at least 1")
+
+    supplier_metrics = metrics.for_supplier(config.get("name"))
+    cache = ParseCache.from_config(parser_class, config)
+    executor = _make_executor(parser_class, config, workers) if workers > 0 else None
+    parser = parser_class(config) if executor is None else None
+
+    def _submit(page_content: str) -> Future:
+        if executor is not None:
+            return executor.submit(_parse_in_worker, page_content)
+        started = time.perf_counter()
+        products = parser.parse(page_content)
+        return _completed(products, time.perf_counter() - started)
+
+    # Each pending entry is (future rows, cache key, content hash, cache hit)
+    pending: Deque[tuple] = collections.deque()
+
+    def _collect() -> List[ProductData]:
+        future, key, digest, hit = pending.popleft()
+        products, seconds = future.result()
+        if hit:
+            supplier_metrics.incr("parse_cache_hits")
+        else:
+            supplier_metrics.observe("parse", seconds)
+            if cache is not None:
+                cache.store(key, digest, products)
+        supplier_metrics.incr("products", len(products))
+        return products
+
+    try:
+        for page_content in pages:
+            if cache is None:
+                if is_unchanged(page_content):
+                    raise ValueError("Unchanged pages can only be reused with 'parse_cache_dir'")
+                pending.append((_submit(page_content), None, None, False))
+            elif is_unchanged(page_content):
+                # The fetcher skipped the page because it has not changed
+                key, digest = cache.key_for(page_content)
+                cached = cache.lookup(key, None)
+                if cached is None:
+                    raise ValueError(
+                        f"No cached rows for unchanged page {page_url(page_content)}"
+                    )
+                pending.append((_completed(cached), key, digest, True))
+            else:
+                key, digest = cache.key_for(page_content)
+                cached = cache.lookup(key, digest)
+                if cached is not None:
+                    pending.append((_completed(cached), key, digest, True))
+                else:
+                    pending.append((_submit(page_content), key, digest, False))
+            # Back-pressure: wait for the oldest page before fetching more
+            if len(pending) >= max_pending:
+                yield _collect()
+        while pending:
+            yield _collect()
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if cache is not None:
+            cache.close()
@@ -0,0 +1,159 @@
+# scraper/core/price_normalisation.py
+
+from __future__ import annotations
+import itertools
+import math
+from array import array
+from typing import Any, Dict, List, Optional, Union
+
+from scraper.models.product import ProductData
+from scraper.models.product_batch import NAN, ProductBatch
+
+# New Zealand GST
+DEFAULT_GST_RATE = 0.15
+
+
+def _numpy():
+    """
+    Returns NumPy, or None if it is not installed. It is imported on first
+    use, so only runs that normalise prices pay for importing it.
+    """
+    try:
+        import numpy
+    except ImportError:  # numpy is optional (the 'numpy' extra)
+        return None
+    return numpy
+
+
+class PriceNormaliser:
+    """
+    Converts supplier prices to a common basis, so prices from suppliers who
+    quote per length, per metre or including GST can be compared.
+
+    A product's normalised price is its price, less GST if the supplier's
+    prices include it, divided by the number of base units (say metres) in
+    the unit the product is sold by. Products sold by a unit with no known
+    size get no normalised price.
+
+    ProductBatch columns are converted in a few whole-array NumPy operations
+    when NumPy is installed; lists of ProductData are converted row by row.
+
+    Args:
+        unit_sizes: Base units per supplier unit, for example
+                    {'m': 1, 'length': 6}. Without it every product's size
+                    is 1, so only GST is removed.
+        default_unit: The unit of products whose page gives none.
+        gst_inclusive: Whether the supplier's prices include GST.
+        gst_rate: The GST rate removed from GST-inclusive prices.
+        decimals: Round normalised prices to this many decimal places.
+    """
+
+    def __init__(
+        self: PriceNormaliser,
+        unit_sizes: Optional[Dict[str, float]] = None,
+        default_unit: Optional[str] = None,
+        gst_inclusive: bool = False,
+        gst_rate: float = DEFAULT_GST_RATE,
+        decimals: Optional[int] = None,
+    ) -> None:
+        self.unit_sizes = {
+            str(unit).lower(): float(size) for unit, size in (unit_sizes or {}).items()
+        }
+        for unit, size in self.unit_sizes.items():
+            if not size > 0:
+                raise ValueError(f"Unit size for '{unit}' must be positive, got {size}")
+        if gst_rate < 0:
+            raise ValueError(f"GST rate must not be negative, got {gst_rate}")
+        self.default_unit = default_unit.lower() if default_unit else None
+        self.decimals = decimals
+        # Prices are multiplied by this to remove GST
+        self._scale = 1 / (1 + gst_rate) if gst_inclusive else 1.0
+        # Unit -> size, with products given no unit looked up as the default
+        self._sizes: Dict[Optional[str], float] = dict(self.unit_sizes)
+        if self.default_unit is not None:
+            self._sizes[None] = self.unit_sizes.get(self.default_unit, NAN)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional[PriceNormaliser]:
+        """
+        Creates the supplier's normaliser if 'price_normalisation' is
+        configured, for example:
+
+            price_normalisation:
+              gst_inclusive: true
+              default_unit: length
+              unit_sizes: {m: 1, length: 6}
+
+        Supplier configuration keys:
+            - 'price_normalisation': A mapping with 'unit_sizes',
+              'default_unit', 'gst_inclusive', 'gst_rate' (default 0.15)
+              and 'decimals', as for the class's arguments.
+        """
+        options = config.get("price_normalisation")
+        if not options:
+            return None
+        if not isinstance(options, dict):
+            raise ValueError(
+                f"Supplier '{config.get('name')}' has a 'price_normalisation' "
+                "that is not a mapping"
+            )
+        return cls(
+            unit_sizes=options.get("unit_sizes"),
+            default_unit=options.get("default_unit"),
+            gst_inclusive=bool(options.get("gst_inclusive", False)),
+            gst_rate=float(options.get("gst_rate", DEFAULT_GST_RATE)),
+            decimals=options.get("decimals"),
+        )
+
+    def normalise(
+        self: PriceNormaliser, products: Union[List[ProductData], ProductBatch]
+    ) -> Union[List[ProductData], ProductBatch]:
+        """
+        Fills in the normalised price of every product, in place, and returns
+        the products.
+        """
+        if isinstance(products, ProductBatch):
+            self._normalise_batch(products)
+        else:
+            for product in products:
+                price = self.normalised_price(product.price, product.unit)
+                product.normalised_price = None if math.isnan(price) else price
+        return products
+
+    def normalised_price(self: PriceNormaliser, price: float, unit: Optional[str]) -> float:
+        """
+        Returns one product's normalised price, or NaN if its unit is unknown.
+        """
+        result = price * self._scale
+        if self.unit_sizes:
+            result /= self._sizes.get(unit, NAN)
+        if self.decimals is not None and not math.isnan(result):
+            result = round(result, self.decimals)
+        return result
+
+    def _normalise_batch(self: PriceNormaliser, batch: ProductBatch) -> None:
+        np = _numpy()
+        if np is None:  # Batches are converted row by row without NumPy
+            batch.normalised_prices = array(
+                "d", map(self.normalised_price, batch.prices, batch.units)
+            )
+            return
+        count = len(batch)
+        if not count:
+            return
+        # Views of the batch's own columns; the result is written in place
+        prices = np.frombuffer(batch.prices, dtype=np.float64, count=count)
+        result = np.frombuffer(batch.normalised_prices, dtype=np.float64, count=count)
+        np.multiply(prices, self._scale, out=result)
+        if self.unit_sizes:
+            # One dict lookup per row; units are few, interned strings
+            sizes = np.fromiter(
+                map(self._sizes.get, batch.units, itertools.repeat(NAN)),
+                dtype=np.float64,
+                count=count,
+            )
+            np.divide(result, sizes, out=result)
+        if self.decimals is not None:
+            np.round(result, self.decimals, out=result)
+        # Release the views so the arrays can grow again
+        del prices, result
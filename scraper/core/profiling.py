@@ -0,0 +1,161 @@
+# scraper/core/profiling.py
+
+from __future__ import annotations
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+# Number of functions and allocation sites shown in a report
+DEFAULT_TOP = 20
+# Frames recorded per allocation, so sites can be traced to their callers
+TRACEMALLOC_FRAMES = 10
+
+# Configuration applied to a supplier while it is profiled. cProfile only
+# sees threads of this process, so parse workers run as threads.
+PROFILE_OVERRIDES: Dict[str, Any] = {"parse_executor": "thread"}
+
+# Before Python 3.12 cProfile only sees the thread that enabled it, so each
+# thread gets its own profiler. From 3.12 it is built on sys.monitoring,
+# which sees every thread but allows only one profiler at a time.
+_PROFILE_EACH_THREAD = sys.version_info < (3, 12)
+
+# Entry points that show which component a run's time goes to
+_COMPONENT_FUNCTIONS = {
+    "authenticator": ("login",),
+    "page fetcher": ("fetch_pages", "fetch_unit", "fetch_all"),
+    "parser": ("parse",),
+    "exporter": ("export", "export_stream"),
+}
+
+
+class SupplierProfiler:
+    """
+    Profiles one supplier run with cProfile and tracemalloc.
+
+    Every thread started during the run is profiled too (the async fetch
+    thread, parse worker threads), and their statistics are merged. On exit
+    the profiler writes to `output_dir`:
+
+        - '<supplier>.prof': cProfile statistics, for pstats or snakeviz.
+        - '<supplier>.tracemalloc': The allocation snapshot, for
+          tracemalloc.Snapshot.load.
+        - '<supplier>.txt': The report, which is also logged: time per
+          component, the top functions by cumulative time and the top
+          allocation sites.
+
+    Worker processes (process parse workers, distributed workers) are not
+    profiled; see PROFILE_OVERRIDES.
+    """
+
+    def __init__(
+        self: SupplierProfiler, output_dir: str, supplier_name: str, top: int = DEFAULT_TOP
+    ) -> None:
+        self.output_dir = output_dir
+        self.supplier_name = supplier_name
+        self.top = top
+        self.report: Optional[str] = None
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+
+    def _profile_thread(self: SupplierProfiler, frame, event, arg) -> None:
+        """
+        threading.setprofile hook: starts a profiler in each new thread.
+        Enabling it replaces this hook for the thread.
+        """
+        profile = cProfile.Profile()
+        with self._lock:
+            self._profiles.append(profile)
+        profile.enable()
+
+    def __enter__(self: SupplierProfiler) -> SupplierProfiler:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._started_tracemalloc = True
+        self._main_profile = cProfile.Profile()
+        if _PROFILE_EACH_THREAD:
+            threading.setprofile(self._profile_thread)
+        self._main_profile.enable()
+        return self
+
+    def __exit__(self: SupplierProfiler, exc_type, exc, traceback) -> None:
+        self._main_profile.disable()
+        if _PROFILE_EACH_THREAD:
+            threading.setprofile(None)
+        snapshot = tracemalloc.take_snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+        # pstats refuses profiles that collected nothing, such as those of
+        # threads that exited straight away
+        with self._lock:
+            profiles = [self._main_profile, *self._profiles]
+        stats = pstats.Stats()
+        for profile in profiles:
+            profile.create_stats()
+            if profile.stats:
+                stats.add(profile)
+        snapshot = snapshot.filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, self.supplier_name)
+        stats.dump_stats(f"{base}.prof")
+        snapshot.dump(f"{base}.tracemalloc")
+        self.report = format_report(self.supplier_name, stats, snapshot, self.top)
+        with open(f"{base}.txt", "w") as f:
+            f.write(self.report)
+        logging.info(self.report)
+        logging.info(f"Wrote profile of {self.supplier_name} to {base}.prof")
+
+
+def component_times(stats: pstats.Stats) -> Dict[str, float]:
+    """
+    Returns the cumulative seconds spent in each component's entry points.
+
+    The largest entry point of each component is used, so nested calls (a
+    fetch_pages that uses fetch_all) are not counted twice.
+    """
+    times = {component: 0.0 for component in _COMPONENT_FUNCTIONS}
+    for (_, _, function_name), (_, _, _, cumulative, _) in stats.stats.items():
+        for component, function_names in _COMPONENT_FUNCTIONS.items():
+            if function_name in function_names:
+                times[component] = max(times[component], cumulative)
+    return times
+
+
+def top_allocations(
+    snapshot: tracemalloc.Snapshot, top: int = DEFAULT_TOP
+) -> List[Tuple[str, int, int]]:
+    """
+    Returns (site, bytes, allocations) for the sites holding the most memory.
+    """
+    return [
+        (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size, stat.count)
+        for stat in snapshot.statistics("lineno")[:top]
+    ]
+
+
+def format_report(
+    supplier_name: str, stats: pstats.Stats, snapshot: tracemalloc.Snapshot, top: int
+) -> str:
+    out = io.StringIO()
+    out.write(f"Profile of {supplier_name}\n\nTime per component (cumulative):\n")
+    for component, seconds in component_times(stats).items():
+        out.write(f"  {component:<14} {seconds:10.3f}s\n")
+
+    out.write(f"\nTop {top} functions by cumulative time:\n")
+    stats.stream = out
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+
+    out.write(f"Top {top} allocation sites:\n")
+    for site, size, count in top_allocations(snapshot, top):
+        out.write(f"  {size / 1024:10.1f} KiB {count:8d} blocks  {site}\n")
+    return out.getvalue()
@@ -0,0 +1,52 @@
+# scraper/core/replay.py
+
+from __future__ import annotations
+import logging
+from typing import Any, Iterator, Optional
+
+import requests
+
+from scraper.interfaces.page_fetcher import PageFetcher
+from scraper.storage.page_archive import PageArchive, archive_path
+
+
+class ReplayPageFetcher(PageFetcher):
+    """
+    Replays the pages recorded in a page archive (see PageArchiveWriter)
+    instead of fetching them, for network-free parser benchmarks and for
+    reprocessing a recorded catalogue with a new parser. The Scraper uses it
+    in place of the supplier's own fetcher when 'replay_archive' is set.
+
+    Supplier configuration keys:
+        - 'replay_archive': The archive to replay; '{name}' and '{date}'
+          are filled in as for 'record_archive'.
+    """
+
+    def __init__(self: ReplayPageFetcher, config: dict) -> None:
+        self.config = config
+        self.path = archive_path(config["replay_archive"], config)
+        self._start_offset: Optional[int] = None
+        self._next_offset: Optional[int] = None
+
+    def fetch_pages(self: ReplayPageFetcher, session: requests.Session) -> Iterator[str]:
+        """
+        Yields the recorded pages in the order they were fetched. The
+        session is not used.
+        """
+        archive = PageArchive(self.path)
+        logging.info(f"ReplayPageFetcher: Replaying pages from {self.path}")
+        try:
+            for page, next_offset in archive.iter_pages(self._start_offset):
+                self._next_offset = next_offset
+                yield page
+        finally:
+            archive.close()
+
+    def checkpoint_cursor(self: ReplayPageFetcher) -> Optional[Any]:
+        """
+        Returns the archive offset of the next page.
+        """
+        return self._next_offset
+
+    def resume_from(self: ReplayPageFetcher, cursor: Any) -> None:
+        self._start_offset = int(cursor)
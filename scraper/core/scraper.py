@@ -1,12 +1,280 @@
 # scraper/core/scraper.py
 
-from typing import List, Dict, Any
+import asyncio
+import collections
+import logging
+import queue
+import threading
+import time
+from typing import List, Dict, Any, Deque, Iterable, Iterator, Optional, Tuple, Union
+
+import requests
 
 # Assuming interfaces and models are in these paths relative to the project root
 from scraper.interfaces.authenticator import Authenticator
+from scraper.interfaces.exporter import Exporter
+from scraper.interfaces.async_page_fetcher import AsyncPageFetcher
 from scraper.interfaces.page_fetcher import PageFetcher
-from scraper.interfaces.parser import Parser
+from scraper.core.checkpoint import Checkpoint, CheckpointStore
+from scraper.core.metrics import SupplierMetrics, metrics
+from scraper.core.parse_pipeline import iter_parsed_pages
+from scraper.core.price_normalisation import PriceNormaliser
+from scraper.core.replay import ReplayPageFetcher
+from scraper.distributed.coordinator import iter_distributed_products
+from scraper.http.resilience import install_resilience
+from scraper.http.response_cache import install_response_cache
+from scraper.http.session_store import discard_cached_session, login_with_cache
+from scraper.models.page import is_unchanged
 from scraper.models.product import ProductData
+from scraper.models.product_batch import ProductBatch
+from scraper.storage.page_archive import PageArchiveWriter
+from scraper.storage.price_history import PriceHistory
+
+# Number of fetched pages an async fetcher may buffer ahead of the parser
+DEFAULT_PAGE_BUFFER_SIZE = 8
+
+_END_OF_PAGES = object()
+
+
+class _FetchFailure:
+    """
+    Carries an exception from the async fetch thread to the consuming thread.
+    """
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def _iter_async_pages(
+    page_fetcher: AsyncPageFetcher,
+    session: requests.Session,
+    buffer_size: int = DEFAULT_PAGE_BUFFER_SIZE,
+    unit: Any = None,
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Drives an async page fetcher from synchronous code, yielding each page
+    with the fetcher's checkpoint cursor. Fetches one work unit instead of
+    every page if `unit` is given.
+
+    The fetcher's event loop runs in a background thread and hands pages over
+    through a bounded queue, so downloads keep progressing while the caller
+    parses, but never run more than `buffer_size` pages ahead of it.
+    """
+    pages: queue.Queue = queue.Queue(maxsize=buffer_size)
+    stop = threading.Event()
+
+    async def _put(item: Any) -> bool:
+        # Poll rather than block so in-flight downloads keep running on the
+        # loop while the queue is full.
+        while not stop.is_set():
+            try:
+                pages.put_nowait(item)
+                return True
+            except queue.Full:
+                await asyncio.sleep(0.01)
+        return False
+
+    async def _produce() -> None:
+        if unit is None:
+            page_iter = page_fetcher.fetch_pages(session=session)
+        else:
+            page_iter = page_fetcher.fetch_unit(session, unit)
+        try:
+            async for page_content in page_iter:
+                # Read the cursor here: the fetcher moves on while the page
+                # waits in the queue
+                if not await _put((page_content, page_fetcher.checkpoint_cursor())):
+                    break
+        except Exception as e:
+            await _put(_FetchFailure(e))
+        else:
+            await _put(_END_OF_PAGES)
+        finally:
+            await page_iter.aclose()
+
+    producer = threading.Thread(
+        target=asyncio.run, args=(_produce(),), name="page-fetcher", daemon=True
+    )
+    producer.start()
+    try:
+        while True:
+            item = pages.get()
+            if item is _END_OF_PAGES:
+                return
+            if isinstance(item, _FetchFailure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+def _slice(
+    batch: Union[List[ProductData], ProductBatch], start: int, stop: int
+) -> Union[List[ProductData], ProductBatch]:
+    if isinstance(batch, ProductBatch):
+        return batch.slice(start, stop)
+    return batch[start:stop]
+
+
+def _close(iterator: Iterator) -> None:
+    close = getattr(iterator, "close", None)
+    if close is not None:
+        close()
+
+
+def _iter_sync_pages(
+    page_fetcher: PageFetcher, session: requests.Session, unit: Any = None
+) -> Iterator[Tuple[str, Any]]:
+    if unit is None:
+        page_iter = iter(page_fetcher.fetch_pages(session=session))
+    else:
+        page_iter = iter(page_fetcher.fetch_unit(session, unit))
+    try:
+        for page_content in page_iter:
+            yield page_content, page_fetcher.checkpoint_cursor()
+    finally:
+        _close(page_iter)
+
+
+def _timed_pages(
+    pages: Iterable[Tuple[str, Any]], supplier_metrics: SupplierMetrics
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Records how long each page took to arrive, plus page and byte counts.
+    """
+    page_iter = iter(pages)
+    try:
+        while True:
+            started = time.perf_counter()
+            try:
+                page_content, cursor = next(page_iter)
+            except StopIteration:
+                return
+            supplier_metrics.observe("fetch", time.perf_counter() - started)
+            supplier_metrics.incr("pages")
+            supplier_metrics.incr("bytes", len(page_content.encode("utf-8")))
+            yield page_content, cursor
+    finally:
+        _close(page_iter)
+
+
+def iter_pages_with_cursors(
+    page_fetcher: Union[PageFetcher, AsyncPageFetcher],
+    session: requests.Session,
+    config: Dict[str, Any],
+    unit: Any = None,
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Yields (page content, checkpoint cursor) pairs from either a synchronous
+    or an asynchronous fetcher. The cursor is the fetcher's position just
+    after the page (see PageFetcher.checkpoint_cursor). With `unit`, only
+    that work unit's pages are fetched (see PageFetcher.fetch_unit).
+    """
+    if isinstance(page_fetcher, AsyncPageFetcher):
+        pages = _iter_async_pages(
+            page_fetcher,
+            session,
+            buffer_size=int(config.get("page_buffer_size", DEFAULT_PAGE_BUFFER_SIZE)),
+            unit=unit,
+        )
+    else:
+        pages = _iter_sync_pages(page_fetcher, session, unit)
+
+    supplier_metrics = metrics.for_supplier(config.get("name"))
+    if supplier_metrics.enabled:
+        return _timed_pages(pages, supplier_metrics)
+    return pages
+
+
+def iter_pages(
+    page_fetcher: Union[PageFetcher, AsyncPageFetcher],
+    session: requests.Session,
+    config: Dict[str, Any],
+) -> Iterator[str]:
+    """
+    Yields page contents from either a synchronous or an asynchronous fetcher.
+    """
+    pages = iter_pages_with_cursors(page_fetcher, session, config)
+    try:
+        for page_content, _ in pages:
+            yield page_content
+    finally:
+        _close(pages)
+
+
+def _checkpointed(
+    parsed_pages: Iterable[List[ProductData]],
+    cursors: Deque[Any],
+    checkpoint: CheckpointStore,
+    saved: Optional[Checkpoint],
+) -> Iterator[List[ProductData]]:
+    """
+    Replays the products saved by an interrupted run, then records each newly
+    parsed page in the checkpoint store. Pages are parsed in order, so each
+    result belongs to the oldest cursor not yet recorded.
+    """
+    try:
+        if saved is not None:
+            yield from checkpoint.iter_saved_products(saved)
+        for products in parsed_pages:
+            checkpoint.record_page(products, cursors.popleft())
+            yield products
+        checkpoint.clear()
+    finally:
+        checkpoint.close()
+
+
+def _recorded(
+    parsed_pages: Iterable[List[ProductData]], history: PriceHistory, supplier: str
+) -> Iterator[List[ProductData]]:
+    """
+    Records every product in the price history. The run's changes are only
+    written if the scrape completes; otherwise they are discarded.
+    """
+    run = history.start_run(supplier)
+    completed = False
+    try:
+        for products in parsed_pages:
+            run.add(products)
+            yield products
+        run.finish(complete=True)
+        completed = True
+    finally:
+        if not completed:
+            run.abort()
+        history.close()
+
+
+def _batched(
+    parsed_pages: Iterable[List[ProductData]], config: Dict[str, Any]
+) -> Iterator[Union[List[ProductData], ProductBatch]]:
+    """
+    Regroups parsed pages into batches of 'batch_size' products, or yields
+    each non-empty page if it is not set.
+    """
+    batch_size = config.get("batch_size")
+    if not batch_size:
+        for product_data_on_page in parsed_pages:
+            if product_data_on_page:
+                yield product_data_on_page
+        return
+
+    # Columnar batches avoid one Python object per product
+    new_batch = ProductBatch if config.get("columnar") else list
+    batch = new_batch()
+    for product_data_on_page in parsed_pages:
+        batch.extend(product_data_on_page)
+        if len(batch) < batch_size:
+            continue
+        start = 0
+        while len(batch) - start >= batch_size:
+            yield _slice(batch, start, start + batch_size)
+            start += batch_size
+        batch = _slice(batch, start, len(batch))
+    if batch:
+        yield batch
+
 
 class Scraper:
     """
@@ -19,7 +287,8 @@ class Scraper:
 
     def scrape_supplier(self, config: Dict[str, Any]) -> List[ProductData]:
         """
-        Orchestrates the scraping process for a single supplier.
+        Orchestrates the scraping process for a single supplier and collects
+        every product into one list. See iter_products for a streaming variant.
 
         Args:
             config: A dictionary containing configuration for the supplier,
@@ -27,34 +296,163 @@ class Scraper:
                     PageFetcher, and Parser, and any specific parameters
                     they might need. Expected keys:
                     - 'authenticator_class': The concrete Authenticator class.
-                    - 'page_fetcher_class': The concrete PageFetcher class.
+                    - 'page_fetcher_class': The concrete PageFetcher or
+                      AsyncPageFetcher class.
                     - 'parser_class': The concrete Parser class.
+                    - 'parse_workers' (optional): Parse pages in a pool of
+                      workers, overlapping parsing with fetching.
+                    - 'http_cache_dir' (optional): Cache responses on disk
+                      and revalidate them with conditional requests.
+                    - 'session_cache_dir' (optional): Persist the logged-in
+                      session so later runs can skip the login. A run that
+                      finds no products with a cached session logs in
+                      again and starts over.
+                    - 'price_history_path' (optional): Record the run's
+                      products and what changed (see PriceHistory);
+                      scrape_and_export passes the changes to the exporter.
+                    - 'checkpoint_dir' (optional): Save progress every
+                      'checkpoint_interval' pages; with 'resume' set, carry
+                      on from the last checkpoint instead of starting over.
+                    - 'work_queue' (optional): Split the pages into work
+                      units on this SQLite queue for workers to scrape
+                      (see scraper.distributed.coordinator).
+                    - 'record_archive' (optional): Record every fetched
+                      page in a page archive (see PageArchiveWriter). Runs
+                      resumed from a fetcher's checkpoint cursor do not
+                      replace the recording.
+                    - 'replay_archive' (optional): Parse the pages recorded
+                      in an archive instead of fetching them; no
+                      authenticator or page fetcher is needed.
                     - Additional keys for specific implementation parameters.
 
         Returns:
             A list of ProductData objects extracted from the supplier's pages.
         """
+        all_product_data: List[ProductData] = []
+        for batch in self.iter_products(config):
+            all_product_data.extend(batch)
+        return all_product_data
+
+    def scrape_and_export(self, config: Dict[str, Any], exporter: Exporter) -> int:
+        """
+        Scrapes a single supplier and streams the products to an exporter
+        batch by batch.
+
+        With a 'price_history_path', the exporter is then given the run's
+        changes (see Exporter.export_changes).
+
+        Returns:
+            The number of products exported.
+        """
+        history = PriceHistory.from_config(config)
+        if history is None:
+            return self._export_stream(config, exporter)
+        supplier = config.get("name") or "default"
+        try:
+            previous_run_id = history.last_run_id(supplier)
+            exported = self._export_stream(config, exporter)
+            # The run is only recorded if the scrape completed
+            run_id = history.last_run_id(supplier)
+            if run_id is not None and run_id != previous_run_id:
+                exporter.export_changes(history.changes(supplier, run_id))
+        finally:
+            history.close()
+        return exported
+
+    def _export_stream(self, config: Dict[str, Any], exporter: Exporter) -> int:
+        supplier_metrics = metrics.for_supplier(config.get("name"))
+        if not supplier_metrics.enabled:
+            return exporter.export_stream(self.iter_products(config))
+
+        # Export time is the time spent in the exporter, not waiting on batches
+        scrape_seconds = 0.0
+
+        def _batches() -> Iterator[Union[List[ProductData], ProductBatch]]:
+            nonlocal scrape_seconds
+            batch_iter = self.iter_products(config)
+            while True:
+                started = time.perf_counter()
+                batch = next(batch_iter, None)
+                scrape_seconds += time.perf_counter() - started
+                if batch is None:
+                    return
+                yield batch
+
+        started = time.perf_counter()
+        exported = exporter.export_stream(_batches())
+        supplier_metrics.observe("export", time.perf_counter() - started - scrape_seconds)
+        return exported
+
+    def scrape_unit(
+        self,
+        config: Dict[str, Any],
+        unit: Any,
+        session: Optional[requests.Session] = None,
+    ) -> List[ProductData]:
+        """
+        Scrapes one work unit of a distributed job (see
+        PageFetcher.plan_work_units) and returns its products.
+
+        Args:
+            config: The supplier configuration, as for scrape_supplier.
+            unit: The unit's payload.
+            session: A session from log_in to reuse; by default the unit
+                     logs in itself.
+        """
+        page_fetcher: Union[PageFetcher, AsyncPageFetcher] = config['page_fetcher_class'](config)
+        if session is None:
+            session = self.log_in(config)
+        page_iter = iter_pages_with_cursors(page_fetcher, session, config, unit=unit)
+        products: List[ProductData] = []
+        try:
+            pages = (page_content for page_content, _ in page_iter)
+            for product_data_on_page in iter_parsed_pages(pages, config['parser_class'], config):
+                products.extend(product_data_on_page)
+        finally:
+            _close(page_iter)
+        return products
+
+    def iter_products(
+        self, config: Dict[str, Any]
+    ) -> Iterator[Union[List[ProductData], ProductBatch]]:
+        """
+        Orchestrates the scraping process for a single supplier, yielding
+        batches of ProductData as pages are parsed.
+
+        Only the current batch is held in memory, so peak memory depends on
+        the batch size rather than the size of the supplier's catalogue.
+
+        Args:
+            config: The supplier configuration, as for scrape_supplier.
+                    'batch_size' (optional) sets the number of products per
+                    batch; by default each parsed page is one batch.
+                    With 'columnar' set as well, batches are ProductBatch
+                    objects instead of lists. 'price_normalisation' fills
+                    in normalised prices (see PriceNormaliser).
+
+        Yields:
+            Non-empty lists of ProductData objects, or ProductBatch objects.
+        """
         authenticator_class = config.get('authenticator_class')
         page_fetcher_class = config.get('page_fetcher_class')
         parser_class = config.get('parser_class')
 
-        if not all([authenticator_class, page_fetcher_class, parser_class]):
+        replaying = bool(config.get("replay_archive"))
+        if not parser_class or not replaying and not (authenticator_class and page_fetcher_class):
             raise ValueError("Supplier configuration must include 'authenticator_class', 'page_fetcher_class', and 'parser_class'")
 
         # Instantiate components based on configuration
-        # Assuming config contains necessary args for instantiation
-        authenticator: Authenticator = authenticator_class(config)
-        page_fetcher: PageFetcher = page_fetcher_class(config)
-        parser: Parser = parser_class(config)
-
-        # 1. Authenticate
-        # The login method is expected to handle session management internally
-        # and potentially return a session object or modify the fetcher/parser
-        # to use the authenticated session. For simplicity here, we assume
-        # the authenticator modifies the state of the fetcher/parser or
-        # provides a session object that the fetcher/parser can use.
-        # A common pattern is for login to return a session object.
-        session = authenticator.login()
+        # Assuming config contains necessary args for instantiation.
+        # Parsers are created by the parse stage, which may run several of
+        # them in worker processes.
+        # Replayed pages come from a recorded archive, with no site to log in to.
+        page_fetcher: Union[PageFetcher, AsyncPageFetcher]
+        if replaying:
+            page_fetcher = ReplayPageFetcher(config)
+            session = None
+        else:
+            page_fetcher = page_fetcher_class(config)
+            session = self.log_in(config)
 
         # Pass the session to the page fetcher if needed
         # This is a common pattern, but depends on interface design.
@@ -70,17 +468,152 @@ class Scraper:
         # If login doesn't return a session, the authenticator might
         # configure the fetcher directly. Let's stick to login returning session.
 
+        # 2-3. Fetch and parse pages, here or, with a 'work_queue', on workers
+        # that may run on other hosts
+        def _scrape(session: requests.Session) -> Iterator[List[ProductData]]:
+            if config.get("work_queue"):
+                return iter_distributed_products(config, page_fetcher, session)
+            return self._parse_pages(config, page_fetcher, session)
+
+        parsed_pages = _scrape(session)
+        if getattr(session, "from_session_cache", False):
+            parsed_pages = self._logged_in_again_if_empty(config, parsed_pages, _scrape)
+        history = PriceHistory.from_config(config)
+        if history is not None:
+            parsed_pages = _recorded(parsed_pages, history, config.get("name") or "default")
+
+        # 4. Yield products in batches as soon as they are parsed, with
+        # prices converted to a common basis if configured. Whole batches are
+        # converted at once, which for columnar batches is a few array
+        # operations.
+        batches = _batched(parsed_pages, config)
+        normaliser = PriceNormaliser.from_config(config)
+        if normaliser is None:
+            yield from batches
+            return
+        supplier_metrics = metrics.for_supplier(config.get("name"))
+        for batch in batches:
+            with supplier_metrics.timer("normalise"):
+                normaliser.normalise(batch)
+            yield batch
+
+    def _logged_in_again_if_empty(
+        self,
+        config: Dict[str, Any],
+        parsed_pages: Iterable[List[ProductData]],
+        scrape,
+    ) -> Iterator[List[ProductData]]:
+        """
+        Yields the pages of a run that reused a cached session. If they held
+        no products, the site most likely no longer accepted the session and
+        served login pages, so the cached session is discarded and the
+        supplier is scraped again after a fresh login.
+        """
+        found_products = False
+        for products in parsed_pages:
+            found_products = found_products or bool(products)
+            yield products
+        if found_products:
+            return
+        logging.warning(
+            f"No products found with the cached session for {config.get('name')}, "
+            "logging in again"
+        )
+        discard_cached_session(config)
+        yield from scrape(self.log_in(config))
+
+    def log_in(self, config: Dict[str, Any]) -> requests.Session:
+        """
+        Logs in to the supplier (or reuses a cached session) and prepares
+        the session for fetching.
+        """
+        authenticator: Authenticator = config['authenticator_class'](config)
+
+        # 1. Authenticate
+        # The login method is expected to handle session management internally
+        # and potentially return a session object or modify the fetcher/parser
+        # to use the authenticated session. For simplicity here, we assume
+        # the authenticator modifies the state of the fetcher/parser or
+        # provides a session object that the fetcher/parser can use.
+        # A common pattern is for login to return a session object.
+        # A session cached by an earlier run is reused while it is still valid.
+        with metrics.for_supplier(config.get("name")).timer("login"):
+            session = login_with_cache(authenticator, config)
+
+        # Retry transient failures and back off when the supplier throttles,
+        # then serve unchanged pages from the on-disk response cache (if
+        # configured) before any of that is needed
+        install_resilience(session, config)
+        install_response_cache(session, config)
+
+        return session
+
+    def _parse_pages(
+        self,
+        config: Dict[str, Any],
+        page_fetcher: Union[PageFetcher, AsyncPageFetcher],
+        session: requests.Session,
+    ) -> Iterator[List[ProductData]]:
+        """
+        Fetches and parses the supplier's pages in this process, saving and
+        resuming from checkpoints if configured.
+        """
+        # Pick up where an interrupted run left off. Fetchers that report a
+        # cursor skip straight to it; others re-fetch and skip the pages
+        # already done.
+        checkpoint = CheckpointStore.from_config(config)
+        saved = None
+        if checkpoint is not None:
+            saved = checkpoint.load() if config.get("resume") else None
+            if saved is not None:
+                logging.info(
+                    f"Resuming {config.get('name')} after {saved.pages_done} page(s) "
+                    f"and {saved.product_count} product(s)"
+                )
+                if saved.cursor is not None:
+                    page_fetcher.resume_from(saved.cursor)
+            checkpoint.start(resume_from=saved)
+        pages_to_skip = saved.pages_done if saved is not None and saved.cursor is None else 0
+        cursors: Deque[Any] = collections.deque()
+
         # 2. Fetch pages
-        # fetch_pages is expected to handle pagination and yield page contents
-        all_product_data: List[ProductData] = []
-        for page_content in page_fetcher.fetch_pages(session=session):
-            # 3. Parse page content
-            # parse is expected to return a list of ProductData objects for the page
-            product_data_on_page: List[ProductData] = parser.parse(page_content)
-            all_product_data.extend(product_data_on_page)
+        # fetch_pages is expected to handle pagination and yield page contents.
+        # Async fetchers download several pages concurrently in the background.
+        def _pages() -> Iterator[str]:
+            # Fetched pages are recorded for replay if 'record_archive' is
+            # set; the recording is only kept if every page was fetched
+            archive = PageArchiveWriter.from_config(config)
+            # A fetcher resumed from a cursor never fetches the pages before it
+            skipped_pages = saved is not None and saved.cursor is not None
+            if archive is not None and skipped_pages:
+                logging.warning(
+                    f"Not keeping the recording of {config.get('name')}: the resumed "
+                    "run does not fetch the pages before its checkpoint"
+                )
+            page_iter = iter_pages_with_cursors(page_fetcher, session, config)
+            complete = False
+            try:
+                for page_number, (page_content, cursor) in enumerate(page_iter):
+                    if archive is not None and not is_unchanged(page_content):
+                        archive.write(page_content)
+                    if page_number < pages_to_skip:
+                        continue
+                    if checkpoint is not None:
+                        cursors.append(cursor)
+                    yield page_content
+                complete = not skipped_pages
+            finally:
+                _close(page_iter)
+                if archive is not None:
+                    archive.close(complete)
 
-        # 4. Return collected data
-        return all_product_data
+        # 3. Parse page content
+        # parse is expected to return a list of ProductData objects for the page.
+        # With 'parse_workers' configured, parsing overlaps with fetching.
+        parsed_pages = iter_parsed_pages(_pages(), config['parser_class'], config)
+        if checkpoint is not None:
+            parsed_pages = _checkpointed(parsed_pages, cursors, checkpoint, saved)
+        return parsed_pages
 
 # Example Usage (for demonstration, not part of core logic)
 # from scraper.interfaces.authenticator import DummyAuthenticator
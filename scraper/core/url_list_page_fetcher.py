@@ -0,0 +1,86 @@
+# scraper/core/url_list_page_fetcher.py
+
+from __future__ import annotations
+import logging
+from typing import Any, AsyncIterator, List, Optional
+
+import requests
+
+from scraper.interfaces.async_page_fetcher import AsyncPageFetcher
+from scraper.models.page import Page
+
+
+class UrlListPageFetcher(AsyncPageFetcher):
+    """
+    Fetches a fixed set of listing pages, several at a time. Used by
+    suppliers configured only in suppliers.yaml, and as the base of supplier
+    fetchers whose pages are a plain list of URLs.
+
+    Supplier configuration keys:
+        - 'product_list_url' / 'product_list_urls': Listing page URLs.
+        - 'page_url_template' (optional): A URL containing '{page}', filled
+          in for each page number from 'first_page' (default 1) for
+          'page_count' pages.
+    """
+
+    def __init__(self: UrlListPageFetcher, config: dict) -> None:
+        self.config = config
+        # Index into the page URLs: the next page to fetch, and the page
+        # after the one most recently yielded
+        self._start_index = 0
+        self._next_index = 0
+
+    def page_urls(self: UrlListPageFetcher) -> List[str]:
+        """
+        Returns the configured listing page URLs, in order.
+        """
+        urls = list(self.config.get("product_list_urls") or [])
+        if self.config.get("product_list_url"):
+            urls.insert(0, self.config["product_list_url"])
+        template = self.config.get("page_url_template")
+        if template:
+            first_page = int(self.config.get("first_page", 1))
+            page_count = int(self.config.get("page_count", 1))
+            urls.extend(
+                template.format(page=page)
+                for page in range(first_page, first_page + page_count)
+            )
+        return urls
+
+    async def fetch_pages(
+        self: UrlListPageFetcher, session: requests.Session
+    ) -> AsyncIterator[str]:
+        """
+        Yields each listing page (as a Page), downloading several at once.
+        """
+        name = type(self).__name__
+        page_urls = self.page_urls()[self._start_index:]
+        logging.info(f"{name}: Fetching {len(page_urls)} page(s).")
+        self._next_index = self._start_index
+        try:
+            async for response in self.fetch_all(session, page_urls):
+                self._next_index += 1
+                yield Page.from_response(response)
+        except requests.exceptions.RequestException as e:
+            logging.error(f"{name}: Failed to fetch page: {e}")
+            raise ValueError from e
+
+    def plan_work_units(
+        self: UrlListPageFetcher, session: requests.Session
+    ) -> Optional[List[Any]]:
+        """
+        Splits the listing pages into work units for distributed scraping.
+        """
+        return self.url_work_units(self.page_urls())
+
+    def checkpoint_cursor(self: UrlListPageFetcher) -> Optional[Any]:
+        """
+        Returns the index of the next listing page to fetch.
+        """
+        return self._next_index
+
+    def resume_from(self: UrlListPageFetcher, cursor: Any) -> None:
+        """
+        Skips the listing pages before index `cursor`.
+        """
+        self._start_index = int(cursor)
@@ -0,0 +1,201 @@
+# scraper/discovery/incremental_fetcher.py
+
+from __future__ import annotations
+import logging
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+from urllib.parse import urljoin
+
+import requests
+
+from scraper.core.metrics import metrics
+from scraper.core.parse_cache import ParseCache, content_hash
+from scraper.discovery.sitemap import parse_sitemap
+from scraper.discovery.state import DiscoveryState
+from scraper.interfaces.async_page_fetcher import AsyncPageFetcher
+from scraper.models.page import Page
+from scraper.parsing.html_toolkit import Selector, parse_html
+
+# Sitemap indexes may nest; stop following them after this many sitemaps
+MAX_SITEMAPS = 1000
+
+
+def uses_incremental_discovery(config: Dict[str, Any]) -> bool:
+    """
+    Returns whether a supplier is configured to discover its product pages
+    incrementally (see IncrementalPageFetcher).
+    """
+    return bool(
+        config.get("sitemap_urls") or config.get("sitemap_url") or config.get("listing_discovery")
+    )
+
+
+class IncrementalPageFetcher(AsyncPageFetcher):
+    """
+    Fetches only the product pages that are new or have changed since the
+    previous run, so a run on a stable catalogue makes a request per change
+    rather than per product.
+
+    Product pages are discovered from the supplier's sitemaps, using each
+    page's lastmod, or from its listing pages, using a snippet of each
+    listing entry (such as its price) that changes when the product does.
+    Pages whose fingerprint matches the one recorded when they were last
+    fetched, and whose parsed rows are still in the parse cache, are yielded
+    as unchanged pages without being fetched, and the parse stage reuses
+    their cached rows. Pages with no fingerprint are always fetched.
+
+    Supplier configuration keys:
+        - 'sitemap_url' / 'sitemap_urls': Sitemaps or sitemap indexes
+          listing the product pages.
+        - 'sitemap_url_pattern' (optional): A regular expression product
+          page URLs match; other sitemap URLs are ignored.
+        - 'listing_discovery': Instead of sitemaps, a mapping with 'urls'
+          (default 'product_list_url(s)'), 'product' (the CSS selector of
+          one listing entry), 'link' (the entry's link to the product page;
+          omitted means the entry itself) and 'snippet' (the part of the
+          entry whose text is the fingerprint).
+        - 'discovery_state_dir': Where fingerprints are kept between runs
+          (see DiscoveryState). Required, as is 'parse_cache_dir'.
+    """
+
+    def __init__(self: IncrementalPageFetcher, config: dict) -> None:
+        self.config = config
+        if not config.get("discovery_state_dir") or not config.get("parse_cache_dir"):
+            raise ValueError(
+                f"Supplier '{config.get('name')}' needs 'discovery_state_dir' and "
+                "'parse_cache_dir' to discover pages incrementally"
+            )
+        if config.get("checkpoint_dir"):
+            # Which pages are fetched, and in what order, depends on the
+            # state saved as they are fetched, so pages cannot be skipped by
+            # count on resume. An interrupted run refetches only what it
+            # had not reached anyway.
+            raise ValueError(
+                f"Supplier '{config.get('name')}' cannot use checkpoints with "
+                "incremental discovery"
+            )
+        if config.get("record_archive"):
+            # Unchanged pages are not fetched, so a recording would only
+            # hold the pages that changed and a replay would lose the rest
+            raise ValueError(
+                f"Supplier '{config.get('name')}' cannot record a page archive with "
+                "incremental discovery"
+            )
+
+    async def fetch_pages(
+        self: IncrementalPageFetcher, session: requests.Session
+    ) -> AsyncIterator[str]:
+        """
+        Yields an unchanged page for each product page that has not changed,
+        then fetches and yields the rest.
+        """
+        state = DiscoveryState.from_config(self.config)
+        try:
+            discovered = await self.discover(session)
+            previous = state.fingerprints()
+            cached = self._cached_urls(discovered)
+            changed = [
+                url
+                for url, fingerprint in discovered.items()
+                if fingerprint is None
+                or url not in cached
+                or previous.get(url) != fingerprint
+            ]
+            unchanged = len(discovered) - len(changed)
+            logging.info(
+                f"IncrementalPageFetcher: {len(discovered)} product page(s), "
+                f"{len(changed)} new or changed"
+            )
+            metrics.for_supplier(self.config.get("name")).incr("unchanged_pages", unchanged)
+            state.forget(url for url in previous if url not in discovered)
+
+            changed_urls = set(changed)
+            for url in discovered:
+                if url not in changed_urls:
+                    yield Page("", url=url, unchanged=True)
+            # Pages are yielded under their discovered URL, even if the
+            # request was redirected, so the next run finds them in the cache
+            urls = iter(changed)
+            async for response in self.fetch_all(session, changed):
+                url = next(urls)
+                state.record(url, discovered[url])
+                yield Page(response.text, url=url, headers=dict(response.headers))
+        except requests.exceptions.RequestException as e:
+            logging.error(f"IncrementalPageFetcher: Failed to fetch page: {e}")
+            raise ValueError from e
+        finally:
+            state.close()
+
+    async def discover(
+        self: IncrementalPageFetcher, session: requests.Session
+    ) -> Dict[str, Optional[str]]:
+        """
+        Returns the supplier's product page URLs, in order, with their
+        fingerprints (None where there is none).
+        """
+        if self.config.get("listing_discovery"):
+            return await self._discover_from_listings(session)
+        return await self._discover_from_sitemaps(session)
+
+    async def _discover_from_sitemaps(
+        self: IncrementalPageFetcher, session: requests.Session
+    ) -> Dict[str, Optional[str]]:
+        sitemap_urls = list(self.config.get("sitemap_urls") or [])
+        if self.config.get("sitemap_url"):
+            sitemap_urls.insert(0, self.config["sitemap_url"])
+        pattern = self.config.get("sitemap_url_pattern")
+        matches = re.compile(pattern).search if pattern else None
+
+        discovered: Dict[str, Optional[str]] = {}
+        seen = set(sitemap_urls)
+        while sitemap_urls:
+            if len(seen) > MAX_SITEMAPS:
+                raise ValueError(f"More than {MAX_SITEMAPS} sitemaps for {self.config.get('name')}")
+            children: List[str] = []
+            async for response in self.fetch_all(session, sitemap_urls):
+                entries, sitemaps = parse_sitemap(response.content)
+                for entry in entries:
+                    if entry.url not in discovered and (matches is None or matches(entry.url)):
+                        discovered[entry.url] = entry.lastmod
+                children.extend(url for url in sitemaps if url not in seen)
+                seen.update(sitemaps)
+            sitemap_urls = children
+        return discovered
+
+    async def _discover_from_listings(
+        self: IncrementalPageFetcher, session: requests.Session
+    ) -> Dict[str, Optional[str]]:
+        options = self.config["listing_discovery"]
+        listing_urls = list(options.get("urls") or self.config.get("product_list_urls") or [])
+        if not options.get("urls") and self.config.get("product_list_url"):
+            listing_urls.insert(0, self.config["product_list_url"])
+        if not options.get("product"):
+            raise ValueError("'listing_discovery' must include a 'product' selector")
+        product = Selector(options["product"])
+        link = Selector(options["link"]) if options.get("link") else None
+        snippet = Selector(options["snippet"]) if options.get("snippet") else None
+        backend = self.config.get("html_backend")
+
+        discovered: Dict[str, Optional[str]] = {}
+        async for response in self.fetch_all(session, listing_urls):
+            root = parse_html(response.text, backend)
+            for item in product.select(root):
+                href = link.attr(item, "href") if link is not None else item.get("href")
+                if not href:
+                    continue
+                url = urljoin(response.url, href)
+                if url in discovered:
+                    continue
+                text = snippet.text(item) if snippet is not None else None
+                discovered[url] = content_hash(text) if text is not None else None
+        return discovered
+
+    def _cached_urls(
+        self: IncrementalPageFetcher, discovered: Dict[str, Optional[str]]
+    ) -> Set[str]:
+        cache = ParseCache.from_config(self.config["parser_class"], self.config)
+        try:
+            return cache.cached_urls(discovered)
+        finally:
+            # The parse stage prunes the cache at the end of the run
+            cache.close(prune=False)
@@ -0,0 +1,62 @@
+# scraper/discovery/sitemap.py
+
+from __future__ import annotations
+import gzip
+import xml.etree.ElementTree as ElementTree
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass(frozen=True)
+class SitemapEntry:
+    """
+    One page listed in a sitemap.
+
+    Attributes:
+        url: The page's URL.
+        lastmod: The sitemap's last-modified date for the page, as written
+                 there, or None if it gives none.
+    """
+
+    url: str
+    lastmod: Optional[str] = None
+
+
+def _local_name(tag: str) -> str:
+    # '{http://www.sitemaps.org/schemas/sitemap/0.9}loc' -> 'loc'
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(element: ElementTree.Element, name: str) -> Optional[str]:
+    for child in element:
+        if _local_name(child.tag) == name:
+            text = (child.text or "").strip()
+            return text or None
+    return None
+
+
+def parse_sitemap(content: bytes) -> Tuple[List[SitemapEntry], List[str]]:
+    """
+    Parses a sitemap or sitemap index (optionally gzipped) and returns the
+    pages it lists and the URLs of the sitemaps it refers to.
+
+    Example:
+        entries, children = parse_sitemap(response.content)
+    """
+    if content.startswith(_GZIP_MAGIC):
+        content = gzip.decompress(content)
+    root = ElementTree.fromstring(content)
+    entries: List[SitemapEntry] = []
+    sitemaps: List[str] = []
+    for element in root:
+        kind = _local_name(element.tag)
+        url = _child_text(element, "loc")
+        if url is None:
+            continue
+        if kind == "url":
+            entries.append(SitemapEntry(url, _child_text(element, "lastmod")))
+        elif kind == "sitemap":
+            sitemaps.append(url)
+    return entries, sitemaps
@@ -0,0 +1,89 @@
+# scraper/discovery/state.py
+
+from __future__ import annotations
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_SCHEMA = (
+    # A product page's fingerprint (sitemap lastmod or a hash of its listing
+    # snippet) as of the last time the page was fetched
+    "CREATE TABLE IF NOT EXISTS pages ("
+    " url TEXT PRIMARY KEY, fingerprint TEXT, fetched_at REAL NOT NULL)"
+    " WITHOUT ROWID",
+)
+
+
+class DiscoveryState:
+    """
+    Local record of a supplier's product pages and their fingerprints when
+    last fetched, so the next run only fetches pages whose fingerprint
+    changed.
+
+    Fetched pages are recorded in memory and written in one transaction on
+    close, including when the run fails part way, so the pages it did fetch
+    are not fetched again.
+    """
+
+    def __init__(self: DiscoveryState, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+        self._fetched: List[Tuple[str, Optional[str], float]] = []
+        self._removed: List[str] = []
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional[DiscoveryState]:
+        """
+        Opens the supplier's discovery state if 'discovery_state_dir' is
+        configured.
+
+        Supplier configuration keys:
+            - 'discovery_state_dir': Directory holding one state file per
+              supplier.
+        """
+        directory = config.get("discovery_state_dir")
+        if not directory:
+            return None
+        return cls(os.path.join(directory, f"{config.get('name') or 'default'}.sqlite"))
+
+    def fingerprints(self: DiscoveryState) -> Dict[str, Optional[str]]:
+        """
+        Returns the fingerprint of every page recorded so far, by URL.
+        """
+        return dict(self._conn.execute("SELECT url, fingerprint FROM pages"))
+
+    def record(self: DiscoveryState, url: str, fingerprint: Optional[str]) -> None:
+        """
+        Notes that a page was fetched with the given fingerprint.
+        """
+        self._fetched.append((url, fingerprint, time.time()))
+
+    def forget(self: DiscoveryState, urls: Iterable[str]) -> None:
+        """
+        Drops pages no longer listed by the supplier.
+        """
+        self._removed.extend(urls)
+
+    def close(self: DiscoveryState) -> None:
+        """
+        Writes the recorded pages and closes the state file.
+        """
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO pages VALUES (?, ?, ?)", self._fetched
+                )
+                self._conn.executemany(
+                    "DELETE FROM pages WHERE url = ?", ((url,) for url in self._removed)
+                )
+        finally:
+            self._fetched.clear()
+            self._removed.clear()
+            self._conn.close()
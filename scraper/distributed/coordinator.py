@@ -0,0 +1,240 @@
+# scraper/distributed/coordinator.py
+
+from __future__ import annotations
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import re
+import time
+from typing import Any, Dict, Iterator, List
+
+import requests
+
+from scraper.distributed.work_queue import (
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_MAX_ATTEMPTS,
+    FAILED,
+    LEASED,
+    PENDING,
+    WorkQueue,
+)
+from scraper.models.product import ProductData
+from scraper.supplier_manager import read_supplier_configs
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Configuration keys (alone or as a suffix, as in 'proxy_password') holding
+# secrets. They are kept out of job specs, which anyone who can read the
+# queue file can read.
+CREDENTIAL_KEYS = ("username", "password", "api_key", "token", "secret")
+
+
+def is_credential_key(key: str) -> bool:
+    return key in CREDENTIAL_KEYS or key.endswith(
+        tuple(f"_{credential}" for credential in CREDENTIAL_KEYS)
+    )
+
+
+def load_credentials(supplier: str) -> Dict[str, Any]:
+    """
+    Returns a supplier's credentials on this host: the credential keys of
+    its entry in suppliers.yaml, overridden by environment variables named
+    SCRAPER_<SUPPLIER>_<KEY> (for example SCRAPER_STEEL_AND_TUBE_PASSWORD).
+    """
+    config = read_supplier_configs().get(supplier) or {}
+    credentials = {key: value for key, value in config.items() if is_credential_key(key)}
+    prefix = f"SCRAPER_{re.sub(r'[^A-Z0-9]', '_', supplier.upper())}_"
+    for name, value in os.environ.items():
+        if name.startswith(prefix):
+            key = name[len(prefix):].lower()
+            if is_credential_key(key):
+                credentials[key] = value
+    return credentials
+
+
+def job_spec(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Turns a supplier configuration into something a worker process on any
+    host can rebuild it from: component classes become 'module:qualname'
+    strings, and credentials (see CREDENTIAL_KEYS) and values that cannot be
+    stored as JSON are left out. Workers load the credentials themselves
+    (see load_credentials).
+    """
+    spec: Dict[str, Any] = {}
+    for key, value in config.items():
+        if is_credential_key(key):
+            continue
+        if key.endswith("_class") and isinstance(value, type):
+            spec[key] = f"{value.__module__}:{value.__qualname__}"
+            continue
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            logging.debug(f"Leaving '{key}' out of the job spec")
+            continue
+        spec[key] = value
+    return spec
+
+
+def config_from_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Rebuilds a supplier configuration from job_spec, importing its classes
+    and adding the supplier's credentials on this host.
+    """
+    config = {**spec, **load_credentials(spec.get("name") or "default")}
+    for key, value in spec.items():
+        if key.endswith("_class") and isinstance(value, str):
+            module_name, _, qualname = value.partition(":")
+            target: Any = importlib.import_module(module_name)
+            for attribute in qualname.split("."):
+                target = getattr(target, attribute)
+            config[key] = target
+    return config
+
+
+def _start_local_workers(
+    queue_path: str, job_id: int, count: int, config: Dict[str, Any]
+) -> List[multiprocessing.process.BaseProcess]:
+    # Imported here: the worker imports the scraper, which imports this module
+    from scraper.distributed.worker import run_worker
+
+    context = multiprocessing.get_context("spawn")
+    workers = []
+    for _ in range(count):
+        worker = context.Process(
+            target=run_worker,
+            args=(queue_path,),
+            kwargs={
+                "job_id": job_id,
+                "lease_seconds": float(config.get("lease_seconds", DEFAULT_LEASE_SECONDS)),
+                "max_attempts": int(config.get("max_attempts", DEFAULT_MAX_ATTEMPTS)),
+                "exit_when_done": True,
+            },
+            daemon=True,
+        )
+        worker.start()
+        workers.append(worker)
+    return workers
+
+
+def _iter_job_results(
+    work_queue: WorkQueue,
+    job_id: int,
+    config: Dict[str, Any],
+    workers: List[multiprocessing.process.BaseProcess],
+) -> Iterator[List[ProductData]]:
+    """
+    Yields each unit's products, in page order, as soon as the unit and
+    every unit before it are done, raising ValueError if a unit failed for
+    good, the local workers crashed, or the job takes longer than
+    'distributed_timeout'.
+    """
+    poll_interval = float(config.get("distributed_poll_interval", DEFAULT_POLL_INTERVAL))
+    timeout = config.get("distributed_timeout")
+    deadline = None if timeout is None else time.monotonic() + float(timeout)
+    unit_ids = work_queue.unit_ids(job_id)
+    next_unit = 0
+    while True:
+        # Counted before collecting results, so a finished job's last units
+        # are collected below
+        counts = work_queue.job_counts(job_id)
+        if counts[FAILED]:
+            errors = "; ".join(work_queue.job_errors(job_id))
+            raise ValueError(f"Job {job_id}: {counts[FAILED]} work unit(s) failed: {errors}")
+        done = set(work_queue.done_units(job_id))
+        while next_unit < len(unit_ids) and unit_ids[next_unit] in done:
+            yield work_queue.unit_products(unit_ids[next_unit])
+            next_unit += 1
+        if not counts[PENDING] and not counts[LEASED]:
+            return
+        if workers and not any(worker.is_alive() for worker in workers):
+            exit_codes = [worker.exitcode for worker in workers]
+            if any(exit_codes):
+                raise ValueError(
+                    f"Job {job_id}: local workers exited with codes {exit_codes}"
+                )
+        if deadline is not None and time.monotonic() > deadline:
+            raise ValueError(
+                f"Job {job_id} did not finish within {timeout}s "
+                f"({counts[PENDING]} unit(s) pending, {counts[LEASED]} leased)"
+            )
+        time.sleep(poll_interval)
+
+
+def iter_distributed_products(
+    config: Dict[str, Any],
+    page_fetcher: Any,
+    session: requests.Session,
+) -> Iterator[List[ProductData]]:
+    """
+    Scrapes a supplier by splitting its pages into work units on a queue
+    for workers to scrape, and yields each unit's products in page order as
+    soon as the unit and the units before it are done, so products stream
+    out while the rest of the job runs. A SKU found by more than one unit
+    is yielded once.
+
+    Workers are started with `main.py --worker --work-queue PATH`, on this
+    host or any host that shares the queue file; 'local_workers' of them are
+    also started here for the length of the job. Credentials are not put on
+    the queue: each worker reads them from its own suppliers.yaml or
+    environment (see load_credentials).
+
+    Supplier configuration keys:
+        - 'work_queue': Path of the SQLite queue file.
+        - 'local_workers' (optional): Worker processes to start on this host
+          (default 1; 0 relies on workers started elsewhere).
+        - 'lease_seconds' (optional): How long a worker may go without
+          renewing its lease on a unit before the unit is handed to another
+          worker (default 300). Workers renew it while they scrape.
+        - 'max_attempts' (optional): Attempts per unit before the job fails
+          (default 3).
+
+    Workers on any host take 'lease_seconds' and 'max_attempts' from the
+    job, whatever they were started with.
+        - 'distributed_poll_interval' (optional): Seconds between progress
+          checks (default 1).
+        - 'distributed_timeout' (optional): Give up on the job after this
+          many seconds (default no limit).
+        - 'resume' (optional): Carry on with the supplier's unfinished job,
+          if there is one, instead of planning a new one. Its failed units
+          get another 'max_attempts' attempts.
+    """
+    supplier = config.get("name") or "default"
+    queue_path = config["work_queue"]
+    work_queue = WorkQueue(queue_path)
+    workers: List[multiprocessing.process.BaseProcess] = []
+    try:
+        job_id = work_queue.unfinished_job(supplier) if config.get("resume") else None
+        if job_id is None:
+            payloads = page_fetcher.plan_work_units(session)
+            if payloads is None:
+                raise ValueError(
+                    f"{type(page_fetcher).__name__} cannot split {supplier} into work units"
+                )
+            job_id = work_queue.create_job(supplier, job_spec(config), payloads)
+            logging.info(f"Job {job_id}: split {supplier} into {len(payloads)} work unit(s)")
+        else:
+            retried = work_queue.retry_failed(job_id)
+            logging.info(f"Resuming job {job_id} for {supplier}, retrying {retried} failed unit(s)")
+
+        local_workers = int(config.get("local_workers", 1))
+        if local_workers > 0:
+            workers = _start_local_workers(queue_path, job_id, local_workers, config)
+
+        seen_skus = set()
+        for products in _iter_job_results(work_queue, job_id, config, workers):
+            unseen = []
+            for product in products:
+                if product.sku not in seen_skus:
+                    seen_skus.add(product.sku)
+                    unseen.append(product)
+            yield unseen
+        work_queue.finish_job(job_id)
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+        work_queue.close()
@@ -0,0 +1,312 @@
+# scraper/distributed/work_queue.py
+
+from __future__ import annotations
+import dataclasses
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from scraper.models.product import ProductData
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_LEASE_SECONDS = 300.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS jobs ("
+    " id INTEGER PRIMARY KEY, supplier TEXT NOT NULL, spec TEXT NOT NULL,"
+    " created_at REAL NOT NULL, finished_at REAL)",
+    "CREATE TABLE IF NOT EXISTS units ("
+    " id INTEGER PRIMARY KEY, job_id INTEGER NOT NULL, payload TEXT NOT NULL,"
+    " state TEXT NOT NULL, worker TEXT, lease_expires REAL,"
+    " attempts INTEGER NOT NULL DEFAULT 0, error TEXT, products TEXT)",
+    "CREATE INDEX IF NOT EXISTS units_by_state ON units (state, lease_expires)",
+    "CREATE INDEX IF NOT EXISTS units_by_job ON units (job_id, state)",
+)
+
+
+@dataclass
+class WorkUnit:
+    """
+    A slice of a supplier's page space leased to one worker.
+
+    Attributes:
+        id: The unit's id in the queue.
+        job_id: The job the unit belongs to.
+        payload: What to fetch, as planned by PageFetcher.plan_work_units.
+        attempts: How many times the unit has been leased, including now.
+    """
+
+    id: int
+    job_id: int
+    payload: Any
+    attempts: int
+
+
+class WorkQueue:
+    """
+    Work queue for distributed scraping, backed by one SQLite file.
+
+    A coordinator adds a job made of work units. Workers lease units one at
+    a time, scrape them, and store the products back on the unit. A unit
+    whose lease expires (its worker died or hung) is handed to another
+    worker; a unit that fails, or whose lease expires, on its last allowed
+    attempt fails its job. SQLite's locking makes this safe for any number
+    of worker processes on one host (or on hosts sharing a filesystem with
+    working locks).
+    """
+
+    def __init__(self: WorkQueue, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+
+    def _transaction(self: WorkQueue):
+        return _ImmediateTransaction(self._conn)
+
+    def create_job(
+        self: WorkQueue, supplier: str, spec: Dict[str, Any], payloads: List[Any]
+    ) -> int:
+        """
+        Adds a job and its work units, returning the job id.
+
+        Args:
+            supplier: The supplier being scraped.
+            spec: Everything a worker needs to scrape the supplier's units
+                  (see coordinator.job_spec).
+            payloads: One JSON-serialisable payload per work unit.
+        """
+        with self._transaction():
+            job_id = self._conn.execute(
+                "INSERT INTO jobs (supplier, spec, created_at) VALUES (?, ?, ?)",
+                (supplier, json.dumps(spec), time.time()),
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO units (job_id, payload, state) VALUES (?, ?, ?)",
+                ((job_id, json.dumps(payload), PENDING) for payload in payloads),
+            )
+        return job_id
+
+    def unfinished_job(self: WorkQueue, supplier: str) -> Optional[int]:
+        """
+        Returns the supplier's most recent job that has not finished, if any.
+        """
+        row = self._conn.execute(
+            "SELECT MAX(id) FROM jobs WHERE supplier = ? AND finished_at IS NULL",
+            (supplier,),
+        ).fetchone()
+        return row[0]
+
+    def job_spec(self: WorkQueue, job_id: int) -> Dict[str, Any]:
+        row = self._conn.execute("SELECT spec FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown job {job_id}")
+        return json.loads(row[0])
+
+    def lease(
+        self: WorkQueue,
+        worker: str,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        job_id: Optional[int] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> Optional[WorkUnit]:
+        """
+        Leases the oldest pending unit (or one whose lease has expired),
+        optionally only from one job. Returns None if there is none.
+
+        A unit whose lease expired on its last allowed attempt (the job
+        spec's 'max_attempts', or `max_attempts`) is failed instead, so a unit that kills or hangs every worker that takes it
+        fails its job rather than being handed out forever.
+        """
+        now = time.time()
+        job_filter = "" if job_id is None else " AND job_id = :job_id"
+        with self._transaction():
+            self._conn.execute(
+                "UPDATE units SET state = :failed, lease_expires = NULL,"
+                " error = 'Lease expired on attempt ' || attempts"
+                " WHERE state = :leased AND lease_expires < :now"
+                # The job's own 'max_attempts', if its spec sets one
+                " AND attempts >= COALESCE((SELECT json_extract(spec, '$.max_attempts')"
+                " FROM jobs WHERE jobs.id = units.job_id), :max_attempts)"
+                f"{job_filter}",
+                {
+                    "failed": FAILED,
+                    "leased": LEASED,
+                    "now": now,
+                    "max_attempts": max_attempts,
+                    "job_id": job_id,
+                },
+            )
+            row = self._conn.execute(
+                "SELECT id, job_id, payload, attempts FROM units"
+                " WHERE (state = :pending OR (state = :leased AND lease_expires < :now))"
+                f"{job_filter} ORDER BY id LIMIT 1",
+                {"pending": PENDING, "leased": LEASED, "now": now, "job_id": job_id},
+            ).fetchone()
+            if row is None:
+                return None
+            unit_id, unit_job_id, payload, attempts = row
+            self._conn.execute(
+                "UPDATE units SET state = ?, worker = ?, lease_expires = ?,"
+                " attempts = attempts + 1 WHERE id = ?",
+                (LEASED, worker, now + lease_seconds, unit_id),
+            )
+        return WorkUnit(unit_id, unit_job_id, json.loads(payload), attempts + 1)
+
+    def renew(
+        self: WorkQueue, unit: WorkUnit, worker: str, lease_seconds: float
+    ) -> bool:
+        """
+        Extends a worker's lease on a unit to `lease_seconds` from now.
+        Returns False if the lease was lost to another worker.
+        """
+        with self._transaction():
+            updated = self._conn.execute(
+                "UPDATE units SET lease_expires = ?"
+                " WHERE id = ? AND state = ? AND worker = ?",
+                (time.time() + lease_seconds, unit.id, LEASED, worker),
+            ).rowcount
+        return updated == 1
+
+    def complete(
+        self: WorkQueue, unit: WorkUnit, worker: str, products: List[ProductData]
+    ) -> bool:
+        """
+        Stores a unit's products. Returns False (and stores nothing) if the
+        worker's lease was lost to another worker in the meantime.
+        """
+        rows = json.dumps([dataclasses.astuple(product) for product in products])
+        with self._transaction():
+            updated = self._conn.execute(
+                "UPDATE units SET state = ?, products = ?, lease_expires = NULL"
+                " WHERE id = ? AND state = ? AND worker = ?",
+                (DONE, rows, unit.id, LEASED, worker),
+            ).rowcount
+        return updated == 1
+
+    def fail(
+        self: WorkQueue,
+        unit: WorkUnit,
+        worker: str,
+        error: str,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> None:
+        """
+        Records a failed attempt, returning the unit to the queue unless it
+        has used up its attempts.
+        """
+        state = FAILED if unit.attempts >= max_attempts else PENDING
+        with self._transaction():
+            self._conn.execute(
+                "UPDATE units SET state = ?, error = ?, lease_expires = NULL"
+                " WHERE id = ? AND state = ? AND worker = ?",
+                (state, error, unit.id, LEASED, worker),
+            )
+
+    def retry_failed(self: WorkQueue, job_id: int) -> int:
+        """
+        Returns a job's failed units to the queue with fresh attempts,
+        returning how many there were.
+        """
+        with self._transaction():
+            return self._conn.execute(
+                "UPDATE units SET state = ?, attempts = 0, error = NULL"
+                " WHERE job_id = ? AND state = ?",
+                (PENDING, job_id, FAILED),
+            ).rowcount
+
+    def job_counts(self: WorkQueue, job_id: int) -> Dict[str, int]:
+        """
+        Returns the number of the job's units in each state.
+        """
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        for state, count in self._conn.execute(
+            "SELECT state, COUNT(*) FROM units WHERE job_id = ? GROUP BY state", (job_id,)
+        ):
+            counts[state] = count
+        return counts
+
+    def job_errors(self: WorkQueue, job_id: int) -> List[str]:
+        return [
+            row[0]
+            for row in self._conn.execute(
+                "SELECT error FROM units WHERE job_id = ? AND state = ? ORDER BY id",
+                (job_id, FAILED),
+            )
+        ]
+
+    def unit_ids(self: WorkQueue, job_id: int) -> List[int]:
+        """
+        Returns the ids of all the job's units, in the order they were
+        planned.
+        """
+        return [
+            row[0]
+            for row in self._conn.execute(
+                "SELECT id FROM units WHERE job_id = ? ORDER BY id", (job_id,)
+            )
+        ]
+
+    def done_units(self: WorkQueue, job_id: int) -> List[int]:
+        """
+        Returns the ids of the job's finished units, in the order the units
+        were planned.
+        """
+        return [
+            row[0]
+            for row in self._conn.execute(
+                "SELECT id FROM units WHERE job_id = ? AND state = ? ORDER BY id",
+                (job_id, DONE),
+            )
+        ]
+
+    def unit_products(self: WorkQueue, unit_id: int) -> List[ProductData]:
+        """
+        Returns the products stored by a finished unit.
+        """
+        row = self._conn.execute(
+            "SELECT products FROM units WHERE id = ? AND state = ?", (unit_id, DONE)
+        ).fetchone()
+        if row is None or row[0] is None:
+            raise ValueError(f"Work unit {unit_id} has no stored products")
+        return [ProductData(*fields) for fields in json.loads(row[0])]
+
+    def finish_job(self: WorkQueue, job_id: int) -> None:
+        """
+        Marks a job finished and drops its stored products.
+        """
+        with self._transaction():
+            self._conn.execute(
+                "UPDATE jobs SET finished_at = ? WHERE id = ?", (time.time(), job_id)
+            )
+            self._conn.execute("UPDATE units SET products = NULL WHERE job_id = ?", (job_id,))
+
+    def close(self: WorkQueue) -> None:
+        self._conn.close()
+
+
+class _ImmediateTransaction:
+    """
+    Takes the database write lock up front, so two workers cannot lease the
+    same unit.
+    """
+
+    def __init__(self: _ImmediateTransaction, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+
+    def __enter__(self: _ImmediateTransaction) -> None:
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self: _ImmediateTransaction, exc_type, exc, traceback) -> None:
+        self._conn.execute("COMMIT" if exc_type is None else "ROLLBACK")
@@ -0,0 +1,161 @@
+# scraper/distributed/worker.py
+
+from __future__ import annotations
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+
+from scraper.core.scraper import Scraper
+from scraper.distributed.coordinator import config_from_spec
+from scraper.distributed.work_queue import (
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_MAX_ATTEMPTS,
+    LEASED,
+    PENDING,
+    WorkQueue,
+    WorkUnit,
+)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+class _LeaseRenewer:
+    """
+    Renews a unit's lease from a background thread while the unit is
+    scraped, so a slow unit is not handed to another worker.
+    """
+
+    def __init__(
+        self: _LeaseRenewer,
+        queue_path: str,
+        unit: WorkUnit,
+        worker_id: str,
+        lease_seconds: float,
+    ) -> None:
+        self.queue_path = queue_path
+        self.unit = unit
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lease-renewer", daemon=True)
+
+    def _run(self: _LeaseRenewer) -> None:
+        # The worker's connection is busy with the unit, so use another
+        work_queue = WorkQueue(self.queue_path)
+        try:
+            while True:
+                try:
+                    if not work_queue.renew(self.unit, self.worker_id, self.lease_seconds):
+                        return
+                except sqlite3.Error as e:
+                    logging.warning(f"Could not renew the lease on unit {self.unit.id}: {e}")
+                if self._stop.wait(self.lease_seconds / 3):
+                    return
+        finally:
+            work_queue.close()
+
+    def __enter__(self: _LeaseRenewer) -> _LeaseRenewer:
+        self._thread.start()
+        return self
+
+    def __exit__(self: _LeaseRenewer, exc_type, exc, traceback) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def run_worker(
+    queue_path: str,
+    worker_id: Optional[str] = None,
+    job_id: Optional[int] = None,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    poll_interval: float = 1.0,
+    idle_timeout: Optional[float] = None,
+    exit_when_done: bool = False,
+) -> int:
+    """
+    Leases work units from a queue and scrapes them until told to stop.
+
+    The worker logs in once per job and reuses the session for each of the
+    job's units. A unit that raises is returned to the queue for another
+    attempt (see WorkQueue.fail). The lease on a unit is renewed while it
+    is scraped. A job's 'lease_seconds' and 'max_attempts', if its spec sets
+    them, take precedence over the arguments.
+
+    Args:
+        queue_path: Path of the SQLite queue file.
+        worker_id: Name recorded on leased units (default host:pid:thread).
+        job_id: Only take units of this job.
+        lease_seconds: How long the worker may hold a unit without renewing
+                       its lease.
+        max_attempts: Attempts per unit before it fails its job.
+        poll_interval: Seconds to wait when there is no work.
+        idle_timeout: Exit after this many seconds without work (default
+                      run until killed).
+        exit_when_done: Exit once `job_id` has no pending or leased units.
+
+    Returns:
+        The number of units scraped.
+    """
+    worker_id = worker_id or default_worker_id()
+    work_queue = WorkQueue(queue_path)
+    scraper = Scraper()
+    # The configuration and session of the job the last unit belonged to
+    current: Optional[Tuple[int, Dict[str, Any], Optional[requests.Session]]] = None
+    completed = 0
+    idle_since = time.monotonic()
+    try:
+        while True:
+            unit = work_queue.lease(
+                worker_id, lease_seconds, job_id=job_id, max_attempts=max_attempts
+            )
+            if unit is None:
+                if exit_when_done and job_id is not None:
+                    counts = work_queue.job_counts(job_id)
+                    if not counts[PENDING] and not counts[LEASED]:
+                        break
+                if idle_timeout is not None and time.monotonic() - idle_since > idle_timeout:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            if current is None or current[0] != unit.job_id:
+                current = (unit.job_id, config_from_spec(work_queue.job_spec(unit.job_id)), None)
+            _, config, session = current
+            job_lease_seconds = float(config.get("lease_seconds", lease_seconds))
+            job_max_attempts = int(config.get("max_attempts", max_attempts))
+            try:
+                with _LeaseRenewer(queue_path, unit, worker_id, job_lease_seconds):
+                    if session is None:
+                        session = scraper.log_in(config)
+                        current = (unit.job_id, config, session)
+                    products = scraper.scrape_unit(config, unit.payload, session=session)
+            except Exception as e:
+                logging.error(
+                    f"Worker {worker_id}: unit {unit.id} of job {unit.job_id} failed "
+                    f"(attempt {unit.attempts}): {e}"
+                )
+                work_queue.fail(unit, worker_id, repr(e), job_max_attempts)
+                # The session may be what failed
+                current = (unit.job_id, config, None)
+            else:
+                if work_queue.complete(unit, worker_id, products):
+                    completed += 1
+                else:
+                    logging.warning(
+                        f"Worker {worker_id}: lost the lease on unit {unit.id}, "
+                        "discarding its products"
+                    )
+            idle_since = time.monotonic()
+    finally:
+        work_queue.close()
+    logging.info(f"Worker {worker_id} finished after {completed} work unit(s)")
+    return completed
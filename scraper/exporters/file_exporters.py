@@ -0,0 +1,362 @@
+# scraper/exporters/file_exporters.py
+
+from __future__ import annotations
+import abc
+import bz2
+import csv
+import gzip
+import io
+import json
+import logging
+import lzma
+import math
+import os
+from typing import IO, Iterable, List, Optional, Union
+
+from ..interfaces.exporter import Exporter
+from ..models.product import ProductData
+from ..models.product_batch import (
+    NO_STOCK,
+    ProductBatch,
+    iter_product_rows,
+    iter_unit_rows,
+)
+from ..storage.price_history import PriceChange
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional (the 'parquet' extra)
+    pa = pc = pq = None
+
+# Column order of every file format
+COLUMNS = ["sku", "name", "price", "stock", "unit", "normalised_price"]
+
+# Bytes handed to the file (or compressor) per write
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+GZIP = "gzip"
+BZ2 = "bz2"
+XZ = "xz"
+_SUFFIXES = {".gz": GZIP, ".bz2": BZ2, ".xz": XZ}
+
+# Rows per Parquet row group; also how many rows are held before writing
+DEFAULT_ROW_GROUP_SIZE = 128 * 1024
+
+
+def compression_for(path: str) -> Optional[str]:
+    """
+    Returns the compression implied by a file name ('prices.csv.gz' is
+    gzip), or None.
+    """
+    return _SUFFIXES.get(os.path.splitext(path)[1].lower())
+
+
+def changes_path_for(path: str) -> str:
+    """
+    Returns where the change set of an export is written ('prices.csv.gz'
+    has its changes in 'prices.changes.jsonl').
+    """
+    root, extension = os.path.splitext(path)
+    if extension.lower() in _SUFFIXES:
+        root = os.path.splitext(root)[0]
+    return f"{root}.changes.jsonl"
+
+
+class FileExporter(Exporter):
+    """
+    Base class for exporters that stream products to a local file.
+
+    Batches are written as they arrive, through a large write buffer, so
+    memory use does not grow with the catalogue. The file is written under a
+    temporary name and moved into place when complete, so readers never see
+    a half-written export.
+    """
+
+    def __init__(self: FileExporter, path: str) -> None:
+        self.path = path
+
+    def export_data(self: FileExporter, product_data: List[ProductData]):
+        self.export_stream([product_data])
+
+    def export_stream(
+        self: FileExporter, batches: Iterable[Union[List[ProductData], ProductBatch]]
+    ) -> int:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            exported = self._write(tmp_path, batches)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        logging.info(f"Exported {exported} product(s) to {self.path}")
+        return exported
+
+    def export_changes(self: FileExporter, changes: List[PriceChange]) -> None:
+        """
+        Writes the run's changes to changes_path_for(path) as JSON Lines: an
+        object per SKU with its 'kind' ('added', 'changed' or 'removed'),
+        'sku', 'name', 'old_price', 'price', 'old_stock' and 'stock'.
+        """
+        path = changes_path_for(self.path)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for change in changes:
+                    old, new = change.old, change.new
+                    record = {
+                        "kind": change.kind,
+                        "sku": change.sku,
+                        "name": (new or old).name,
+                        "old_price": old.price if old else None,
+                        "price": new.price if new else None,
+                        "old_stock": old.stock if old else None,
+                        "stock": new.stock if new else None,
+                    }
+                    f.write(json.dumps(record))
+                    f.write("\n")
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        logging.info(f"Exported {len(changes)} change(s) to {path}")
+
+    @abc.abstractmethod
+    def _write(
+        self: FileExporter,
+        path: str,
+        batches: Iterable[Union[List[ProductData], ProductBatch]],
+    ) -> int:
+        """
+        Writes every product from `batches` to `path` and returns how many
+        there were.
+        """
+        pass
+
+
+class _TextFileExporter(FileExporter):
+    """
+    Writes a text format, optionally compressed.
+
+    Args:
+        path: The file to write.
+        compression: 'gzip', 'bz2', 'xz' or None (default: from the file
+                     name's suffix).
+        compression_level: Compressor level (default the format's own
+                           balanced setting).
+        buffer_size: Bytes buffered before each write.
+    """
+
+    def __init__(
+        self: _TextFileExporter,
+        path: str,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        super().__init__(path)
+        self.compression = compression or compression_for(path)
+        if self.compression not in (None, GZIP, BZ2, XZ):
+            raise ValueError(
+                f"Unknown compression '{self.compression}', expected 'gzip', 'bz2' or 'xz'"
+            )
+        self.compression_level = compression_level
+        self.buffer_size = buffer_size
+
+    def _open(self: _TextFileExporter, path: str) -> IO[str]:
+        if self.compression is None:
+            raw = open(path, "wb", buffering=self.buffer_size)
+        else:
+            if self.compression == GZIP:
+                # gzip.open defaults to level 9, which is slow for little gain
+                level = 6 if self.compression_level is None else self.compression_level
+                compressed = gzip.open(path, "wb", compresslevel=level)
+            elif self.compression == BZ2:
+                level = 9 if self.compression_level is None else self.compression_level
+                compressed = bz2.open(path, "wb", compresslevel=level)
+            else:
+                compressed = lzma.open(path, "wb", preset=self.compression_level)
+            # Hand the compressor large chunks rather than one line at a time
+            raw = io.BufferedWriter(compressed, buffer_size=self.buffer_size)
+        return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+
+
+class CsvExporter(_TextFileExporter):
+    """
+    Exports products to a CSV file with a header row (see COLUMNS). Unknown
+    stock, unit and normalised price are written as empty fields.
+    """
+
+    def _write(self: CsvExporter, path, batches) -> int:
+        exported = 0
+        with self._open(path) as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            for batch in batches:
+                if isinstance(batch, ProductBatch):
+                    # Straight from the columns, without a tuple per row
+                    stocks = ["" if stock == NO_STOCK else stock for stock in batch.stocks]
+                    normalised = [
+                        "" if math.isnan(price) else price for price in batch.normalised_prices
+                    ]
+                    writer.writerows(
+                        zip(
+                            batch.skus,
+                            batch.names,
+                            batch.prices,
+                            stocks,
+                            ["" if unit is None else unit for unit in batch.units],
+                            normalised,
+                        )
+                    )
+                else:
+                    writer.writerows(
+                        (
+                            sku,
+                            name,
+                            price,
+                            "" if stock is None else stock,
+                            "" if unit is None else unit,
+                            "" if normalised_price is None else normalised_price,
+                        )
+                        for (name, sku, price, stock), (unit, normalised_price) in zip(
+                            iter_product_rows(batch), iter_unit_rows(batch)
+                        )
+                    )
+                exported += len(batch)
+        return exported
+
+
+_json_string = json.encoder.encode_basestring
+
+
+def _json_number(value) -> str:
+    if value is None:
+        return "null"
+    value = float(value)
+    # NaN and infinity are not valid JSON
+    return repr(value) if math.isfinite(value) else "null"
+
+
+class JsonLinesExporter(_TextFileExporter):
+    """
+    Exports products as JSON Lines: one object per product, with the keys in
+    COLUMNS and null for unknown stock, unit or normalised price (or a price
+    that is not a number).
+    """
+
+    def _write(self: JsonLinesExporter, path, batches) -> int:
+        exported = 0
+        with self._open(path) as f:
+            for batch in batches:
+                # Formatted directly rather than through json.dumps per row,
+                # which is several times slower
+                lines = [
+                    f'{{"sku":{_json_string(sku)},"name":{_json_string(name)},'
+                    f'"price":{_json_number(price)},'
+                    f'"stock":{"null" if stock is None else int(stock)},'
+                    f'"unit":{"null" if unit is None else _json_string(unit)},'
+                    f'"normalised_price":{_json_number(normalised_price)}}}'
+                    for (name, sku, price, stock), (unit, normalised_price) in zip(
+                        iter_product_rows(batch), iter_unit_rows(batch)
+                    )
+                ]
+                if lines:
+                    f.write("\n".join(lines))
+                    f.write("\n")
+                exported += len(lines)
+        return exported
+
+
+class ParquetExporter(FileExporter):
+    """
+    Exports products to a Parquet file, the fastest input for analytics
+    jobs. Requires pyarrow.
+
+    Rows are collected into row groups of `row_group_size`, so at most one
+    row group is held in memory. ProductBatch columns are converted without
+    building a Python object per row.
+
+    Args:
+        path: The file to write.
+        compression: A Parquet codec such as 'snappy' (default), 'zstd',
+                     'gzip' or 'none'.
+        row_group_size: Rows per row group.
+    """
+
+    SCHEMA = (
+        pa.schema(
+            [
+                ("sku", pa.string()),
+                ("name", pa.string()),
+                ("price", pa.float64()),
+                ("stock", pa.int64()),
+                ("unit", pa.string()),
+                ("normalised_price", pa.float64()),
+            ]
+        )
+        if pa is not None
+        else None
+    )
+
+    def __init__(
+        self: ParquetExporter,
+        path: str,
+        compression: Optional[str] = "snappy",
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    ) -> None:
+        if pa is None:
+            raise ValueError("The Parquet exporter requires pyarrow (the 'parquet' extra)")
+        super().__init__(path)
+        self.compression = compression
+        self.row_group_size = row_group_size
+
+    def _write(self: ParquetExporter, path, batches) -> int:
+        exported = 0
+        pending = ProductBatch()
+        with pq.ParquetWriter(path, self.SCHEMA, compression=self.compression) as writer:
+            for batch in batches:
+                pending.extend(batch)
+                exported += len(batch)
+                if len(pending) < self.row_group_size:
+                    continue
+                start = 0
+                while len(pending) - start >= self.row_group_size:
+                    stop = start + self.row_group_size
+                    writer.write_table(self._table(pending.slice(start, stop)))
+                    start = stop
+                pending = pending.slice(start, len(pending))
+            if len(pending):
+                writer.write_table(self._table(pending))
+        return exported
+
+    def _table(self: ParquetExporter, batch: ProductBatch) -> "pa.Table":
+        # The typed arrays are wrapped as Arrow buffers without copying
+        prices = pa.Array.from_buffers(
+            pa.float64(), len(batch), [None, pa.py_buffer(batch.prices)]
+        )
+        stocks = pa.Array.from_buffers(
+            pa.int64(), len(batch), [None, pa.py_buffer(batch.stocks)]
+        )
+        stocks = pc.if_else(pc.equal(stocks, NO_STOCK), pa.scalar(None, pa.int64()), stocks)
+        normalised = pa.Array.from_buffers(
+            pa.float64(), len(batch), [None, pa.py_buffer(batch.normalised_prices)]
+        )
+        normalised = pc.if_else(
+            pc.is_nan(normalised), pa.scalar(None, pa.float64()), normalised
+        )
+        return pa.Table.from_arrays(
+            [
+                pa.array(batch.skus, type=pa.string()),
+                pa.array(batch.names, type=pa.string()),
+                prices,
+                stocks,
+                pa.array(batch.units, type=pa.string()),
+                normalised,
+            ],
+            schema=self.SCHEMA,
+        )
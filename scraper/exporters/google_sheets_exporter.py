@@ -1,25 +1,124 @@
 import gspread
 from google.oauth2.service_account import Credentials
-from typing import List
+from gspread.utils import ValueRenderOption
+from typing import Dict, Iterable, List, Optional, Tuple
 from ..interfaces.exporter import Exporter
 from ..models.product import ProductData
+from ..models.product_batch import ProductRow, iter_product_rows
+from ..storage.price_history import PriceChange
+import datetime
+import logging
 import os
+import random
+import time
+
+# Column layout of the exported sheet
+HEADER_ROW = ["SKU", "Name", "Price", "Stock"]
+LAST_COLUMN = "D"
+
+# Column layout of the worksheet diff mode logs each run's changes to
+CHANGES_HEADER_ROW = [
+    "Date", "Change", "SKU", "Name", "Old Price", "Price", "Old Stock", "Stock"
+]
+
+# Sheets API responses worth retrying (quota exhausted, transient errors)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Keep each batch_update request well inside the API's request size limits
+DEFAULT_MAX_CELLS_PER_REQUEST = 40000
+
+
+def _product_row(row: ProductRow) -> list:
+    """
+    Converts a (name, sku, price, stock) product row into a sheet row
+    matching HEADER_ROW.
+    """
+    name, sku, price, stock = row
+    return [sku, name, price, "" if stock is None else stock]
+
+
+def _cell_text(value) -> str:
+    """
+    Renders a value the way Sheets displays it without number formatting.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _same_cell(value, cell) -> bool:
+    """
+    Compares a value about to be written with the unformatted value read
+    back from the sheet: numbers as numbers, anything else as text.
+    """
+    if _is_number(value) and _is_number(cell):
+        return float(value) == float(cell)
+    return _cell_text(value) == _cell_text(cell)
+
+
+def _row_range(first_row: int, last_row: int) -> str:
+    return f"A{first_row}:{LAST_COLUMN}{last_row}"
+
 
 class GoogleSheetsExporter(Exporter):
     """
     Exporter implementation for Google Sheets.
+
+    In the default 'replace' mode the sheet is rewritten on every export: the
+    products are written to a staging worksheet as they arrive and copied
+    over the sheet in one request once the scrape has finished, so readers
+    never see a partly written sheet and a failed scrape leaves it as it
+    was. In 'diff' mode the existing sheet is read once, rows are matched
+    by SKU, and only changed, added and removed rows are written, using as few
+    batch_update requests as possible, once the scrape has finished. Removed
+    rows are blanked and their space reused for added rows, so the sheet is
+    never left empty. With a
+    price history, diff mode also appends each run's changes to the
+    `changes_worksheet`.
     """
-    def __init__(self, spreadsheet_name: str, credentials_path: str):
+    def __init__(
+        self,
+        spreadsheet_name: str,
+        credentials_path: str,
+        mode: str = "replace",
+        client: Optional[gspread.Client] = None,
+        max_cells_per_request: int = DEFAULT_MAX_CELLS_PER_REQUEST,
+        max_retries: int = 5,
+        changes_worksheet: str = "Changes",
+    ):
         """
         Initializes the GoogleSheetsExporter.
 
         Args:
             spreadsheet_name: The name of the Google Sheet to export to.
             credentials_path: The path to the Google service account credentials JSON file.
+            mode: 'replace' to rewrite the whole sheet, or 'diff' to write only
+                  the rows that changed.
+            client: An already authorized gspread client (or a stand-in for
+                    tests). If omitted, one is created from credentials_path.
+            max_cells_per_request: Upper bound on cells written by one
+                                   batch_update request.
+            max_retries: How many times to retry a request that hit a quota
+                         or transient API error.
+            changes_worksheet: The worksheet diff mode appends the price
+                               history's changes to; created if missing.
         """
+        if mode not in ("replace", "diff"):
+            raise ValueError(f"Unknown export mode '{mode}', expected 'replace' or 'diff'")
         self.spreadsheet_name = spreadsheet_name
         self.credentials_path = credentials_path
-        self.client = self._authenticate()
+        self.mode = mode
+        self.max_cells_per_request = max_cells_per_request
+        self.max_retries = max_retries
+        self.changes_worksheet = changes_worksheet
+        self._sleep = time.sleep
+        self.client = client if client is not None else self._authenticate()
 
     def _authenticate(self) -> gspread.Client:
         """
@@ -48,23 +147,299 @@ class GoogleSheetsExporter(Exporter):
         Args:
             product_data: A list of ProductData objects to export.
         """
+        self.export_stream([product_data])
+
+    def export_stream(self, batches: Iterable[List[ProductData]]) -> int:
+        """
+        Exports the products from `batches` to the sheet, consuming the
+        batches as they arrive rather than building the whole sheet in memory.
+
+        Args:
+            batches: An iterable of lists of ProductData objects (or ProductBatch objects).
+
+        Returns:
+            The number of products exported.
+        """
+        exported = 0
+        # Only Sheets errors are handled here; errors raised by the scrape
+        # producing the batches propagate to the caller
         try:
             spreadsheet = self.client.open(self.spreadsheet_name)
             worksheet = spreadsheet.sheet1 # Assuming data is exported to the first sheet
 
-            # Prepare data for export (e.g., list of lists)
-            # Assuming ProductData has attributes like name, price, url
-            data_to_export = [["Name", "Price", "URL"]] # Header row
-            for product in product_data:
-                data_to_export.append([product.name, product.price, product.url])
-
-            # Clear existing content and write new data
-            worksheet.clear()
-            worksheet.update(data_to_export)
+            if self.mode == "diff":
+                exported = self._export_diff(spreadsheet, worksheet, batches)
+            else:
+                exported = self._export_replace(spreadsheet, worksheet, batches)
 
-            print(f"Successfully exported data to Google Sheet: {self.spreadsheet_name}")
+            logging.info(
+                f"Successfully exported {exported} product(s) to Google Sheet: {self.spreadsheet_name}"
+            )
 
         except gspread.exceptions.SpreadsheetNotFound:
-            print(f"Error: Google Sheet '{self.spreadsheet_name}' not found.")
-        except Exception as e:
-            print(f"An error occurred during export: {e}")
\ No newline at end of file
+            logging.error(f"Google Sheet '{self.spreadsheet_name}' not found.")
+        except gspread.exceptions.GSpreadException as e:
+            logging.error(f"An error occurred during export: {e}")
+        return exported
+
+    def export_changes(self, changes: List[PriceChange]) -> None:
+        """
+        In diff mode, appends a row per changed SKU to the changes worksheet,
+        so the sheet keeps a log of what changed in each run.
+        """
+        if self.mode != "diff" or not changes:
+            return
+        date = datetime.date.today().isoformat()
+        rows = []
+        for change in changes:
+            old, new = change.old, change.new
+            rows.append(
+                [
+                    date,
+                    change.kind,
+                    change.sku,
+                    (new or old).name,
+                    _cell_text(old.price) if old else "",
+                    _cell_text(new.price) if new else "",
+                    _cell_text(old.stock) if old else "",
+                    _cell_text(new.stock) if new else "",
+                ]
+            )
+        try:
+            spreadsheet = self.client.open(self.spreadsheet_name)
+            try:
+                worksheet = spreadsheet.worksheet(self.changes_worksheet)
+            except gspread.exceptions.WorksheetNotFound:
+                worksheet = self._with_retries(
+                    spreadsheet.add_worksheet,
+                    self.changes_worksheet,
+                    rows=1,
+                    cols=len(CHANGES_HEADER_ROW),
+                )
+                self._with_retries(worksheet.update, [CHANGES_HEADER_ROW], "A1")
+            self._with_retries(worksheet.append_rows, rows, value_input_option="RAW")
+            logging.info(
+                f"Logged {len(rows)} change(s) to Google Sheet: {self.spreadsheet_name}"
+            )
+        except gspread.exceptions.GSpreadException as e:
+            logging.error(f"An error occurred while logging changes: {e}")
+
+    def _export_replace(
+        self, spreadsheet, worksheet, batches: Iterable[List[ProductData]]
+    ) -> int:
+        """
+        Appends each batch to a staging worksheet, then replaces the sheet's
+        values with the staging worksheet's in one batch update.
+        """
+        staging_title = f"{worksheet.title} (staging)"
+        # A staging worksheet left behind by an interrupted export
+        self._delete_worksheet(spreadsheet, staging_title)
+        staging = self._with_retries(
+            spreadsheet.add_worksheet, staging_title, rows=1, cols=len(HEADER_ROW)
+        )
+        try:
+            self._with_retries(staging.update, [HEADER_ROW], "A1")
+            exported = 0
+            for batch in batches:
+                if not batch:
+                    continue
+                self._with_retries(
+                    staging.append_rows,
+                    [_product_row(row) for row in iter_product_rows(batch)],
+                    value_input_option="RAW",
+                )
+                exported += len(batch)
+
+            row_count = exported + 1
+            columns = {"startColumnIndex": 0, "endColumnIndex": len(HEADER_ROW)}
+            self._with_retries(
+                spreadsheet.batch_update,
+                {
+                    "requests": [
+                        {
+                            "updateSheetProperties": {
+                                "properties": {
+                                    "sheetId": worksheet.id,
+                                    "gridProperties": {
+                                        "rowCount": max(row_count, worksheet.row_count)
+                                    },
+                                },
+                                "fields": "gridProperties.rowCount",
+                            }
+                        },
+                        {
+                            "updateCells": {
+                                "range": {"sheetId": worksheet.id},
+                                "fields": "userEnteredValue",
+                            }
+                        },
+                        {
+                            "copyPaste": {
+                                "source": {
+                                    "sheetId": staging.id,
+                                    "startRowIndex": 0,
+                                    "endRowIndex": row_count,
+                                    **columns,
+                                },
+                                "destination": {
+                                    "sheetId": worksheet.id,
+                                    "startRowIndex": 0,
+                                    "endRowIndex": row_count,
+                                    **columns,
+                                },
+                                "pasteType": "PASTE_VALUES",
+                            }
+                        },
+                    ]
+                },
+            )
+            return exported
+        finally:
+            self._delete_worksheet(spreadsheet, staging_title)
+
+    def _delete_worksheet(self, spreadsheet, title: str) -> None:
+        """
+        Deletes a worksheet if it exists. Failures are logged rather than
+        raised, so they do not hide the error that ended an export.
+        """
+        try:
+            worksheet = spreadsheet.worksheet(title)
+            self._with_retries(spreadsheet.del_worksheet, worksheet)
+        except gspread.exceptions.WorksheetNotFound:
+            pass
+        except gspread.exceptions.GSpreadException as e:
+            logging.warning(f"Could not delete worksheet '{title}': {e}")
+
+    def _export_diff(
+        self, spreadsheet, worksheet, batches: Iterable[List[ProductData]]
+    ) -> int:
+        """
+        Writes only the rows whose SKU is new, changed or no longer present.
+        Changed rows are held until the batches run out, so a failed scrape
+        leaves the sheet as it was.
+        """
+        # Unformatted, so number formats (currency, decimals) on the sheet
+        # do not make every price look changed
+        values = self._with_retries(
+            worksheet.get_all_values, value_render_option=ValueRenderOption.unformatted
+        )
+        if not values or values[0][: len(HEADER_ROW)] != HEADER_ROW:
+            logging.info("Sheet layout does not match, rewriting the whole sheet.")
+            return self._export_replace(spreadsheet, worksheet, batches)
+
+        # Map SKU -> (sheet row number, cell values)
+        existing: Dict[str, Tuple[int, Optional[list]]] = {}
+        free_rows: List[int] = []
+        # Free rows that still hold data and must be blanked if not reused
+        stale_rows = set()
+        for row_number, row in enumerate(values[1:], start=2):
+            cells = (row + [""] * len(HEADER_ROW))[: len(HEADER_ROW)]
+            sku = _cell_text(cells[0])
+            if not sku or sku in existing:
+                free_rows.append(row_number)
+                if any(cell != "" for cell in cells):
+                    stale_rows.add(row_number)
+            else:
+                existing[sku] = (row_number, cells)
+        next_row = len(values) + 1
+
+        pending: Dict[int, list] = {}
+        # New SKUs are placed once removed rows are known, so they can reuse them
+        added: Dict[str, list] = {}
+        exported = 0
+        for batch in batches:
+            for product_row in iter_product_rows(batch):
+                row = _product_row(product_row)
+                sku = _cell_text(row[0])
+                exported += 1
+                if sku in existing:
+                    row_number, cells = existing[sku]
+                    if not all(map(_same_cell, row, cells)):
+                        pending[row_number] = row
+                    # Mark the SKU as still present
+                    existing[sku] = (row_number, None)
+                else:
+                    # Duplicate SKUs in the scrape: the last row wins
+                    added[sku] = row
+
+        removed_rows = [
+            row_number for row_number, cells in existing.values() if cells is not None
+        ]
+        stale_rows.update(removed_rows)
+        free_rows = sorted(free_rows + removed_rows)
+        for row in added.values():
+            if free_rows:
+                pending[free_rows.pop(0)] = row
+            else:
+                pending[next_row] = row
+                next_row += 1
+        # Whatever is left over held SKUs that are no longer listed
+        for row_number in free_rows:
+            if row_number in stale_rows:
+                pending[row_number] = [""] * len(HEADER_ROW)
+        self._write_rows(worksheet, pending)
+        return exported
+
+    def _write_rows(self, worksheet, rows: Dict[int, list]) -> None:
+        """
+        Writes rows keyed by sheet row number, merging consecutive rows into
+        one range and splitting the ranges into size-limited requests.
+        """
+        if not rows:
+            return
+        last_row = max(rows)
+        if last_row > worksheet.row_count:
+            self._with_retries(worksheet.add_rows, last_row - worksheet.row_count)
+
+        ranges = []
+        start = previous = None
+        block: List[list] = []
+        for row_number in sorted(rows):
+            if previous is not None and row_number != previous + 1:
+                ranges.append({"range": _row_range(start, previous), "values": block})
+                block = []
+                start = None
+            if start is None:
+                start = row_number
+            block.append(rows[row_number])
+            previous = row_number
+        ranges.append({"range": _row_range(start, previous), "values": block})
+
+        max_rows = max(1, self.max_cells_per_request // len(HEADER_ROW))
+        request: List[dict] = []
+        request_rows = 0
+        for data in ranges:
+            # Split ranges that alone exceed the request limit
+            for offset in range(0, len(data["values"]), max_rows):
+                chunk = data["values"][offset : offset + max_rows]
+                first = int(data["range"].split(":")[0][1:]) + offset
+                if request and request_rows + len(chunk) > max_rows:
+                    self._with_retries(
+                        worksheet.batch_update, request, value_input_option="RAW"
+                    )
+                    request, request_rows = [], 0
+                request.append(
+                    {"range": _row_range(first, first + len(chunk) - 1), "values": chunk}
+                )
+                request_rows += len(chunk)
+        if request:
+            self._with_retries(worksheet.batch_update, request, value_input_option="RAW")
+        logging.info(f"Wrote {len(rows)} changed row(s) to Google Sheet: {self.spreadsheet_name}")
+
+    def _with_retries(self, call, *args, **kwargs):
+        """
+        Calls a Sheets API method, backing off exponentially (with jitter) and
+        retrying when the API reports a quota or transient error.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return call(*args, **kwargs)
+            except gspread.exceptions.APIError as e:
+                status = getattr(e.response, "status_code", None)
+                if status not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                    raise
+                delay = min(64.0, 2**attempt) + random.uniform(0, 1)
+                logging.warning(
+                    f"Google Sheets API error {status}, retrying in {delay:.1f}s"
+                )
+                self._sleep(delay)
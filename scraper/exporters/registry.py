@@ -0,0 +1,84 @@
+# scraper/exporters/registry.py
+
+from __future__ import annotations
+import datetime
+import importlib
+from typing import Any, Callable, Dict, Optional
+
+from ..interfaces.exporter import Exporter
+
+# Where file exports go unless the supplier configuration sets a 'path'
+DEFAULT_EXPORT_DIR = "exports"
+
+# Exporter type -> (module, class, default file extension). Modules are
+# imported on first use, so suppliers exporting to files do not import
+# gspread and vice versa.
+_EXPORTERS: Dict[str, tuple] = {
+    "csv": ("scraper.exporters.file_exporters", "CsvExporter", "csv"),
+    "jsonl": ("scraper.exporters.file_exporters", "JsonLinesExporter", "jsonl"),
+    "parquet": ("scraper.exporters.file_exporters", "ParquetExporter", "parquet"),
+    "google_sheets": ("scraper.exporters.google_sheets_exporter", "GoogleSheetsExporter", None),
+}
+
+_factories: Dict[str, Callable[..., Exporter]] = {}
+
+
+def register_exporter(exporter_type: str, factory: Callable[..., Exporter]) -> None:
+    """
+    Makes an exporter available as 'type' in the 'exporter' configuration.
+    The factory is called with the remaining options as keyword arguments.
+    """
+    _factories[exporter_type] = factory
+
+
+def _factory(exporter_type: str) -> Callable[..., Exporter]:
+    if exporter_type in _factories:
+        return _factories[exporter_type]
+    if exporter_type not in _EXPORTERS:
+        known = ", ".join(sorted({*_EXPORTERS, *_factories}))
+        raise ValueError(f"Unknown exporter type '{exporter_type}', expected one of: {known}")
+    module_name, class_name, _ = _EXPORTERS[exporter_type]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def create_exporter(config: Dict[str, Any]) -> Optional[Exporter]:
+    """
+    Creates the exporter selected in a supplier's configuration, or returns
+    None if it has none.
+
+    Supplier configuration keys:
+        - 'exporter': Either a type ('csv', 'jsonl', 'parquet' or
+          'google_sheets'), or a mapping with 'type' and the exporter's
+          options, for example:
+
+              exporter:
+                type: csv
+                path: exports/{name}-{date}.csv.gz
+                compression: gzip
+
+          File exporters write to 'path' (default exports/<supplier>.<ext>);
+          '{name}' and '{date}' in it are filled in with the supplier's name
+          and today's date. Other options are passed to the exporter class
+          (compression, compression_level, buffer_size, row_group_size, or
+          spreadsheet_name, credentials_path, mode and changes_worksheet
+          for Google Sheets).
+    """
+    options = config.get("exporter")
+    if not options:
+        return None
+    if isinstance(options, str):
+        options = {"type": options}
+    options = dict(options)
+    exporter_type = options.pop("type", None)
+    if not exporter_type:
+        raise ValueError(f"Supplier '{config.get('name')}' has an exporter with no 'type'")
+
+    factory = _factory(exporter_type)
+    extension = _EXPORTERS.get(exporter_type, (None, None, None))[2]
+    if extension is not None or "path" in options:
+        path = options.get("path") or f"{DEFAULT_EXPORT_DIR}/{{name}}.{extension}"
+        options["path"] = path.format(
+            name=config.get("name") or "default",
+            date=datetime.date.today().isoformat(),
+        )
+    return factory(**options)
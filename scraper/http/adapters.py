@@ -0,0 +1,65 @@
+# scraper/http/adapters.py
+
+from __future__ import annotations
+from typing import Callable
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+HTTP_PREFIXES = ("https://", "http://")
+
+
+class WrappingAdapter(BaseAdapter):
+    """
+    Transport adapter that adds behaviour around another adapter.
+
+    Wrappers are mounted on a requests.Session in place of the adapter they
+    wrap, so several layers (caching, retries, ...) can be stacked on the
+    session returned by an Authenticator without replacing each other.
+    """
+
+    def __init__(self: WrappingAdapter, inner: BaseAdapter) -> None:
+        super().__init__()
+        self.inner = inner
+
+    def send(self: WrappingAdapter, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        return self.inner.send(request, **kwargs)
+
+    def close(self: WrappingAdapter) -> None:
+        self.inner.close()
+
+
+def innermost_adapter(adapter: BaseAdapter) -> BaseAdapter:
+    """
+    Returns the adapter at the bottom of a stack of WrappingAdapters.
+    """
+    while isinstance(adapter, WrappingAdapter):
+        adapter = adapter.inner
+    return adapter
+
+
+def find_adapter(adapter: BaseAdapter, adapter_class: type) -> BaseAdapter | None:
+    """
+    Returns the first adapter of the given class in a stack of wrappers.
+    """
+    while True:
+        if isinstance(adapter, adapter_class):
+            return adapter
+        if not isinstance(adapter, WrappingAdapter):
+            return None
+        adapter = adapter.inner
+
+
+def mount_wrapper(
+    session: requests.Session,
+    wrapper_class: type,
+    factory: Callable[[BaseAdapter], WrappingAdapter],
+) -> None:
+    """
+    Wraps the session's http:// and https:// adapters using `factory`, unless
+    a wrapper of `wrapper_class` is already mounted there.
+    """
+    for prefix in HTTP_PREFIXES:
+        current = session.adapters.get(prefix) or HTTPAdapter()
+        if find_adapter(current, wrapper_class) is None:
+            session.mount(prefix, factory(current))
@@ -0,0 +1,267 @@
+# scraper/http/resilience.py
+
+from __future__ import annotations
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+
+from scraper.core.metrics import metrics
+from scraper.http.adapters import WrappingAdapter, mount_wrapper
+
+# Statuses that signal a transient problem on the supplier's side
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Statuses where the server refused the request, so any method is safe to retry
+REFUSED_STATUSES = frozenset({429, 503})
+# Statuses that mean "slow down"
+THROTTLE_STATUSES = frozenset({429, 503})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """
+    Raised instead of sending a request while a host's circuit is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a host after repeated failures.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests fail fast for `reset_timeout` seconds. Then a single trial
+    request is let through: success closes the circuit, failure reopens it.
+    """
+
+    def __init__(self: CircuitBreaker, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_request(self: CircuitBreaker, host: str) -> None:
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                raise CircuitOpenError(f"Circuit open for {host} after repeated failures")
+            # Half-open: let one trial request through
+            self._trial_in_flight = True
+
+    def record_success(self: CircuitBreaker) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release_trial(self: CircuitBreaker) -> None:
+        """
+        Lets another trial request through after one that ended without a
+        response or a connection failure (e.g. an invalid URL or an interrupt).
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self: CircuitBreaker, host: str) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logging.warning(f"Opening circuit for {host} after {self._failures} failures")
+                self._opened_at = time.monotonic()
+
+
+class AdaptiveRateLimiter:
+    """
+    Spaces out requests to a host, backing off when the host throttles.
+
+    The delay between requests doubles whenever the host answers 429 or 503
+    and decays by 10% after each success, never going below `min_delay`.
+    """
+
+    def __init__(self: AdaptiveRateLimiter, min_delay: float, max_delay: float) -> None:
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.delay = min_delay
+        self._next_allowed = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self: AdaptiveRateLimiter, sleep=time.sleep) -> None:
+        with self._lock:
+            now = time.monotonic()
+            pause = self._next_allowed - now
+            self._next_allowed = max(now, self._next_allowed) + self.delay
+        if pause > 0:
+            sleep(pause)
+
+    def throttled(self: AdaptiveRateLimiter) -> None:
+        with self._lock:
+            self.delay = min(self.max_delay, max(self.delay * 2, 0.25))
+
+    def succeeded(self: AdaptiveRateLimiter) -> None:
+        with self._lock:
+            if self.delay > self.min_delay:
+                self.delay = max(self.min_delay, self.delay * 0.9)
+
+
+class HostStates:
+    """
+    Per-host circuit breakers and rate limiters shared by a session's adapters.
+    """
+
+    def __init__(self: HostStates, config: dict) -> None:
+        self.failure_threshold = int(config.get("circuit_failure_threshold", 5))
+        self.reset_timeout = float(config.get("circuit_reset_timeout", 30.0))
+        self.min_delay = float(config.get("adaptive_min_delay", 0.0))
+        self.max_delay = float(config.get("adaptive_max_delay", 30.0))
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.limiters: Dict[str, AdaptiveRateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def for_host(self: HostStates, host: str) -> tuple:
+        with self._lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self.limiters[host] = AdaptiveRateLimiter(self.min_delay, self.max_delay)
+            return self.breakers[host], self.limiters[host]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a Retry-After header (delta seconds or HTTP date) into seconds.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class ResilientAdapter(WrappingAdapter):
+    """
+    Transport adapter adding retries, circuit breaking and adaptive rate
+    limiting around another adapter.
+
+    Failed requests are retried with jittered exponential backoff, honouring
+    Retry-After when the server sends one. Connection errors and 5xx answers
+    are only retried for idempotent methods; 429 and 503 mean the server did
+    not process the request, so they are retried for any method.
+    """
+
+    def __init__(
+        self: ResilientAdapter,
+        inner: BaseAdapter,
+        hosts: HostStates,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        retry_after_max: float = 120.0,
+        supplier_name: Optional[str] = None,
+    ) -> None:
+        super().__init__(inner)
+        self.hosts = hosts
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self.supplier_name = supplier_name
+        self.sleep = time.sleep
+
+    def _backoff(self: ResilientAdapter, attempt: int) -> float:
+        # "Full jitter": a random delay up to the exponential cap
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def _retry(self: ResilientAdapter, host: str, delay: float, reason: str) -> None:
+        metrics.for_supplier(self.supplier_name).incr("retries")
+        logging.warning(f"Retrying request to {host} in {delay:.2f}s ({reason})")
+        self.sleep(delay)
+
+    def send(
+        self: ResilientAdapter, request: requests.PreparedRequest, **kwargs
+    ) -> requests.Response:
+        host = urlsplit(request.url).netloc
+        breaker, limiter = self.hosts.for_host(host)
+        idempotent = request.method in IDEMPOTENT_METHODS
+
+        for attempt in range(self.max_retries + 1):
+            breaker.before_request(host)
+            limiter.wait(self.sleep)
+            try:
+                response = self.inner.send(request, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                breaker.record_failure(host)
+                if not idempotent or attempt == self.max_retries:
+                    raise
+                self._retry(host, self._backoff(attempt), type(e).__name__)
+                continue
+            except BaseException:
+                breaker.release_trial()
+                raise
+
+            status = response.status_code
+            if status not in RETRY_STATUSES:
+                breaker.record_success()
+                limiter.succeeded()
+                return response
+
+            breaker.record_failure(host)
+            if status in THROTTLE_STATUSES:
+                limiter.throttled()
+            if attempt == self.max_retries or not (idempotent or status in REFUSED_STATUSES):
+                return response
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            delay = (
+                min(retry_after, self.retry_after_max)
+                if retry_after is not None
+                else self._backoff(attempt)
+            )
+            response.close()
+            self._retry(host, delay, f"HTTP {status}")
+        return response
+
+
+def install_resilience(session: requests.Session, config: dict) -> None:
+    """
+    Mounts the retry / circuit breaker / adaptive rate limiting layer on a
+    session, unless it is already there or the supplier disables it.
+
+    Supplier configuration keys:
+        - 'http_resilience': Set to false to disable the layer.
+        - 'http_max_retries': Retries per request (default 4).
+        - 'http_backoff_base' / 'http_backoff_max': Backoff in seconds
+          (defaults 0.5 and 30).
+        - 'circuit_failure_threshold': Consecutive failures that open a
+          host's circuit (default 5).
+        - 'circuit_reset_timeout': Seconds before a trial request (default 30).
+        - 'adaptive_min_delay' / 'adaptive_max_delay': Bounds in seconds on
+          the delay between requests to a host (defaults 0 and 30).
+    """
+    if not config.get("http_resilience", True) or not isinstance(session, requests.Session):
+        return
+    hosts = HostStates(config)
+
+    def _wrap(inner: BaseAdapter) -> ResilientAdapter:
+        return ResilientAdapter(
+            inner,
+            hosts,
+            max_retries=int(config.get("http_max_retries", 4)),
+            backoff_base=float(config.get("http_backoff_base", 0.5)),
+            backoff_max=float(config.get("http_backoff_max", 30.0)),
+            supplier_name=config.get("name"),
+        )
+
+    mount_wrapper(session, ResilientAdapter, _wrap)
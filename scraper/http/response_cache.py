@@ -0,0 +1,317 @@
+# scraper/http/response_cache.py
+
+from __future__ import annotations
+import io
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from scraper.http.adapters import (
+    HTTP_PREFIXES,
+    WrappingAdapter,
+    find_adapter,
+    mount_wrapper,
+)
+
+DEFAULT_CACHE_TTL = 0.0
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Response headers worth replaying from the cache
+_STORED_HEADERS = (
+    "Content-Type",
+    "Content-Encoding",
+    "Content-Language",
+    "ETag",
+    "Last-Modified",
+    "Cache-Control",
+)
+
+
+@dataclass
+class CachedResponse:
+    """
+    A response body and the metadata needed to revalidate it.
+    """
+
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    body: bytes
+    stored_at: float
+
+    @property
+    def etag(self: CachedResponse) -> Optional[str]:
+        return self.headers.get("ETag")
+
+    @property
+    def last_modified(self: CachedResponse) -> Optional[str]:
+        return self.headers.get("Last-Modified")
+
+
+def cache_key(url: str) -> str:
+    """
+    Normalises a URL into a cache key, so the same page requested with its
+    query parameters in a different order shares one entry.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ""))
+
+
+class ResponseCache:
+    """
+    On-disk store of HTTP responses, evicted least-recently-used first once
+    the stored bodies exceed `max_bytes`.
+
+    Entries live in a single SQLite database inside `cache_dir`, which may be
+    shared by several threads of one run.
+    """
+
+    def __init__(
+        self: ResponseCache,
+        cache_dir: str,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ) -> None:
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "responses.sqlite")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, url TEXT NOT NULL,"
+                " status_code INTEGER NOT NULL, headers TEXT NOT NULL,"
+                " body BLOB NOT NULL, size INTEGER NOT NULL,"
+                " stored_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_access"
+                " ON responses (last_access)"
+            )
+        (self._total_bytes,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+    def get(self: ResponseCache, url: str) -> Optional[CachedResponse]:
+        """
+        Returns the cached response for `url`, or None if there is none.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status_code, headers, body, stored_at"
+                " FROM responses WHERE key = ?",
+                (cache_key(url),),
+            ).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE responses SET last_access = ? WHERE key = ?",
+                    (time.time(), cache_key(url)),
+                )
+        url, status_code, headers, body, stored_at = row
+        return CachedResponse(url, status_code, json.loads(headers), body, stored_at)
+
+    def put(self: ResponseCache, response: requests.Response) -> None:
+        """
+        Stores a successful response, evicting old entries if needed.
+        """
+        body = response.content
+        if len(body) > self.max_bytes:
+            return
+        headers = {
+            name: response.headers[name]
+            for name in _STORED_HEADERS
+            if name in response.headers
+        }
+        key = cache_key(response.url)
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                previous = self._conn.execute(
+                    "SELECT size FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        response.url,
+                        response.status_code,
+                        json.dumps(headers),
+                        body,
+                        len(body),
+                        now,
+                        now,
+                    ),
+                )
+            self._total_bytes += len(body) - (previous[0] if previous else 0)
+            self._evict()
+
+    def refresh(self: ResponseCache, url: str, not_modified: requests.Response) -> None:
+        """
+        Marks an entry as fresh again after the server answered 304, taking
+        any updated validators from the 304 response.
+        """
+        key = cache_key(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT headers FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return
+            headers = json.loads(row[0])
+            for name in ("ETag", "Last-Modified", "Cache-Control"):
+                if name in not_modified.headers:
+                    headers[name] = not_modified.headers[name]
+            now = time.time()
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE responses SET headers = ?, stored_at = ?, last_access = ?"
+                    " WHERE key = ?",
+                    (json.dumps(headers), now, now, key),
+                )
+
+    def _evict(self: ResponseCache) -> None:
+        # Caller holds self._lock
+        while self._total_bytes > self.max_bytes:
+            victims = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT 64"
+            ).fetchall()
+            if not victims:
+                self._total_bytes = 0
+                return
+            with self._conn:
+                for key, size in victims:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._total_bytes -= size
+                    if self._total_bytes <= self.max_bytes:
+                        break
+            logging.debug("ResponseCache: Evicted entries to stay under size limit")
+
+    def close(self: ResponseCache) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachingAdapter(WrappingAdapter):
+    """
+    Transport adapter that serves GET requests from a ResponseCache.
+
+    Entries younger than `ttl` seconds are served without touching the
+    network. Older entries are revalidated with a conditional GET
+    (If-None-Match / If-Modified-Since) and served from disk when the server
+    answers 304 Not Modified. Responses served from the cache have
+    `from_cache` set to True.
+    """
+
+    def __init__(
+        self: CachingAdapter,
+        inner: requests.adapters.BaseAdapter,
+        cache: ResponseCache,
+        ttl: float = DEFAULT_CACHE_TTL,
+    ) -> None:
+        super().__init__(inner)
+        self.cache = cache
+        self.ttl = ttl
+
+    def send(
+        self: CachingAdapter, request: requests.PreparedRequest, **kwargs
+    ) -> requests.Response:
+        if request.method != "GET":
+            return self.inner.send(request, **kwargs)
+
+        cached = self.cache.get(request.url)
+        if cached is not None and time.time() - cached.stored_at < self.ttl:
+            return self._build_response(request, cached)
+
+        if cached is not None:
+            request = request.copy()
+            if cached.etag:
+                request.headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request.headers["If-Modified-Since"] = cached.last_modified
+
+        response = self.inner.send(request, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            self.cache.refresh(request.url, response)
+            response.close()
+            return self._build_response(request, cached)
+
+        if response.status_code == 200 and self._storable(response):
+            self.cache.put(response)
+        response.from_cache = False
+        return response
+
+    def _storable(self: CachingAdapter, response: requests.Response) -> bool:
+        cache_control = response.headers.get("Cache-Control", "").lower()
+        if "no-store" in cache_control:
+            return False
+        # Without validators the entry is only useful within its TTL
+        has_validators = "ETag" in response.headers or "Last-Modified" in response.headers
+        return has_validators or self.ttl > 0
+
+    def _build_response(
+        self: CachingAdapter, request: requests.PreparedRequest, cached: CachedResponse
+    ) -> requests.Response:
+        response = requests.Response()
+        response.status_code = cached.status_code
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(cached.headers)
+        response._content = cached.body
+        # So iter_content / iter_lines and stream=True callers work too
+        response._content_consumed = True
+        response.raw = io.BytesIO(cached.body)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        return response
+
+    def close(self: CachingAdapter) -> None:
+        super().close()
+        self.cache.close()
+
+
+def install_response_cache(session: requests.Session, config: dict) -> None:
+    """
+    Layers an on-disk response cache under `session` if the supplier
+    configuration enables one.
+
+    Supplier configuration keys:
+        - 'http_cache_dir': Directory for the cache; no cache if unset.
+        - 'http_cache_ttl': Seconds a page is served without revalidation
+          (default 0: always send a conditional GET).
+        - 'http_cache_max_bytes': Size limit before least-recently-used
+          entries are evicted (default 512 MiB).
+    """
+    cache_dir = config.get("http_cache_dir")
+    if not cache_dir:
+        return
+    # The cache's connection would never be closed if nothing used it
+    if all(
+        find_adapter(session.adapters.get(prefix), CachingAdapter) is not None
+        for prefix in HTTP_PREFIXES
+    ):
+        return
+    cache = ResponseCache(
+        os.path.join(cache_dir, config.get("name") or "default"),
+        max_bytes=int(config.get("http_cache_max_bytes", DEFAULT_CACHE_MAX_BYTES)),
+    )
+    ttl = float(config.get("http_cache_ttl", DEFAULT_CACHE_TTL))
+    mount_wrapper(
+        session, CachingAdapter, lambda inner: CachingAdapter(inner, cache, ttl)
+    )
+    logging.info(f"HTTP response cache enabled at {cache.path} (ttl {ttl}s)")
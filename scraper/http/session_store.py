@@ -0,0 +1,211 @@
+# scraper/http/session_store.py
+
+from __future__ import annotations
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+
+from scraper.core.metrics import metrics
+from scraper.interfaces.authenticator import Authenticator
+
+DEFAULT_SESSION_TTL = 3600.0
+
+
+def snapshot_session(session: requests.Session) -> dict:
+    """
+    Captures the parts of a session that make it authenticated: its cookies
+    and headers (for token-based logins).
+    """
+    return {
+        "saved_at": time.time(),
+        "headers": dict(session.headers),
+        "cookies": [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "expires": cookie.expires,
+                "secure": cookie.secure,
+            }
+            for cookie in session.cookies
+        ],
+    }
+
+
+def restore_session(session: requests.Session, snapshot: dict) -> None:
+    """
+    Applies a snapshot taken by snapshot_session to a session.
+    """
+    session.headers.update(snapshot["headers"])
+    for cookie in snapshot["cookies"]:
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie["domain"],
+            path=cookie["path"],
+            expires=cookie["expires"],
+            secure=cookie["secure"],
+        )
+
+
+class SessionStore:
+    """
+    Keeps authenticated session snapshots per supplier, in memory and
+    optionally on disk, so later runs can skip the login round-trips.
+
+    Snapshots older than `ttl` seconds are ignored. Files are only readable
+    by their owner, as they hold live session cookies.
+    """
+
+    def __init__(self: SessionStore, directory: Optional[str], ttl: float) -> None:
+        self.directory = directory
+        self.ttl = ttl
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self: SessionStore, supplier_name: str) -> str:
+        return os.path.join(self.directory, f"{supplier_name}.session.json")
+
+    def load(self: SessionStore, supplier_name: str) -> Optional[dict]:
+        """
+        Returns the supplier's snapshot if there is one younger than the TTL.
+        """
+        snapshot = _memory.get(supplier_name)
+        if snapshot is None and self.directory:
+            try:
+                with open(self._path(supplier_name)) as f:
+                    snapshot = json.load(f)
+            except FileNotFoundError:
+                return None
+            except ValueError:
+                logging.warning(f"Ignoring unreadable session cache for {supplier_name}")
+                return None
+        if snapshot is None or time.time() - snapshot["saved_at"] > self.ttl:
+            return None
+        return snapshot
+
+    def save(self: SessionStore, supplier_name: str, snapshot: dict) -> None:
+        _memory[supplier_name] = snapshot
+        if not self.directory:
+            return
+        path = self._path(supplier_name)
+        temp_path = f"{path}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(temp_path, path)
+
+    def discard(self: SessionStore, supplier_name: str) -> None:
+        _memory.pop(supplier_name, None)
+        if self.directory and os.path.exists(self._path(supplier_name)):
+            os.remove(self._path(supplier_name))
+
+
+# Snapshots from earlier runs in this process, by supplier name
+_memory: Dict[str, dict] = {}
+# One lock per supplier, so concurrent runs of a supplier log in only once
+_supplier_locks: Dict[str, threading.Lock] = {}
+_supplier_locks_lock = threading.Lock()
+
+
+def _lock_for(supplier_name: str) -> threading.Lock:
+    with _supplier_locks_lock:
+        return _supplier_locks.setdefault(supplier_name, threading.Lock())
+
+
+def _can_check_sessions(authenticator: Authenticator, config: dict) -> bool:
+    return bool(config.get("session_check_url")) or (
+        type(authenticator).is_logged_in is not Authenticator.is_logged_in
+    )
+
+
+def _session_is_valid(
+    authenticator: Authenticator, session: requests.Session, check_url: Optional[str]
+) -> bool:
+    """
+    Checks a restored session with one cheap request, or else with the
+    authenticator's is_logged_in. If neither can tell, a snapshot within its
+    TTL is trusted.
+    """
+    if not check_url:
+        logged_in = authenticator.is_logged_in(session)
+        return True if logged_in is None else bool(logged_in)
+    try:
+        # Expired sessions are usually redirected to the login form
+        response = session.get(check_url, allow_redirects=False)
+    except requests.exceptions.RequestException as e:
+        logging.warning(f"Session check failed: {e}")
+        return False
+    response.close()
+    return response.status_code == 200
+
+
+def login_with_cache(authenticator: Authenticator, config: dict) -> requests.Session:
+    """
+    Returns an authenticated session, reusing a cached one when it is still
+    valid and calling authenticator.login() only when it is not.
+
+    A cached snapshot is restored into authenticator.get_session(), so the
+    authenticator must return the same session object on every call.
+    Sessions restored from the cache are marked with `from_session_cache`.
+
+    Supplier configuration keys:
+        - 'session_cache': Whether to reuse sessions. By default they are
+          only reused if they can be checked first, with
+          'session_check_url' or the authenticator's is_logged_in; set it
+          to true to trust any session within its TTL.
+        - 'session_cache_dir': Directory to persist sessions in, so they
+          survive across runs; without it sessions are only reused within
+          the current process.
+        - 'session_ttl': Seconds a session is reused for (default 3600).
+        - 'session_check_url': A cheap authenticated page fetched to check a
+          reused session; it must answer 200 without redirecting.
+    """
+    if not config.get("session_cache", _can_check_sessions(authenticator, config)):
+        return authenticator.login()
+
+    supplier_name = config.get("name") or "default"
+    store = SessionStore(
+        config.get("session_cache_dir"),
+        float(config.get("session_ttl", DEFAULT_SESSION_TTL)),
+    )
+    supplier_metrics = metrics.for_supplier(config.get("name"))
+    with _lock_for(supplier_name):
+        snapshot = store.load(supplier_name)
+        session = authenticator.get_session() if snapshot is not None else None
+        if isinstance(session, requests.Session):
+            restore_session(session, snapshot)
+            if _session_is_valid(authenticator, session, config.get("session_check_url")):
+                logging.info(f"Reusing cached session for {supplier_name}")
+                supplier_metrics.incr("session_reuses")
+                session.from_session_cache = True
+                return session
+            logging.info(f"Cached session for {supplier_name} has expired, logging in again")
+            store.discard(supplier_name)
+            session.cookies.clear()
+
+        session = authenticator.login()
+        supplier_metrics.incr("logins")
+        if isinstance(session, requests.Session):
+            session.from_session_cache = False
+            store.save(supplier_name, snapshot_session(session))
+        return session
+
+
+def discard_cached_session(config: dict) -> None:
+    """
+    Forgets the supplier's cached session, so the next login_with_cache
+    logs in again.
+    """
+    supplier_name = config.get("name") or "default"
+    with _lock_for(supplier_name):
+        SessionStore(
+            config.get("session_cache_dir"),
+            float(config.get("session_ttl", DEFAULT_SESSION_TTL)),
+        ).discard(supplier_name)
@@ -0,0 +1,219 @@
+from __future__ import annotations
+import abc
+import asyncio
+import collections
+import logging
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scraper.http.adapters import innermost_adapter
+from scraper.models.page import Page
+
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 4
+DEFAULT_MIN_REQUEST_INTERVAL = 0.0
+DEFAULT_WORK_UNIT_PAGES = 20
+
+
+class _HostLimiter:
+    """
+    Caps concurrent requests to one host and spaces out their start times.
+    """
+
+    def __init__(self: _HostLimiter, max_connections: int, min_interval: float) -> None:
+        self.semaphore = asyncio.Semaphore(max_connections)
+        self.min_interval = min_interval
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def wait_turn(self: _HostLimiter) -> None:
+        """
+        Sleeps until at least min_interval has passed since the previous request.
+        """
+        if self.min_interval <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.min_interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AsyncPageFetcher(abc.ABC):
+    """
+    Abstract base class for asynchronous page fetchers.
+    Defines the interface for fetching content from a supplier's website
+    with many requests in flight at once.
+
+    Requests are still made with the authenticated requests.Session returned
+    by the Authenticator (so cookies and headers carry over), but each call
+    runs in a worker thread and at most `max_connections_per_host` requests
+    hit the same host at a time. The session's connection pool is sized to
+    match so connections are kept alive and reused.
+
+    Supplier configuration keys:
+        - 'max_connections_per_host': Concurrent requests per host (default 4).
+        - 'min_request_interval': Minimum seconds between request starts
+          to the same host, for polite rate limiting (default 0).
+        - 'max_pages_in_flight': How many pages fetch_all downloads ahead of
+          the consumer (default twice max_connections_per_host).
+        - 'work_unit_pages': Pages per work unit in distributed mode
+          (default 20; see url_work_units).
+    """
+
+    config: dict
+
+    @abc.abstractmethod
+    def fetch_pages(self, session: requests.Session) -> AsyncIterator[str]:
+        """
+        Fetches pages from the supplier's website using the provided session.
+        Implemented as an async generator yielding raw page contents (e.g., HTML).
+        """
+        pass
+
+    def checkpoint_cursor(self: AsyncPageFetcher) -> Optional[Any]:
+        """
+        Returns a JSON-serialisable position just after the page most recently
+        yielded by fetch_pages, or None if the fetcher cannot resume (see
+        PageFetcher.checkpoint_cursor).
+        """
+        return None
+
+    def resume_from(self: AsyncPageFetcher, cursor: Any) -> None:
+        """
+        Makes the next fetch_pages call continue after `cursor`.
+        """
+        raise NotImplementedError
+
+    def plan_work_units(
+        self: AsyncPageFetcher, session: requests.Session
+    ) -> Optional[List[Any]]:
+        """
+        Splits the supplier's pages into work units for distributed
+        scraping, or returns None if the fetcher cannot be distributed (see
+        PageFetcher.plan_work_units). Fetchers with a known list of page
+        URLs can return url_work_units(urls).
+        """
+        return None
+
+    def url_work_units(self: AsyncPageFetcher, urls: List[str]) -> List[dict]:
+        """
+        Splits page URLs into work units of 'work_unit_pages' URLs each,
+        which the default fetch_unit can fetch.
+        """
+        size = max(1, int(self.config.get("work_unit_pages", DEFAULT_WORK_UNIT_PAGES)))
+        return [{"urls": urls[start : start + size]} for start in range(0, len(urls), size)]
+
+    async def fetch_unit(
+        self: AsyncPageFetcher, session: requests.Session, unit: Any
+    ) -> AsyncIterator[str]:
+        """
+        Fetches the pages of one work unit, by default the URLs of a unit
+        from url_work_units.
+        """
+        async for response in self.fetch_all(session, unit["urls"]):
+            yield Page.from_response(response)
+
+    @property
+    def max_connections_per_host(self: AsyncPageFetcher) -> int:
+        return int(
+            self.config.get(
+                "max_connections_per_host", DEFAULT_MAX_CONNECTIONS_PER_HOST
+            )
+        )
+
+    @property
+    def min_request_interval(self: AsyncPageFetcher) -> float:
+        return float(
+            self.config.get("min_request_interval", DEFAULT_MIN_REQUEST_INTERVAL)
+        )
+
+    async def fetch(
+        self: AsyncPageFetcher, session: requests.Session, url: str, **kwargs
+    ) -> requests.Response:
+        """
+        Performs a GET request, respecting the per-host concurrency cap and
+        request interval. Raises for HTTP error status codes.
+        """
+        self._configure_pool(session)
+        limiter = self._limiter_for(urlsplit(url).netloc)
+        async with limiter.semaphore:
+            await limiter.wait_turn()
+            response = await asyncio.to_thread(session.get, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    async def fetch_all(
+        self: AsyncPageFetcher,
+        session: requests.Session,
+        urls: Iterable[str],
+        window: Optional[int] = None,
+    ) -> AsyncIterator[requests.Response]:
+        """
+        Fetches many URLs concurrently and yields the responses in URL order.
+
+        At most `window` requests are started ahead of the consumer, so memory
+        stays bounded however many URLs are passed in.
+        """
+        if window is None:
+            window = int(
+                self.config.get(
+                    "max_pages_in_flight", 2 * self.max_connections_per_host
+                )
+            )
+        pending: collections.deque[asyncio.Task] = collections.deque()
+        url_iter = iter(urls)
+        try:
+            for url in url_iter:
+                pending.append(asyncio.create_task(self.fetch(session, url)))
+                if len(pending) >= window:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _limiter_for(self: AsyncPageFetcher, host: str) -> _HostLimiter:
+        # Limiters hold asyncio primitives, so they are only valid for the
+        # event loop that created them.
+        loop = asyncio.get_running_loop()
+        limiters: Optional[Dict[str, _HostLimiter]] = getattr(
+            self, "_host_limiters", None
+        )
+        if limiters is None or getattr(self, "_host_limiters_loop", None) is not loop:
+            limiters = {}
+            self._host_limiters = limiters
+            self._host_limiters_loop = loop
+        if host not in limiters:
+            limiters[host] = _HostLimiter(
+                self.max_connections_per_host, self.min_request_interval
+            )
+        return limiters[host]
+
+    def _configure_pool(self: AsyncPageFetcher, session: requests.Session) -> None:
+        """
+        Grows the session's connection pools so every concurrent request to a
+        host can keep its own connection alive.
+        """
+        if getattr(session, "_async_pool_size", 0) >= self.max_connections_per_host:
+            return
+        for mounted in getattr(session, "adapters", {}).values():
+            adapter = innermost_adapter(mounted)
+            if not isinstance(adapter, HTTPAdapter):
+                continue
+            if adapter._pool_maxsize < self.max_connections_per_host:
+                adapter.init_poolmanager(
+                    adapter._pool_connections,
+                    self.max_connections_per_host,
+                    block=adapter._pool_block,
+                )
+                logging.debug(
+                    "AsyncPageFetcher: Connection pool resized to %d",
+                    self.max_connections_per_host,
+                )
+        session._async_pool_size = self.max_connections_per_host
@@ -1,4 +1,6 @@
 import abc
+from typing import Optional
+
 import requests
 
 class Authenticator(abc.ABC):
@@ -16,6 +18,18 @@ class Authenticator(abc.ABC):
     @abc.abstractmethod
     def get_session(self) -> requests.Session:
         """
-        Returns the current authenticated requests session.
+        Returns the current authenticated requests session. This must be the
+        same session object on every call, as cached logins are restored
+        into it (see login_with_cache).
+        """
+        pass
+
+    def is_logged_in(self, session: requests.Session) -> Optional[bool]:
+        """
+        Returns whether a session restored from the session cache is still
+        logged in, checked as cheaply as possible, or None if this
+        authenticator cannot tell. Cached sessions are only reused by
+        default when they can be checked this way or with a
+        'session_check_url' (see login_with_cache).
         """
-        pass
\ No newline at end of file
+        return None
@@ -1,7 +1,10 @@
 import abc
-from typing import List
+from typing import TYPE_CHECKING, Iterable, List
 from ..models.product import ProductData
 
+if TYPE_CHECKING:
+    from ..storage.price_history import PriceChange
+
 class Exporter(abc.ABC):
     """
     Abstract base class for exporters.
@@ -12,4 +15,29 @@ class Exporter(abc.ABC):
         """
         Exports the list of ProductData objects to a specified destination.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def export_stream(self, batches: Iterable[List[ProductData]]) -> int:
+        """
+        Exports batches of ProductData objects (lists or ProductBatch objects)
+        as they are produced and returns the number of products exported.
+
+        The default implementation collects every batch and calls export_data
+        once. Exporters that can write incrementally should override this so
+        that only one batch is held in memory at a time.
+        """
+        product_data: List[ProductData] = []
+        for batch in batches:
+            product_data.extend(batch)
+        self.export_data(product_data)
+        return len(product_data)
+
+    def export_changes(self, changes: List["PriceChange"]) -> None:
+        """
+        Exports what changed in a run recorded in the price history (see
+        PriceHistory), compared with the run before it. Called after
+        export_stream when the supplier has a 'price_history_path'.
+
+        The default implementation does nothing.
+        """
+        pass
@@ -1,6 +1,6 @@
 import abc
 import requests
-from typing import List
+from typing import Any, Iterator, List, Optional
 
 class PageFetcher(abc.ABC):
     """
@@ -13,4 +13,35 @@ class PageFetcher(abc.ABC):
         Fetches pages from the supplier's website using the provided session.
         Returns a list of raw page contents (e.g., HTML).
         """
-        pass
\ No newline at end of file
+        pass
+
+    def checkpoint_cursor(self) -> Optional[Any]:
+        """
+        Returns a JSON-serialisable position just after the page most recently
+        yielded by fetch_pages, for checkpointed runs (see CheckpointStore).
+        Returns None if the fetcher cannot resume from a position, in which
+        case a resumed run re-fetches and skips the pages already done.
+        """
+        return None
+
+    def resume_from(self, cursor: Any) -> None:
+        """
+        Makes the next fetch_pages call continue after the position returned
+        by checkpoint_cursor. Only called if checkpoint_cursor returned one.
+        """
+        raise NotImplementedError
+
+    def plan_work_units(self, session: requests.Session) -> Optional[List[Any]]:
+        """
+        Splits the supplier's page space (categories, pagination ranges)
+        into JSON-serialisable work units for distributed scraping, each of
+        which fetch_unit can fetch on its own. Returns None if the fetcher
+        cannot be distributed (the default).
+        """
+        return None
+
+    def fetch_unit(self, session: requests.Session, unit: Any) -> Iterator[str]:
+        """
+        Fetches the pages of one work unit planned by plan_work_units.
+        """
+        raise NotImplementedError
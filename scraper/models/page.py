@@ -0,0 +1,55 @@
+from __future__ import annotations
+from typing import Dict, Optional
+
+import requests
+
+
+class Page(str):
+    """
+    Raw page content (e.g., HTML) that remembers where it was fetched from.
+
+    Page is a str, so parsers can treat it like any other page content, while
+    the core can use the URL and response headers when they are known.
+
+    An unchanged page has no content: the fetcher knows it has not changed
+    since it was last parsed, so the rows cached for its URL are reused (see
+    ParseCache).
+    """
+
+    url: Optional[str]
+    headers: Dict[str, str]
+    unchanged: bool
+
+    def __new__(
+        cls,
+        content: str,
+        url: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        unchanged: bool = False,
+    ) -> Page:
+        page = super().__new__(cls, content)
+        page.url = url
+        page.headers = dict(headers or {})
+        page.unchanged = unchanged
+        return page
+
+    @classmethod
+    def from_response(cls, response: requests.Response) -> Page:
+        """
+        Builds a Page from a requests response.
+        """
+        return cls(response.text, url=response.url, headers=dict(response.headers))
+
+
+def page_url(page_content: str) -> Optional[str]:
+    """
+    Returns the URL of a page, or None for plain string content.
+    """
+    return getattr(page_content, "url", None)
+
+
+def is_unchanged(page_content: str) -> bool:
+    """
+    Returns whether a page stands in for one unchanged since the last run.
+    """
+    return getattr(page_content, "unchanged", False)
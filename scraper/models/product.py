@@ -1,13 +1,20 @@
 from dataclasses import dataclass
 from typing import Optional
 
-@dataclass
+@dataclass(slots=True)
 class ProductData:
     """
     Represents standardized product information.
+
+    Slotted so that each row carries no per-instance __dict__. For large
+    numbers of rows, see ProductBatch in scraper.models.product_batch.
     """
     name: str
     sku: str
     price: float
     stock: Optional[int] = None
-    # Add other common attributes as needed
\ No newline at end of file
+    # What the price is for ('m', 'length', 'kg', ...), as the supplier lists it
+    unit: Optional[str] = None
+    # The price converted to a common basis (see PriceNormaliser)
+    normalised_price: Optional[float] = None
+    # Add other common attributes as needed
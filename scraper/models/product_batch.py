@@ -0,0 +1,188 @@
+from __future__ import annotations
+import math
+import sys
+from array import array
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from scraper.models.product import ProductData
+
+# Stored in the stock column when a product's stock is unknown, so exporters
+# reading the columns directly can tell unknown stock apart
+NO_STOCK = -(2**63)
+# Stored in the normalised price column when a product has none
+NAN = float("nan")
+
+ProductRow = Tuple[str, str, float, Optional[int]]
+
+
+class ProductBatch:
+    """
+    Columnar container for many products.
+
+    Prices and stock levels are held in typed arrays and names/SKUs are
+    interned, so a batch costs a few bytes per product plus the (shared)
+    strings instead of one Python object per row. Parsers can append to a
+    batch directly and exporters can read it column- or row-wise without
+    creating ProductData objects. Iterating over a batch still yields
+    ProductData objects for code that expects them.
+    """
+
+    __slots__ = ("names", "skus", "prices", "stocks", "units", "normalised_prices")
+
+    def __init__(self: ProductBatch) -> None:
+        self.names: List[str] = []
+        self.skus: List[str] = []
+        self.prices = array("d")
+        self.stocks = array("q")
+        self.units: List[Optional[str]] = []
+        # NaN where a product has no normalised price
+        self.normalised_prices = array("d")
+
+    @classmethod
+    def from_products(cls, products: Iterable[ProductData]) -> ProductBatch:
+        """
+        Builds a batch from ProductData objects (or another batch).
+        """
+        batch = cls()
+        batch.extend(products)
+        return batch
+
+    def append(
+        self: ProductBatch,
+        name: str,
+        sku: str,
+        price: float,
+        stock: Optional[int] = None,
+        unit: Optional[str] = None,
+        normalised_price: Optional[float] = None,
+    ) -> None:
+        """
+        Adds one product to the batch.
+        """
+        # sys.intern only takes exact str; str() converts subclasses (such
+        # as a Page's text) and returns plain strings as they are
+        self.names.append(sys.intern(str(name)))
+        self.skus.append(sys.intern(str(sku)))
+        self.prices.append(price)
+        self.stocks.append(NO_STOCK if stock is None else stock)
+        self.units.append(None if unit is None else sys.intern(str(unit)))
+        self.normalised_prices.append(NAN if normalised_price is None else normalised_price)
+
+    def extend(
+        self: ProductBatch, products: Union[ProductBatch, Iterable[ProductData]]
+    ) -> None:
+        """
+        Adds products from another batch (column by column) or from
+        ProductData objects.
+        """
+        if isinstance(products, ProductBatch):
+            self.names.extend(products.names)
+            self.skus.extend(products.skus)
+            self.prices.extend(products.prices)
+            self.stocks.extend(products.stocks)
+            self.units.extend(products.units)
+            self.normalised_prices.extend(products.normalised_prices)
+            return
+        for product in products:
+            self.append(
+                product.name,
+                product.sku,
+                product.price,
+                product.stock,
+                product.unit,
+                product.normalised_price,
+            )
+
+    def stock_at(self: ProductBatch, index: int) -> Optional[int]:
+        stock = self.stocks[index]
+        return None if stock == NO_STOCK else stock
+
+    def normalised_price_at(self: ProductBatch, index: int) -> Optional[float]:
+        price = self.normalised_prices[index]
+        return None if math.isnan(price) else price
+
+    def rows(self: ProductBatch) -> Iterator[ProductRow]:
+        """
+        Yields (name, sku, price, stock) tuples without building ProductData.
+        """
+        for name, sku, price, stock in zip(self.names, self.skus, self.prices, self.stocks):
+            yield name, sku, price, (None if stock == NO_STOCK else stock)
+
+    def slice(self: ProductBatch, start: int, stop: int) -> ProductBatch:
+        """
+        Returns a new batch holding rows start..stop-1.
+        """
+        batch = ProductBatch()
+        batch.names = self.names[start:stop]
+        batch.skus = self.skus[start:stop]
+        batch.prices = self.prices[start:stop]
+        batch.stocks = self.stocks[start:stop]
+        batch.units = self.units[start:stop]
+        batch.normalised_prices = self.normalised_prices[start:stop]
+        return batch
+
+    def to_products(self: ProductBatch) -> List[ProductData]:
+        return list(self)
+
+    def __len__(self: ProductBatch) -> int:
+        return len(self.prices)
+
+    def __getitem__(self: ProductBatch, index: int) -> ProductData:
+        return ProductData(
+            name=self.names[index],
+            sku=self.skus[index],
+            price=self.prices[index],
+            stock=self.stock_at(index),
+            unit=self.units[index],
+            normalised_price=self.normalised_price_at(index),
+        )
+
+    def __iter__(self: ProductBatch) -> Iterator[ProductData]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self: ProductBatch, other: object) -> bool:
+        if not isinstance(other, ProductBatch):
+            return NotImplemented
+        return (
+            self.names == other.names
+            and self.skus == other.skus
+            and self.prices == other.prices
+            and self.stocks == other.stocks
+            and self.units == other.units
+            # NaN != NaN, so compare the stored bytes
+            and self.normalised_prices.tobytes() == other.normalised_prices.tobytes()
+        )
+
+    def __repr__(self: ProductBatch) -> str:
+        return f"ProductBatch({len(self)} products)"
+
+
+def iter_product_rows(
+    products: Union[ProductBatch, Iterable[ProductData]]
+) -> Iterator[ProductRow]:
+    """
+    Yields (name, sku, price, stock) tuples from a batch or from ProductData
+    objects, so exporters can handle both the same way.
+    """
+    if isinstance(products, ProductBatch):
+        return products.rows()
+    return (
+        (product.name, product.sku, product.price, product.stock)
+        for product in products
+    )
+
+
+def iter_unit_rows(
+    products: Union[ProductBatch, Iterable[ProductData]]
+) -> Iterator[Tuple[Optional[str], Optional[float]]]:
+    """
+    Yields (unit, normalised_price) pairs, in the same order as
+    iter_product_rows.
+    """
+    if isinstance(products, ProductBatch):
+        return zip(
+            products.units,
+            (None if math.isnan(price) else price for price in products.normalised_prices),
+        )
+    return ((product.unit, product.normalised_price) for product in products)
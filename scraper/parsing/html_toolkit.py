@@ -0,0 +1,149 @@
+# scraper/parsing/html_toolkit.py
+
+from __future__ import annotations
+from typing import Any, List, Optional
+
+import soupsieve
+from bs4 import BeautifulSoup, Tag
+
+try:
+    from cssselect import HTMLTranslator
+    from lxml import etree
+except ImportError:  # lxml and cssselect are optional (the 'fast-html' extra)
+    HTMLTranslator = None
+    etree = None
+
+LXML = "lxml"
+HTML_PARSER = "html.parser"
+# lxml builds trees several times faster than BeautifulSoup's html.parser
+DEFAULT_BACKEND = LXML if etree is not None else HTML_PARSER
+
+Element = Any  # an lxml element or a BeautifulSoup Tag, depending on the backend
+
+
+def extract_region(
+    html_content: str, start_marker: str, end_marker: Optional[str] = None
+) -> str:
+    """
+    Returns the part of a page from the first `start_marker` to the last
+    `end_marker`, so only the product listing needs to be parsed rather than
+    navigation, scripts and footers. Falls back to the whole page if a
+    marker is missing.
+
+    Example:
+        extract_region(page, '<ul class="products"', "</ul>")
+    """
+    start = html_content.find(start_marker)
+    if start < 0:
+        return html_content
+    if end_marker is None:
+        return html_content[start:]
+    end = html_content.rfind(end_marker, start)
+    if end < 0:
+        return html_content[start:]
+    return html_content[start : end + len(end_marker)]
+
+
+def parse_html(html_content: str, backend: Optional[str] = None) -> Element:
+    """
+    Parses HTML (a whole page or a fragment from extract_region) and returns
+    the root element for use with Selector.
+
+    Args:
+        html_content: The HTML to parse.
+        backend: 'lxml' (the default when lxml is installed) or any parser
+                 name BeautifulSoup accepts, such as 'html.parser'.
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend != LXML:
+        return BeautifulSoup(html_content, backend)
+    if etree is None:
+        raise ValueError("The 'lxml' HTML backend needs lxml and cssselect installed")
+    try:
+        root = etree.HTML(html_content)
+    except ValueError:
+        # lxml rejects str input that carries an XML encoding declaration
+        root = etree.HTML(html_content.encode("utf-8"))
+    if root is None:  # empty document
+        root = etree.HTML("<html></html>")
+    return root
+
+
+def text_of(element: Element) -> str:
+    """
+    Returns an element's text with runs of whitespace collapsed to one space.
+    """
+    if isinstance(element, Tag):
+        raw = element.get_text()
+    else:
+        raw = "".join(element.itertext())
+    return " ".join(raw.split())
+
+
+class Selector:
+    """
+    A CSS selector compiled once, for both backends, and applied to many
+    pages. Declare selectors at class or module level rather than inside
+    Parser.parse so they are not recompiled for every page.
+
+    Usage:
+        PRODUCT = Selector("li.product")
+        NAME = Selector(".name")
+
+        for item in PRODUCT.select(parse_html(page)):
+            name = NAME.text(item)
+    """
+
+    def __init__(self: Selector, css: str) -> None:
+        self.css = css
+        self._soup_pattern = soupsieve.compile(css)
+        # Match descendants only, as BeautifulSoup does
+        self._lxml_pattern = (
+            etree.XPath(HTMLTranslator().css_to_xpath(css, prefix="descendant::"))
+            if etree is not None
+            else None
+        )
+
+    def select(self: Selector, element: Element) -> List[Element]:
+        """
+        Returns every matching descendant of `element`, in document order.
+        """
+        if isinstance(element, Tag):
+            return self._soup_pattern.select(element)
+        return self._lxml_pattern(element)
+
+    def select_one(self: Selector, element: Element) -> Optional[Element]:
+        """
+        Returns the first matching descendant of `element`, or None.
+        """
+        if isinstance(element, Tag):
+            return self._soup_pattern.select_one(element)
+        matches = self._lxml_pattern(element)
+        return matches[0] if matches else None
+
+    def text(
+        self: Selector, element: Element, default: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Returns the whitespace-normalised text of the first match, or `default`.
+        """
+        match = self.select_one(element)
+        return text_of(match) if match is not None else default
+
+    def attr(
+        self: Selector, element: Element, name: str, default: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Returns an attribute of the first match, or `default`.
+        """
+        match = self.select_one(element)
+        if match is None:
+            return default
+        value = match.get(name)
+        if value is None:
+            return default
+        # BeautifulSoup splits multi-valued attributes such as class
+        return " ".join(value) if isinstance(value, list) else value
+
+    def __repr__(self: Selector) -> str:
+        return f"Selector({self.css!r})"
@@ -0,0 +1,217 @@
+# scraper/parsing/selector_parser.py
+
+from __future__ import annotations
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from scraper.interfaces.parser import Parser
+from scraper.models.product import ProductData
+from scraper.parsing.html_toolkit import Selector, extract_region, parse_html, text_of
+
+FIELDS = ("name", "sku", "price", "stock", "unit")
+REQUIRED_FIELDS = ("name", "sku", "price")
+
+_NUMBER = re.compile(r"[-+]?\d[\d\s.,']*")
+
+
+def parse_number(text: str, decimal_separator: str = ".") -> Optional[float]:
+    """
+    Returns the first number in `text`, ignoring currency symbols and
+    thousands separators, or None if there is none.
+
+    Example:
+        parse_number("NZD $1,234.50 ex GST") == 1234.5
+        parse_number("1.234,50 €", decimal_separator=",") == 1234.5
+    """
+    match = _NUMBER.search(text)
+    if match is None:
+        return None
+    digits = match.group().rstrip()
+    thousands_separator = "," if decimal_separator == "." else "."
+    for separator in (thousands_separator, " ", "'"):
+        digits = digits.replace(separator, "")
+    if decimal_separator != ".":
+        digits = digits.replace(decimal_separator, ".")
+    try:
+        return float(digits)
+    except ValueError:
+        return None
+
+
+def _price_normaliser(rules: Dict[str, Any]) -> Callable[[str], Optional[float]]:
+    decimal_separator = rules.get("decimal_separator", ".")
+    multiplier = float(rules.get("multiplier", 1.0))
+
+    def _normalise(text: str) -> Optional[float]:
+        value = parse_number(text, decimal_separator)
+        return value * multiplier if value is not None else None
+
+    return _normalise
+
+
+def _stock_normaliser(rules: Dict[str, Any]) -> Callable[[str], Optional[int]]:
+    # Exact texts such as "Out of stock" are matched case-insensitively
+    text_map = {
+        str(text).strip().lower(): value for text, value in (rules.get("map") or {}).items()
+    }
+
+    def _normalise(text: str) -> Optional[int]:
+        key = text.lower()
+        if key in text_map:
+            mapped = text_map[key]
+            return int(mapped) if mapped is not None else None
+        value = parse_number(text)
+        return int(value) if value is not None else None
+
+    return _normalise
+
+
+def _unit_normaliser(rules: Dict[str, Any]) -> Callable[[str], Optional[str]]:
+    # Units are lower-cased so they match the keys of 'price_normalisation'
+    text_map = {
+        str(text).strip().lower(): unit for text, unit in (rules.get("map") or {}).items()
+    }
+
+    def _normalise(text: str) -> Optional[str]:
+        key = text.lower()
+        unit = text_map.get(key, key)
+        return str(unit).lower() if unit else None
+
+    return _normalise
+
+
+def _text_normaliser(rules: Dict[str, Any]) -> Callable[[str], Optional[str]]:
+    upper = bool(rules.get("upper", False))
+
+    def _normalise(text: str) -> Optional[str]:
+        text = text.upper() if upper else text
+        return text or None
+
+    return _normalise
+
+
+_NORMALISERS = {
+    "name": _text_normaliser,
+    "sku": _text_normaliser,
+    "price": _price_normaliser,
+    "stock": _stock_normaliser,
+    "unit": _unit_normaliser,
+}
+
+# One compiled field: (name, selector or None for the product element itself,
+# attribute or None for its text, normaliser)
+FieldRule = Tuple[str, Optional[Selector], Optional[str], Callable[[str], Any]]
+
+
+class ExtractionPlan:
+    """
+    Field selectors and normalisation rules compiled once from a supplier's
+    configuration and applied to every page.
+
+    Supplier configuration keys:
+        - 'selectors': A mapping with 'product' (the CSS selector matching one
+          product) and one entry per field: 'name', 'sku', 'price' and
+          optionally 'stock' and 'unit'. A field is either a CSS selector relative to
+          the product, or a mapping with 'css' and/or 'attr' to read an
+          attribute instead of text ('css' omitted means the product
+          element itself).
+        - 'normalise' (optional): Per-field rules. 'price' accepts
+          'decimal_separator' (default '.') and 'multiplier'; 'stock'
+          accepts 'map' from texts like 'Out of stock' to a number (or
+          null for unknown); 'unit' accepts 'map' from texts like
+          'per 6m length' to a unit name; 'name' and 'sku' accept 'upper'.
+        - 'listing_region' (optional): A mapping with 'start' and 'end'
+          markers; only the HTML between them is parsed (see
+          extract_region).
+        - 'html_backend' (optional): 'lxml' or a BeautifulSoup parser name.
+    """
+
+    def __init__(self: ExtractionPlan, config: Dict[str, Any]) -> None:
+        selectors = config.get("selectors")
+        if not isinstance(selectors, dict) or not selectors.get("product"):
+            raise ValueError(
+                "Selector parser configuration must include 'selectors.product'"
+            )
+        missing = [field for field in REQUIRED_FIELDS if field not in selectors]
+        if missing:
+            raise ValueError(
+                f"Selector parser configuration is missing selectors for: {', '.join(missing)}"
+            )
+        unknown = set(selectors) - set(FIELDS) - {"product"}
+        if unknown:
+            raise ValueError(f"Unknown selector fields: {', '.join(sorted(unknown))}")
+
+        normalise = config.get("normalise") or {}
+        self.product = Selector(selectors["product"])
+        self.fields: List[FieldRule] = []
+        for field in FIELDS:
+            if field not in selectors:
+                continue
+            spec = selectors[field]
+            if isinstance(spec, str):
+                spec = {"css": spec}
+            css = spec.get("css")
+            self.fields.append(
+                (
+                    field,
+                    Selector(css) if css else None,
+                    spec.get("attr"),
+                    _NORMALISERS[field](normalise.get(field) or {}),
+                )
+            )
+
+        region = config.get("listing_region") or {}
+        self.region_start: Optional[str] = region.get("start")
+        self.region_end: Optional[str] = region.get("end")
+        self.backend: Optional[str] = config.get("html_backend")
+
+    def _value(self: ExtractionPlan, item: Any, rule: FieldRule) -> Any:
+        _, selector, attr, normalise = rule
+        element = selector.select_one(item) if selector is not None else item
+        if element is None:
+            return None
+        if attr is None:
+            return normalise(text_of(element))
+        text = element.get(attr)
+        if text is None:
+            return None
+        if isinstance(text, list):  # BeautifulSoup multi-valued attribute
+            text = " ".join(text)
+        return normalise(" ".join(text.split()))
+
+    def extract(self: ExtractionPlan, html_content: str) -> List[ProductData]:
+        """
+        Returns the products on a page. Products missing a name, SKU or
+        price are skipped.
+        """
+        if self.region_start:
+            html_content = extract_region(html_content, self.region_start, self.region_end)
+        root = parse_html(html_content, self.backend)
+
+        products: List[ProductData] = []
+        skipped = 0
+        for item in self.product.select(root):
+            values = {rule[0]: self._value(item, rule) for rule in self.fields}
+            if any(values[field] is None for field in REQUIRED_FIELDS):
+                skipped += 1
+                continue
+            products.append(ProductData(**values))
+        if skipped:
+            logging.debug(f"Skipped {skipped} product(s) missing a name, SKU or price")
+        return products
+
+
+class SelectorParser(Parser):
+    """
+    Generic parser driven by the selectors and normalisation rules in the
+    supplier configuration (see ExtractionPlan), so a supplier needs no
+    parsing code of its own.
+    """
+
+    def __init__(self: SelectorParser, config: dict) -> None:
+        self.config = config
+        self.plan = ExtractionPlan(config)
+
+    def parse(self: SelectorParser, html_content: str) -> List[ProductData]:
+        return self.plan.extract(html_content)
@@ -0,0 +1,213 @@
+# scraper/scheduler.py
+
+from __future__ import annotations
+import heapq
+import logging
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# How often a supplier without 'schedule_interval' is scraped
+DEFAULT_INTERVAL = 24 * 60 * 60.0
+
+_UNITS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+
+def parse_interval(value: Any) -> float:
+    """
+    Parses an interval given in seconds or as a number with a unit, such as
+    '90s', '30m', '1h' or '1d'.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        seconds = float(value)
+    else:
+        match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*", str(value).lower())
+        if match is None:
+            raise ValueError(f"Invalid schedule interval '{value}', expected e.g. '30m' or '1h'")
+        seconds = float(match.group(1)) * _UNITS[match.group(2) or "s"]
+    if seconds <= 0:
+        raise ValueError(f"Schedule interval must be positive, got '{value}'")
+    return seconds
+
+
+@dataclass(order=True)
+class ScheduledSupplier:
+    """
+    A supplier waiting for its next run.
+
+    Entries order by due time, so the scheduler's heap pops the supplier due
+    soonest; among suppliers that are due at once, higher priority runs
+    first.
+
+    Attributes:
+        next_run: Clock time at which the supplier is next due.
+        name: The supplier's name.
+        interval: Seconds between the starts of consecutive runs.
+        priority: Higher runs first when the concurrency budget is short.
+    """
+
+    next_run: float
+    name: str = field(compare=False)
+    interval: float = field(compare=False)
+    priority: int = field(default=0, compare=False)
+
+    @classmethod
+    def from_config(
+        cls, name: str, config: Dict[str, Any], now: float
+    ) -> ScheduledSupplier:
+        """
+        Schedules a supplier's first run for `now`.
+
+        Supplier configuration keys:
+            - 'schedule_interval' (optional): Time between runs in daemon
+              mode, in seconds or as '30m', '1h', '1d' (default daily).
+            - 'schedule_priority' (optional): Suppliers with higher priority
+              take the concurrency budget first (default 0).
+        """
+        return cls(
+            next_run=now,
+            name=name,
+            interval=parse_interval(config.get("schedule_interval", DEFAULT_INTERVAL)),
+            priority=int(config.get("schedule_priority", 0)),
+        )
+
+
+class Scheduler:
+    """
+    Runs suppliers repeatedly, each at its own interval, with at most
+    `max_concurrency` running at once.
+
+    The scheduler runs in one long-lived process, so supplier modules are
+    imported once and logged-in sessions stay in the in-memory session cache
+    (see scraper.http.session_store) between runs. A supplier never overlaps
+    with itself: its next run is scheduled when the current one finishes, one
+    interval after it started, or straight away if the run took longer than
+    its interval.
+    """
+
+    def __init__(
+        self: Scheduler,
+        entries: List[ScheduledSupplier],
+        run_function: Callable[[str], Any],
+        max_concurrency: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._heap = list(entries)
+        heapq.heapify(self._heap)
+        self._run_function = run_function
+        self._max_concurrency = max_concurrency
+        self._clock = clock
+        self._running: Dict[str, ScheduledSupplier] = {}
+        self._lock = threading.Lock()
+        # Set whenever a run finishes, so run_forever re-plans
+        self._wakeup = threading.Event()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="scheduled"
+        )
+
+    @classmethod
+    def from_configs(
+        cls,
+        configs: Dict[str, Dict[str, Any]],
+        run_function: Callable[[str], Any],
+        max_concurrency: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> Scheduler:
+        """
+        Schedules every supplier in `configs` (name to configuration) to run
+        first straight away.
+        """
+        now = clock()
+        entries = [
+            ScheduledSupplier.from_config(name, config or {}, now)
+            for name, config in configs.items()
+        ]
+        return cls(entries, run_function, max_concurrency, clock)
+
+    def _take_due(self: Scheduler) -> List[ScheduledSupplier]:
+        """
+        Removes the due suppliers that fit in the free concurrency budget
+        from the heap, highest priority first.
+        """
+        now = self._clock()
+        due: List[ScheduledSupplier] = []
+        while self._heap and self._heap[0].next_run <= now:
+            due.append(heapq.heappop(self._heap))
+        due.sort(key=lambda entry: (-entry.priority, entry.next_run))
+        budget = self._max_concurrency - len(self._running)
+        for entry in due[budget:]:
+            heapq.heappush(self._heap, entry)
+        return due[:budget]
+
+    def run_due(self: Scheduler) -> List[Future]:
+        """
+        Starts every supplier that is due, as far as the concurrency budget
+        allows, and returns the futures of the runs started.
+        """
+        with self._lock:
+            started = self._take_due()
+            for entry in started:
+                self._running[entry.name] = entry
+        return [self._executor.submit(self._run, entry) for entry in started]
+
+    def _run(self: Scheduler, entry: ScheduledSupplier) -> None:
+        started = self._clock()
+        logging.info(f"Scheduler: starting {entry.name} (priority {entry.priority})")
+        try:
+            self._run_function(entry.name)
+        except Exception as e:
+            logging.error(f"Scheduler: {entry.name} failed: {e!r}", exc_info=e)
+        finally:
+            # Rescheduled before the future completes, so callers waiting on
+            # it see the next run
+            with self._lock:
+                del self._running[entry.name]
+                entry.next_run = max(started + entry.interval, self._clock())
+                heapq.heappush(self._heap, entry)
+            self._wakeup.set()
+            logging.info(
+                f"Scheduler: {entry.name} took {self._clock() - started:.2f}s; "
+                f"next run in {entry.next_run - self._clock():.0f}s"
+            )
+
+    def seconds_until_next(self: Scheduler) -> Optional[float]:
+        """
+        Returns how long until the next supplier can start, or None if the
+        concurrency budget is full or nothing is waiting.
+        """
+        with self._lock:
+            if not self._heap or len(self._running) >= self._max_concurrency:
+                return None
+            return max(0.0, self._heap[0].next_run - self._clock())
+
+    def schedule(self: Scheduler) -> List[Tuple[str, float]]:
+        """
+        Returns (supplier, seconds until due) for every waiting supplier,
+        soonest first.
+        """
+        with self._lock:
+            now = self._clock()
+            return [(entry.name, entry.next_run - now) for entry in sorted(self._heap)]
+
+    def run_forever(self: Scheduler, stop: threading.Event) -> None:
+        """
+        Runs suppliers as they fall due until `stop` is set, then waits for
+        the runs in progress to finish.
+        """
+        try:
+            while not stop.is_set():
+                self._wakeup.clear()
+                self.run_due()
+                timeout = self.seconds_until_next()
+                # Also wake periodically so a stop request is noticed
+                self._wakeup.wait(timeout=1.0 if timeout is None else min(timeout, 1.0))
+        finally:
+            self.close()
+
+    def close(self: Scheduler) -> None:
+        self._executor.shutdown(wait=True)
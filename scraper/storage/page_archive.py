@@ -0,0 +1,179 @@
+# scraper/storage/page_archive.py
+
+from __future__ import annotations
+import datetime
+import json
+import mmap
+import os
+import struct
+import zlib
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from scraper.models.page import Page, page_url
+
+_MAGIC = b"PGARC001"
+# Per page: flags, then the lengths of the URL, headers and body that follow
+_RECORD = struct.Struct("<BIII")
+_HAS_URL = 1
+_COMPRESSED = 2
+
+# zlib level; pages are mostly repeated markup, so higher levels gain little
+DEFAULT_COMPRESSION_LEVEL = 6
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def archive_path(path: str, config: Dict[str, Any]) -> str:
+    """
+    Fills in '{name}' and '{date}' in an archive path with the supplier's
+    name and today's date.
+    """
+    return path.format(
+        name=config.get("name") or "default", date=datetime.date.today().isoformat()
+    )
+
+
+class PageArchiveWriter:
+    """
+    Records fetched pages (URL, response headers and content) into a page
+    archive, one compressed record per page, for replaying later without
+    the network (see PageArchive and ReplayPageFetcher).
+
+    The archive is written under a temporary name and only moved into place
+    by close(complete=True), so an interrupted run does not replace a good
+    recording with a partial one.
+    """
+
+    def __init__(
+        self: PageArchiveWriter,
+        path: str,
+        compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+    ) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.compression_level = compression_level
+        self.count = 0
+        self._tmp_path = f"{path}.tmp"
+        self._file = open(self._tmp_path, "wb", buffering=_WRITE_BUFFER_SIZE)
+        self._file.write(_MAGIC)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional[PageArchiveWriter]:
+        """
+        Starts recording the supplier's pages if 'record_archive' is
+        configured.
+
+        Supplier configuration keys:
+            - 'record_archive': The archive file; '{name}' and '{date}' in
+              it are filled in with the supplier's name and today's date.
+            - 'record_compression_level': zlib level from 0 (store
+              uncompressed) to 9 (default 6).
+        """
+        path = config.get("record_archive")
+        if not path:
+            return None
+        return cls(
+            archive_path(path, config),
+            compression_level=int(
+                config.get("record_compression_level", DEFAULT_COMPRESSION_LEVEL)
+            ),
+        )
+
+    def write(self: PageArchiveWriter, page_content: str) -> None:
+        """
+        Appends one page to the archive.
+        """
+        url = page_url(page_content)
+        flags = 0
+        url_bytes = b""
+        if url is not None:
+            flags |= _HAS_URL
+            url_bytes = url.encode("utf-8")
+        headers = getattr(page_content, "headers", None)
+        headers_bytes = b""
+        if headers:
+            headers_bytes = json.dumps(headers, separators=(",", ":")).encode("utf-8")
+        body = page_content.encode("utf-8")
+        if self.compression_level > 0:
+            flags |= _COMPRESSED
+            body = zlib.compress(body, self.compression_level)
+        self._file.write(_RECORD.pack(flags, len(url_bytes), len(headers_bytes), len(body)))
+        self._file.write(url_bytes)
+        self._file.write(headers_bytes)
+        self._file.write(body)
+        self.count += 1
+
+    def close(self: PageArchiveWriter, complete: bool = True) -> None:
+        """
+        Finishes the archive, or discards it if the run was not `complete`.
+        """
+        self._file.close()
+        if complete:
+            os.replace(self._tmp_path, self.path)
+        elif os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+
+class PageArchive:
+    """
+    Read-only page archive written by PageArchiveWriter, memory-mapped so
+    pages are read straight from the page cache: compressed bodies are
+    decompressed from the mapping without an intermediate copy, and
+    uncompressed ones decoded directly from it.
+    """
+
+    # Offset of the first record, which iter_pages starts from by default
+    START = len(_MAGIC)
+
+    def __init__(self: PageArchive, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        if self._mmap[: len(_MAGIC)] != _MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a page archive")
+
+    def iter_pages(
+        self: PageArchive, offset: Optional[int] = None
+    ) -> Iterator[Tuple[Page, int]]:
+        """
+        Yields (page, offset of the next record) pairs from `offset`, so a
+        reader can later resume after any page.
+        """
+        offset = self.START if offset is None else offset
+        size = len(self._mmap)
+        while offset < size:
+            if offset + _RECORD.size > size:
+                raise ValueError(f"{self.path} is truncated")
+            flags, url_length, headers_length, body_length = _RECORD.unpack_from(
+                self._mmap, offset
+            )
+            start = offset + _RECORD.size
+            end = start + url_length + headers_length + body_length
+            if end > size:
+                raise ValueError(f"{self.path} is truncated")
+            with self._view[start:end] as record:
+                url = None
+                if flags & _HAS_URL:
+                    url = str(record[:url_length], "utf-8")
+                headers = None
+                if headers_length:
+                    headers = json.loads(
+                        str(record[url_length : url_length + headers_length], "utf-8")
+                    )
+                with record[url_length + headers_length :] as body:
+                    if flags & _COMPRESSED:
+                        content = zlib.decompress(body).decode("utf-8")
+                    else:
+                        content = str(body, "utf-8")
+            offset = end
+            yield Page(content, url=url, headers=headers), offset
+
+    def __iter__(self: PageArchive) -> Iterator[Page]:
+        for page, _ in self.iter_pages():
+            yield page
+
+    def close(self: PageArchive) -> None:
+        # The map can only be closed once no views into it remain
+        self._view.release()
+        self._mmap.close()
@@ -0,0 +1,319 @@
+# scraper/storage/price_history.py
+
+from __future__ import annotations
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Union
+
+from scraper.models.product import ProductData
+from scraper.models.product_batch import ProductBatch, iter_product_rows
+
+ADDED = "added"
+CHANGED = "changed"
+REMOVED = "removed"
+
+
+@dataclass
+class PriceChange:
+    """
+    One SKU whose details differ between a run and the run before it.
+
+    Attributes:
+        kind: 'added', 'changed' or 'removed'.
+        sku: The product's SKU.
+        old: The product as previously seen, or None if it is new.
+        new: The product as seen in the run, or None if it was removed.
+    """
+
+    kind: str
+    sku: str
+    old: Optional[ProductData]
+    new: Optional[ProductData]
+
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS runs ("
+    " id INTEGER PRIMARY KEY, supplier TEXT NOT NULL,"
+    " started_at REAL NOT NULL, finished_at REAL,"
+    " product_count INTEGER, changed_count INTEGER)",
+    "CREATE INDEX IF NOT EXISTS runs_by_supplier ON runs (supplier, id)",
+    # A row per SKU each time it is added, its name, price or stock changes,
+    # or it is removed, so history stays small when most prices are stable.
+    # Rows are clustered by run and the previous values are copied in, so a
+    # run's changes are read with one contiguous range scan.
+    "CREATE TABLE IF NOT EXISTS prices ("
+    " supplier TEXT NOT NULL, run_id INTEGER NOT NULL, sku TEXT NOT NULL,"
+    " kind TEXT NOT NULL, name TEXT, price REAL, stock INTEGER,"
+    " old_name TEXT, old_price REAL, old_stock INTEGER,"
+    " PRIMARY KEY (supplier, run_id, sku)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS prices_by_sku ON prices (supplier, sku, run_id)",
+    # The latest state of every SKU, for lookups and to diff each new run
+    "CREATE TABLE IF NOT EXISTS latest ("
+    " supplier TEXT NOT NULL, sku TEXT NOT NULL, run_id INTEGER NOT NULL,"
+    " name TEXT, price REAL, stock INTEGER, removed INTEGER NOT NULL DEFAULT 0,"
+    " PRIMARY KEY (supplier, sku)) WITHOUT ROWID",
+)
+
+_DIFFERS = "(l.name IS NOT r.name OR l.price IS NOT r.price OR l.stock IS NOT r.stock)"
+
+
+class PriceHistory:
+    """
+    Embedded SQLite store of every run's products, per supplier and SKU.
+
+    Only changes are stored: a run adds a row for each SKU that is new,
+    whose name, price or stock changed, or that disappeared. The 'latest'
+    table keeps the current state of every SKU, so latest-price lookups and
+    a run's change set are index lookups however long the history grows.
+    """
+
+    def __init__(self: PriceHistory, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        # Autocommit; transactions are begun explicitly
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Several suppliers may finish runs against the same file at once
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional[PriceHistory]:
+        """
+        Opens the price history if 'price_history_path' is configured.
+
+        Supplier configuration keys:
+            - 'price_history_path': SQLite file holding the history; it can
+              be shared by every supplier.
+        """
+        path = config.get("price_history_path")
+        return cls(path) if path else None
+
+    def start_run(self: PriceHistory, supplier: str) -> PriceHistoryRun:
+        """
+        Begins recording a run of `supplier`. Products are added with
+        PriceHistoryRun.add and written when the run finishes.
+        """
+        cursor = self._conn.execute(
+            "INSERT INTO runs (supplier, started_at) VALUES (?, ?)", (supplier, time.time())
+        )
+        return PriceHistoryRun(self._conn, supplier, cursor.lastrowid)
+
+    def suppliers(self: PriceHistory) -> List[str]:
+        """
+        Returns every supplier with a finished run.
+        """
+        return [
+            row[0]
+            for row in self._conn.execute(
+                "SELECT DISTINCT supplier FROM runs WHERE finished_at IS NOT NULL"
+                " ORDER BY supplier"
+            )
+        ]
+
+    def last_run_id(self: PriceHistory, supplier: str) -> Optional[int]:
+        """
+        Returns the most recent finished run of a supplier, if any.
+        """
+        row = self._conn.execute(
+            "SELECT MAX(id) FROM runs WHERE supplier = ? AND finished_at IS NOT NULL",
+            (supplier,),
+        ).fetchone()
+        return row[0]
+
+    def latest(
+        self: PriceHistory, supplier: str, skus: Optional[Iterable[str]] = None
+    ) -> Dict[str, ProductData]:
+        """
+        Returns the current product for each SKU (or each of `skus`) of a
+        supplier, leaving out removed products.
+        """
+        query = (
+            "SELECT sku, name, price, stock FROM latest WHERE supplier = ? AND removed = 0"
+        )
+        if skus is None:
+            rows = self._conn.execute(query, (supplier,))
+        else:
+            rows = (
+                row
+                for sku in skus
+                for row in self._conn.execute(f"{query} AND sku = ?", (supplier, sku))
+            )
+        return {
+            sku: ProductData(name=name, sku=sku, price=price, stock=stock)
+            for sku, name, price, stock in rows
+        }
+
+    def changes(
+        self: PriceHistory, supplier: str, run_id: Optional[int] = None
+    ) -> List[PriceChange]:
+        """
+        Returns what changed in a run (by default the supplier's last
+        finished run) compared with the state before it.
+        """
+        if run_id is None:
+            run_id = self.last_run_id(supplier)
+            if run_id is None:
+                return []
+        rows = self._conn.execute(
+            "SELECT kind, sku, name, price, stock, old_name, old_price, old_stock"
+            " FROM prices WHERE supplier = ? AND run_id = ? ORDER BY sku",
+            (supplier, run_id),
+        )
+        return [
+            PriceChange(
+                kind,
+                sku,
+                None if kind == ADDED else ProductData(old_name, sku, old_price, old_stock),
+                None if kind == REMOVED else ProductData(name, sku, price, stock),
+            )
+            for kind, sku, name, price, stock, old_name, old_price, old_stock in rows
+        ]
+
+    def history(self: PriceHistory, supplier: str, sku: str) -> List[tuple]:
+        """
+        Returns (run start time, product or None if removed) for each change
+        to one SKU, oldest first.
+        """
+        rows = self._conn.execute(
+            "SELECT r.started_at, p.kind, p.name, p.price, p.stock"
+            " FROM prices p JOIN runs r ON r.id = p.run_id"
+            " WHERE p.supplier = ? AND p.sku = ? ORDER BY p.run_id",
+            (supplier, sku),
+        )
+        return [
+            (
+                started_at,
+                None if kind == REMOVED else ProductData(name, sku, price, stock),
+            )
+            for started_at, kind, name, price, stock in rows
+        ]
+
+    def close(self: PriceHistory) -> None:
+        self._conn.close()
+
+
+class PriceHistoryRun:
+    """
+    Collects one run's products and writes its changes in a single
+    transaction when it finishes.
+
+    Products are staged in a connection-private temporary table, so a long
+    run does not hold the database's write lock while it scrapes.
+    """
+
+    def __init__(
+        self: PriceHistoryRun, conn: sqlite3.Connection, supplier: str, run_id: int
+    ) -> None:
+        self._conn = conn
+        self.supplier = supplier
+        self.run_id = run_id
+        self.product_count = 0
+        self._conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS run_products ("
+            " sku TEXT PRIMARY KEY, name TEXT, price REAL, stock INTEGER) WITHOUT ROWID"
+        )
+        self._conn.execute("DELETE FROM temp.run_products")
+
+    def add(
+        self: PriceHistoryRun, products: Union[ProductBatch, Iterable[ProductData]]
+    ) -> None:
+        """
+        Stages a batch of products. A SKU seen twice keeps its last values.
+        """
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO temp.run_products (name, sku, price, stock)"
+                " VALUES (?, ?, ?, ?)",
+                iter_product_rows(products),
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def finish(self: PriceHistoryRun, complete: bool = True) -> int:
+        """
+        Writes the run's changes and returns how many SKUs changed.
+
+        Args:
+            complete: Whether the run saw the supplier's whole catalogue.
+                      Only complete runs mark missing SKUs as removed.
+        """
+        params = {"supplier": self.supplier, "run_id": self.run_id}
+        self.product_count = self._conn.execute(
+            "SELECT COUNT(*) FROM temp.run_products"
+        ).fetchone()[0]
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            changed = self._conn.execute(
+                "INSERT INTO prices (supplier, sku, run_id, kind, name, price, stock,"
+                " old_name, old_price, old_stock)"
+                " SELECT :supplier, r.sku, :run_id,"
+                " CASE WHEN l.removed = 0 THEN 'changed' ELSE 'added' END,"
+                " r.name, r.price, r.stock,"
+                " CASE WHEN l.removed = 0 THEN l.name END,"
+                " CASE WHEN l.removed = 0 THEN l.price END,"
+                " CASE WHEN l.removed = 0 THEN l.stock END"
+                " FROM temp.run_products r LEFT JOIN latest l"
+                " ON l.supplier = :supplier AND l.sku = r.sku"
+                f" WHERE l.sku IS NULL OR l.removed = 1 OR {_DIFFERS}",
+                params,
+            ).rowcount
+            if complete:
+                changed += self._conn.execute(
+                    "INSERT INTO prices (supplier, sku, run_id, kind,"
+                    " old_name, old_price, old_stock)"
+                    " SELECT supplier, sku, :run_id, 'removed', name, price, stock"
+                    " FROM latest"
+                    " WHERE supplier = :supplier AND removed = 0"
+                    " AND sku NOT IN (SELECT sku FROM temp.run_products)",
+                    params,
+                ).rowcount
+                self._conn.execute(
+                    "UPDATE latest SET removed = 1, run_id = :run_id"
+                    " WHERE supplier = :supplier AND removed = 0"
+                    " AND sku NOT IN (SELECT sku FROM temp.run_products)",
+                    params,
+                )
+            # Unchanged SKUs are left alone, so a run with few changes
+            # writes little
+            self._conn.execute(
+                "INSERT INTO latest (supplier, sku, run_id, name, price, stock, removed)"
+                " SELECT :supplier, r.sku, :run_id, r.name, r.price, r.stock, 0"
+                " FROM temp.run_products r LEFT JOIN latest l"
+                " ON l.supplier = :supplier AND l.sku = r.sku"
+                f" WHERE l.sku IS NULL OR l.removed = 1 OR {_DIFFERS}"
+                " ON CONFLICT (supplier, sku) DO UPDATE SET run_id = excluded.run_id,"
+                " name = excluded.name, price = excluded.price, stock = excluded.stock,"
+                " removed = 0",
+                params,
+            )
+            self._conn.execute(
+                "UPDATE runs SET finished_at = ?, product_count = ?, changed_count = ?"
+                " WHERE id = ?",
+                (time.time(), self.product_count, changed, self.run_id),
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._conn.execute("DELETE FROM temp.run_products")
+        logging.info(
+            f"Price history: {self.supplier} run {self.run_id} had "
+            f"{self.product_count} product(s), {changed} change(s)"
+        )
+        return changed
+
+    def abort(self: PriceHistoryRun) -> None:
+        """
+        Discards the staged products; the run stays unfinished.
+        """
+        self._conn.execute("DELETE FROM temp.run_products")
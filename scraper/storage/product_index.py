@@ -0,0 +1,387 @@
+# scraper/storage/product_index.py
+
+from __future__ import annotations
+import mmap
+import os
+import re
+import struct
+import zlib
+from array import array
+import collections
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from scraper.models.product import ProductData
+from scraper.models.product_batch import NO_STOCK, ProductBatch, iter_product_rows
+
+_MAGIC = b"PRIDX001"
+_HEADER = struct.Struct("<8sI")
+_SECTION = struct.Struct("<QQ")
+_SECTION_COUNT = 18
+
+# Posting lists read per search before candidates are scored; the rarest
+# trigrams are read first, so common ones ('ang', 'ste') are skipped
+DEFAULT_SEARCH_BUDGET = 20_000
+# Candidates scored per search, by number of shared trigrams
+DEFAULT_SEARCH_CANDIDATES = 200
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalise_sku(sku: str) -> str:
+    """
+    Normalises a SKU for matching across suppliers: upper case, with spaces,
+    dashes and other punctuation removed ('ab-100 x' -> 'AB100X').
+    """
+    return _NON_ALNUM.sub("", sku.lower()).upper()
+
+
+def name_trigrams(name: str) -> Set[str]:
+    """
+    Returns the trigrams of a product name, per word and padded as in
+    PostgreSQL's pg_trgm, so names match regardless of case, punctuation and
+    word order.
+    """
+    trigrams = set()
+    for word in _NON_ALNUM.sub(" ", name.lower()).split():
+        padded = f"  {word} "
+        trigrams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+@dataclass
+class IndexedProduct:
+    """
+    A product found in the index, with the supplier that lists it.
+    """
+
+    supplier: str
+    product: ProductData
+
+
+class ProductIndexBuilder:
+    """
+    Collects products from every supplier and writes a ProductIndex file.
+
+    Example:
+        builder = ProductIndexBuilder()
+        for supplier in history.suppliers():
+            builder.add(supplier, history.latest(supplier).values())
+        builder.write("data/products.idx")
+        index = ProductIndex.open("data/products.idx")
+    """
+
+    def __init__(self: ProductIndexBuilder) -> None:
+        self._suppliers: Dict[str, int] = {}
+        self._supplier_ids = array("I")
+        self._names: List[str] = []
+        self._skus: List[str] = []
+        self._prices = array("d")
+        self._stocks = array("q")
+
+    def add(
+        self: ProductIndexBuilder,
+        supplier: str,
+        products: Union[ProductBatch, Iterable[ProductData]],
+    ) -> None:
+        supplier_id = self._suppliers.setdefault(supplier, len(self._suppliers))
+        for name, sku, price, stock in iter_product_rows(products):
+            self._supplier_ids.append(supplier_id)
+            self._names.append(name)
+            self._skus.append(sku)
+            self._prices.append(price)
+            self._stocks.append(NO_STOCK if stock is None else stock)
+
+    @classmethod
+    def from_price_history(cls, history) -> ProductIndexBuilder:
+        """
+        Starts a builder holding the latest products of every supplier in a
+        PriceHistory.
+        """
+        builder = cls()
+        for supplier in history.suppliers():
+            builder.add(supplier, history.latest(supplier).values())
+        return builder
+
+    def __len__(self: ProductIndexBuilder) -> int:
+        return len(self._prices)
+
+    def write(self: ProductIndexBuilder, path: str) -> None:
+        """
+        Writes the index file, replacing any previous one atomically.
+        """
+        skus: Dict[str, array] = collections.defaultdict(lambda: array("I"))
+        trigrams: Dict[str, array] = collections.defaultdict(lambda: array("I"))
+        # Words repeat across a catalogue, so each word's posting lists are
+        # looked up once
+        word_postings: Dict[str, List[array]] = {}
+        for record, (sku, name) in enumerate(zip(self._skus, self._names)):
+            skus[normalise_sku(sku)].append(record)
+            for word in _NON_ALNUM.sub(" ", name.lower()).split():
+                postings = word_postings.get(word)
+                if postings is None:
+                    postings = word_postings[word] = [
+                        trigrams[trigram] for trigram in name_trigrams(word)
+                    ]
+                for records in postings:
+                    # A trigram may occur in several words of one name
+                    if not records or records[-1] != record:
+                        records.append(record)
+
+        supplier_names = "\n".join(self._suppliers).encode("utf-8")
+        name_offsets, name_blob = _pack_strings(self._names)
+        sku_offsets, sku_blob = _pack_strings(self._skus)
+        sections = [
+            supplier_names,
+            self._prices.tobytes(),
+            self._stocks.tobytes(),
+            self._supplier_ids.tobytes(),
+            name_offsets.tobytes(),
+            name_blob,
+            sku_offsets.tobytes(),
+            sku_blob,
+            *_pack_table(skus),
+            *_pack_table(trigrams),
+        ]
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            # Sections start on 8-byte boundaries so they can be cast in place
+            offset = _HEADER.size + _SECTION.size * len(sections)
+            table = []
+            for data in sections:
+                offset = _align(offset)
+                table.append((offset, len(data)))
+                offset += len(data)
+            f.write(_HEADER.pack(_MAGIC, len(sections)))
+            for section in table:
+                f.write(_SECTION.pack(*section))
+            for (start, _), data in zip(table, sections):
+                f.write(b"\0" * (start - f.tell()))
+                f.write(data)
+        os.replace(tmp_path, path)
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _pack_strings(strings: List[str]) -> Tuple[array, bytes]:
+    """
+    Encodes strings into one blob plus the offset of each string (and of the
+    blob's end).
+    """
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = array("Q", [0])
+    total = 0
+    for data in encoded:
+        total += len(data)
+        offsets.append(total)
+    return offsets, b"".join(encoded)
+
+
+def _pack_table(postings: Dict[str, array]) -> List[bytes]:
+    """
+    Packs a string -> record ids mapping as an open-addressing hash table:
+    slots (key number + 1, or 0 if empty), the keys, and each key's records.
+    """
+    keys = list(postings)
+    capacity = 1 << max(4, (2 * len(keys)).bit_length())
+    slots = array("I", bytes(4 * capacity))
+    mask = capacity - 1
+    for number, key in enumerate(keys):
+        slot = zlib.crc32(key.encode("utf-8")) & mask
+        while slots[slot]:
+            slot = (slot + 1) & mask
+        slots[slot] = number + 1
+    key_offsets, key_blob = _pack_strings(keys)
+    posting_offsets = array("Q", [0])
+    records = array("I")
+    for key in keys:
+        records.extend(postings[key])
+        posting_offsets.append(len(records))
+    return [
+        slots.tobytes(),
+        key_offsets.tobytes(),
+        key_blob,
+        posting_offsets.tobytes(),
+        records.tobytes(),
+    ]
+
+
+class _Table:
+    """
+    Read side of _pack_table, over memoryviews of the mapped file.
+    """
+
+    def __init__(self: _Table, slots, key_offsets, key_blob, posting_offsets, records) -> None:
+        self._slots = slots
+        self._mask = len(slots) - 1
+        self._key_offsets = key_offsets
+        self._key_blob = key_blob
+        self._posting_offsets = posting_offsets
+        self._records = records
+
+    def get(self: _Table, key: str) -> memoryview:
+        """
+        Returns the record ids stored under `key` (empty if there are none).
+        """
+        encoded = key.encode("utf-8")
+        slot = zlib.crc32(encoded) & self._mask
+        while True:
+            number = self._slots[slot]
+            if not number:
+                return self._records[0:0]
+            number -= 1
+            start, end = self._key_offsets[number], self._key_offsets[number + 1]
+            if self._key_blob[start:end] == encoded:
+                return self._records[
+                    self._posting_offsets[number] : self._posting_offsets[number + 1]
+                ]
+            slot = (slot + 1) & self._mask
+
+
+class ProductIndex:
+    """
+    Read-only index of every supplier's products, memory-mapped from a file
+    written by ProductIndexBuilder.
+
+    Opening the index only maps the file, so it loads instantly in any
+    process and several processes share one copy in the page cache. SKU
+    lookups are a hash probe on the normalised SKU; name searches rank
+    products by trigram similarity.
+    """
+
+    def __init__(self: ProductIndex, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        # Every view into the map, released in reverse order by close
+        self._views: List[memoryview] = []
+        magic, count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or count != _SECTION_COUNT:
+            self.close()
+            raise ValueError(f"{path} is not a product index")
+        formats = "BdqIQBQB" + "IQBQI" * 2
+        sections = []
+        for number in range(count):
+            start, length = _SECTION.unpack_from(
+                self._mmap, _HEADER.size + number * _SECTION.size
+            )
+            section = self._view[start : start + length]
+            self._views.append(section)
+            if formats[number] != "B":
+                section = section.cast(formats[number])
+                self._views.append(section)
+            sections.append(section)
+
+        self.suppliers = bytes(sections[0]).decode("utf-8").split("\n")
+        self._prices = sections[1]
+        self._stocks = sections[2]
+        self._supplier_ids = sections[3]
+        self._name_offsets = sections[4]
+        self._names = sections[5]
+        self._sku_offsets = sections[6]
+        self._skus = sections[7]
+        self._sku_table = _Table(*sections[8:13])
+        self._trigram_table = _Table(*sections[13:18])
+
+    @classmethod
+    def open(cls, path: str) -> ProductIndex:
+        return cls(path)
+
+    def __len__(self: ProductIndex) -> int:
+        return len(self._prices)
+
+    def _string(self: ProductIndex, blob, offsets, record: int) -> str:
+        return bytes(blob[offsets[record] : offsets[record + 1]]).decode("utf-8")
+
+    def product(self: ProductIndex, record: int) -> IndexedProduct:
+        stock = self._stocks[record]
+        return IndexedProduct(
+            supplier=self.suppliers[self._supplier_ids[record]],
+            product=ProductData(
+                name=self._string(self._names, self._name_offsets, record),
+                sku=self._string(self._skus, self._sku_offsets, record),
+                price=self._prices[record],
+                stock=None if stock == NO_STOCK else stock,
+            ),
+        )
+
+    def lookup(self: ProductIndex, sku: str) -> List[IndexedProduct]:
+        """
+        Returns every supplier's product with this SKU (compared after
+        normalise_sku), cheapest first.
+        """
+        records = sorted(self._sku_table.get(normalise_sku(sku)), key=self._prices.__getitem__)
+        return [self.product(record) for record in records]
+
+    def cheapest(self: ProductIndex, sku: str, in_stock: bool = False) -> Optional[IndexedProduct]:
+        """
+        Returns the cheapest listing of a SKU across suppliers, or None.
+
+        Args:
+            sku: The SKU to look up.
+            in_stock: Skip listings known to be out of stock.
+        """
+        best = None
+        for record in self._sku_table.get(normalise_sku(sku)):
+            if in_stock and self._stocks[record] == 0:
+                continue
+            if best is None or self._prices[record] < self._prices[best]:
+                best = record
+        return None if best is None else self.product(best)
+
+    def search(
+        self: ProductIndex,
+        name: str,
+        limit: int = 10,
+        min_similarity: float = 0.3,
+        budget: int = DEFAULT_SEARCH_BUDGET,
+    ) -> List[Tuple[float, IndexedProduct]]:
+        """
+        Finds products whose names are similar to `name`, returning
+        (similarity, product) pairs, most similar first.
+
+        Similarity is the share of trigrams two names have in common
+        (Jaccard), from 0 to 1. Candidates are gathered from the query's
+        rarest trigrams, reading at most `budget` postings, so a search
+        costs about the same however many products share common words.
+        """
+        query = name_trigrams(name)
+        if not query:
+            return []
+        postings = sorted(
+            (self._trigram_table.get(trigram) for trigram in query), key=len
+        )
+        counts: Counter = Counter()
+        read = 0
+        for records in postings:
+            if not records or (read and read + len(records) > budget):
+                continue
+            counts.update(records)
+            read += len(records)
+
+        results = []
+        for record, _ in counts.most_common(DEFAULT_SEARCH_CANDIDATES):
+            candidate = name_trigrams(self._string(self._names, self._name_offsets, record))
+            similarity = len(query & candidate) / len(query | candidate)
+            if similarity >= min_similarity:
+                results.append((similarity, record))
+        results.sort(key=lambda result: (-result[0], self._prices[result[1]]))
+        return [(similarity, self.product(record)) for similarity, record in results[:limit]]
+
+    def iter_products(self: ProductIndex) -> Iterator[IndexedProduct]:
+        for record in range(len(self)):
+            yield self.product(record)
+
+    def close(self: ProductIndex) -> None:
+        # The map can only be closed once no views into it remain
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._view.release()
+        self._mmap.close()
@@ -3,52 +3,107 @@
 import importlib
 import os
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
 import yaml # Import the yaml library
 
-# Dictionary to store loaded supplier run functions and their configurations
+from scraper.core.metrics import metrics
+
+# Dictionary to store discovered suppliers: their configuration, the module
+# holding their 'run' function, and the function itself once imported
 _loaded_suppliers = {}
 # Dictionary to store the loaded configuration from the YAML file
 _supplier_configs = {}
+# Supplier configuration, relative to the working directory
+CONFIG_PATH = "config/suppliers.yaml"
+# Module providing 'run' for suppliers configured only in suppliers.yaml
+GENERIC_SUPPLIER_MODULE = "scraper.core.generic_supplier"
+# Serialises the first import of a supplier when suppliers run concurrently
+_import_lock = threading.Lock()
 
 def load_all_suppliers():
     """
-    Loads configuration from suppliers.yaml and dynamically finds and loads
-    the 'run' function from the 'scrape.py' module in each configured supplier directory.
+    Loads configuration from suppliers.yaml and discovers the suppliers that
+    have a 'scrape.py' module in their directory under scraper/suppliers,
+    plus those configured only with 'selectors' in suppliers.yaml (see
+    scraper.core.generic_supplier).
+
+    Supplier modules are not imported here; each one is imported the first
+    time it is run (see run_supplier), so listing suppliers or running a
+    single supplier does not pay for importing every supplier's dependencies.
     """
     logging.info("Loading all configured suppliers...")
 
     # Load configuration from YAML file
-    config_path = "config/suppliers.yaml"
-    with open(config_path, 'r') as f:
-        global _supplier_configs
-        _supplier_configs = yaml.safe_load(f) or {} # Load config, handle empty file
-    logging.info(f"Successfully loaded configuration from {config_path}")
+    global _supplier_configs
+    if os.path.exists(CONFIG_PATH):
+        _supplier_configs = read_supplier_configs()
+        logging.info(f"Successfully loaded configuration from {CONFIG_PATH}")
+    else:
+        _supplier_configs = {}
+        logging.warning(f"No supplier configuration found at {CONFIG_PATH}")
 
     suppliers_dir = "scraper/suppliers"
 
-    # Get list of potential supplier directories
-    supplier_dirs = [
+    # Get list of supplier directories that provide a scrape module
+    supplier_dirs = sorted(
         d
         for d in os.listdir(suppliers_dir)
-        if os.path.isdir(os.path.join(suppliers_dir, d)) and not d.startswith('__') # Exclude __pycache__ etc.
-    ]
-
-    for supplier_name in supplier_dirs:
-        # Construct the module path for the supplier's scrape module
-        module_path = f"scraper.suppliers.{supplier_name}.scrape"
+        if os.path.isdir(os.path.join(suppliers_dir, d))
+        and not d.startswith('__') # Exclude __pycache__ etc.
+        and os.path.exists(os.path.join(suppliers_dir, d, "scrape.py"))
+    )
 
-        # Dynamically import the module
-        supplier_scrape_module = importlib.import_module(module_path)
+    module_paths = {
+        supplier_name: f"scraper.suppliers.{supplier_name}.scrape"
+        for supplier_name in supplier_dirs
+    }
+    # Suppliers described only by selectors in the YAML use the generic scraper
+    for supplier_name, supplier_config in _supplier_configs.items():
+        if (
+            supplier_name not in module_paths
+            and isinstance(supplier_config, dict)
+            and 'selectors' in supplier_config
+        ):
+            module_paths[supplier_name] = GENERIC_SUPPLIER_MODULE
 
-        # Get the 'run' function from the module
-        run_function = getattr(supplier_scrape_module, 'run')
-
-        # Store the run function and its configuration
+    for supplier_name in sorted(module_paths):
+        # Record where the supplier's run function lives, without importing it
         _loaded_suppliers[supplier_name] = {
-            'run_function': run_function,
+            'module_path': module_paths[supplier_name],
+            'run_function': None,
             'config': _supplier_configs.get(supplier_name, {}) # Get config for this supplier
         }
-        logging.info(f"Successfully loaded scraper for supplier: {supplier_name}")
+        logging.debug(f"Discovered scraper for supplier: {supplier_name}")
+
+
+def read_supplier_configs() -> Dict[str, Any]:
+    """
+    Returns every supplier's configuration from suppliers.yaml, or an empty
+    mapping if there is no such file.
+    """
+    if not os.path.exists(CONFIG_PATH):
+        return {}
+    with open(CONFIG_PATH, 'r') as f:
+        return yaml.safe_load(f) or {} # Load config, handle empty file
+
+
+def _get_run_function(supplier_name: str):
+    """
+    Returns the supplier's 'run' function, importing its module on first use.
+    """
+    supplier_info = _loaded_suppliers[supplier_name]
+    if supplier_info['run_function'] is None:
+        with _import_lock:
+            if supplier_info['run_function'] is None:
+                # Dynamically import the module and get the 'run' function
+                supplier_scrape_module = importlib.import_module(supplier_info['module_path'])
+                supplier_info['run_function'] = getattr(supplier_scrape_module, 'run')
+                logging.info(f"Successfully loaded scraper for supplier: {supplier_name}")
+    return supplier_info['run_function']
 
 
 def get_available_suppliers():
@@ -58,16 +113,113 @@ def get_available_suppliers():
     return list(_loaded_suppliers.keys())
 
 
-def run_supplier(supplier_name: str):
+def get_supplier_config(supplier_name: str) -> Dict[str, Any]:
+    """
+    Returns a loaded supplier's configuration from suppliers.yaml.
+    """
+    return _loaded_suppliers[supplier_name]['config']
+
+
+def run_supplier(
+    supplier_name: str, resume: bool = False, overrides: Optional[Dict[str, Any]] = None
+):
     """
     Runs the scraper for the specified supplier if it has been loaded.
     Passes the supplier's configuration to the run function.
+
+    With `resume` set, a supplier configured with 'checkpoint_dir' carries on
+    from its last checkpoint instead of starting over. `overrides` replace
+    keys of the supplier's configuration for this run.
     """
     if supplier_name in _loaded_suppliers:
         logging.info(f"Running scraper for supplier: {supplier_name}")
         supplier_info = _loaded_suppliers[supplier_name]
-        run_function = supplier_info['run_function']
-        config = supplier_info['config']
-        run_function(config) # Call the loaded run function with config
+        run_function = _get_run_function(supplier_name)
+        # Default the name so metrics and caches are keyed by the supplier
+        config = {'name': supplier_name, **supplier_info['config']}
+        if resume:
+            config['resume'] = True
+        config.update(overrides or {})
+        supplier_metrics = metrics.for_supplier(supplier_name)
+        try:
+            with supplier_metrics.timer("run"):
+                run_function(config) # Call the loaded run function with config
+        except Exception:
+            supplier_metrics.incr("errors")
+            raise
     else:
-        logging.warning(f"Scraper for supplier '{supplier_name}' is not available.")
\ No newline at end of file
+        logging.warning(f"Scraper for supplier '{supplier_name}' is not available.")
+
+
+def run_suppliers(
+    supplier_names: List[str],
+    max_workers: int = 1,
+    resume: bool = False,
+    overrides: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Optional[BaseException]]:
+    """
+    Runs the scrapers for several suppliers using a bounded pool of worker threads.
+
+    Suppliers share no state, so each one runs independently and a failure in
+    one supplier does not stop the others. Total wall time tracks the slowest
+    supplier rather than the sum of all of them.
+
+    Args:
+        supplier_names: Names of the suppliers to run.
+        max_workers: Maximum number of suppliers to run at the same time.
+        resume: Resume each supplier from its last checkpoint, if any.
+        overrides: Configuration keys to set for every supplier.
+
+    Returns:
+        A dictionary mapping each supplier name to the exception it raised,
+        or None if it finished successfully.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    results: Dict[str, Optional[BaseException]] = {}
+    durations: Dict[str, float] = {}
+
+    def _timed_run(supplier_name: str) -> None:
+        started = time.perf_counter()
+        try:
+            run_supplier(supplier_name, resume=resume, overrides=overrides)
+        finally:
+            durations[supplier_name] = time.perf_counter() - started
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="supplier"
+    ) as executor:
+        futures = {
+            executor.submit(_timed_run, supplier_name): supplier_name
+            for supplier_name in supplier_names
+        }
+        for future in as_completed(futures):
+            supplier_name = futures[future]
+            error = future.exception()
+            results[supplier_name] = error
+            if error is not None:
+                logging.error(
+                    f"Scraper for supplier '{supplier_name}' failed: {error!r}",
+                    exc_info=error,
+                )
+
+    _log_run_summary(results, durations)
+    # Report in the order the suppliers were requested, not completion order
+    return {supplier_name: results[supplier_name] for supplier_name in supplier_names}
+
+
+def _log_run_summary(
+    results: Dict[str, Optional[BaseException]], durations: Dict[str, float]
+) -> None:
+    """
+    Logs a one-line-per-supplier summary of a multi-supplier run.
+    """
+    failed = [name for name, error in results.items() if error is not None]
+    logging.info(
+        f"Run summary: {len(results) - len(failed)} succeeded, {len(failed)} failed"
+    )
+    for supplier_name, error in results.items():
+        status = "ok" if error is None else f"FAILED ({error!r})"
+        duration = durations.get(supplier_name, 0.0)
+        logging.info(f"- {supplier_name}: {status} in {duration:.2f}s")
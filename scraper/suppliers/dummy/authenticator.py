@@ -14,6 +14,7 @@ class DummyAuthenticator(Authenticator):
         Initializes the DummyAuthenticator with configuration.
         """
         self.config = config
+        self._session = requests.Session()
         logging.info(
             "DummyAuthenticator: Initialized with config: %s", config.get("name")
         )
@@ -23,13 +24,11 @@ class DummyAuthenticator(Authenticator):
         Simulates a login process.
         """
         logging.info("DummyAuthenticator: Simulating login...")
-        # Return a mock session object or None
-        return requests.Session()
+        return self._session
 
     def get_session(self: DummyAuthenticator) -> requests.Session:
         """
-        Returns a mock session object.
+        Returns the dummy session (the same one login returns).
         """
         logging.info("DummyAuthenticator: Providing dummy session.")
-        # Return the current session or None
-        return requests.Session()  # Or return None if no session is active
+        return self._session
@@ -2,6 +2,7 @@
 
 import logging
 from scraper.core.scraper import Scraper
+from scraper.exporters.registry import create_exporter
 from scraper.suppliers.dummy.authenticator import DummyAuthenticator
 from scraper.suppliers.dummy.page_fetcher import DummyPageFetcher
 from scraper.suppliers.dummy.parser import DummyParser
@@ -38,6 +39,13 @@ def run(config):
 
 
     scraper = Scraper()
+    # Stream the products to the exporter selected in suppliers.yaml, if any
+    exporter = create_exporter(dummy_config)
+    if exporter is not None:
+        exported = scraper.scrape_and_export(dummy_config, exporter)
+        logging.info(f"Dummy supplier scraper finished. Exported {exported} product(s).")
+        return
+
     scraped_data = scraper.scrape_supplier(dummy_config)
 
     logging.info(f"Dummy supplier scraper finished. Scraped {len(scraped_data)} product(s).")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 import requests
+from scraper.http.resilience import install_resilience
 from scraper.interfaces.authenticator import Authenticator
 import logging
 
@@ -15,6 +16,8 @@ class SteelAndTubeAuthenticator(Authenticator):
         """
         self.config = config
         self._session = requests.Session()
+        # Retry transient errors (e.g. a 503 from the login form) before giving up
+        install_resilience(self._session, config)
         logging.info(
             "SteelAndTubeAuthenticator: Initialized with config for %s",
             config.get("name"),
@@ -52,6 +55,7 @@ class SteelAndTubeAuthenticator(Authenticator):
             logging.info("SteelAndTubeAuthenticator: Login successful.")
 
         except requests.exceptions.RequestException as e:
+            # Transient failures have already been retried by the session
             logging.error(f"SteelAndTubeAuthenticator: Login failed: {e}")
             raise ValueError # ALWAYS FAIL IMMEDIATELY ON ANY ERROR
             # Handle login failure
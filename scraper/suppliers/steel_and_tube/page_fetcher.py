@@ -1,43 +1,20 @@
 # scraper/suppliers/steel_and_tube/page_fetcher.py
 
 from __future__ import annotations
-import requests
-from typing import List
-from scraper.interfaces.page_fetcher import PageFetcher
+from scraper.core.url_list_page_fetcher import UrlListPageFetcher
 import logging
 
-class SteelAndTubePageFetcher(PageFetcher):
+class SteelAndTubePageFetcher(UrlListPageFetcher):
     """
-    Page fetcher for Steel and Tube.
+    Page fetcher for Steel and Tube: its category/listing pages are a plain
+    list of URLs (see UrlListPageFetcher).
     """
 
     def __init__(self: SteelAndTubePageFetcher, config: dict) -> None:
         """
         Initializes the SteelAndTubePageFetcher with configuration.
         """
-        self.config = config
+        super().__init__(config)
         logging.info(
             "SteelAndTubePageFetcher: Initialized with config for %s", config.get("name")
         )
-
-    def fetch_pages(self, session: requests.Session) -> List[str]:
-        """
-        Fetches pages from the Steel and Tube website using the provided session.
-        Returns a list of raw page contents (e.g., HTML).
-        """
-        logging.info("SteelAndTubePageFetcher: Simulating page fetching.")
-        # This is a placeholder for the actual page fetching logic.
-        # You would use the provided session to make requests to the supplier's website.
-        pages_content: List[str] = []
-        # Example placeholder:
-        # product_list_url = self.config.get("product_list_url")
-        # if product_list_url:
-        #     try:
-        #         response = session.get(product_list_url)
-        #         response.raise_for_status()
-        #         pages_content.append(response.text)
-        #     except requests.exceptions.RequestException as e:
-        #         logging.error(f"SteelAndTubePageFetcher: Failed to fetch page: {e}")
-        #         raise ValueError # Added as per user instruction
-
-        return pages_content
\ No newline at end of file
@@ -27,13 +27,16 @@ class SteelAndTubeParser(Parser):
         # This is a placeholder for the actual parsing logic.
         # You would parse the html_content and create ProductData objects.
         parsed_data: List[ProductData] = []
-        # Example placeholder:
-        # from bs4 import BeautifulSoup
-        # soup = BeautifulSoup(html_content, 'html.parser')
-        # # Find product elements and extract data
-        # for product_element in soup.select(".product"):
-        #     name = product_element.select_one(".product-name").text
-        #     price = product_element.select_one(".product-price").text
+        # Example placeholder, using selectors compiled once at module level
+        # (see scraper.parsing.html_toolkit) and parsing only the listing:
+        # PRODUCT = Selector(".product")
+        # NAME = Selector(".product-name")
+        # PRICE = Selector(".product-price")
+        #
+        # listing = extract_region(html_content, '<div class="product-list"', "</main>")
+        # for product_element in PRODUCT.select(parse_html(listing)):
+        #     name = NAME.text(product_element)
+        #     price = PRICE.text(product_element)
         #     parsed_data.append(ProductData(name=name, price=price))
 
         return parsed_data
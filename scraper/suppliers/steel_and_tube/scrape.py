@@ -2,6 +2,8 @@
 
 import logging
 from scraper.core.scraper import Scraper
+from scraper.discovery.incremental_fetcher import IncrementalPageFetcher, uses_incremental_discovery
+from scraper.exporters.registry import create_exporter
 from scraper.suppliers.steel_and_tube.authenticator import SteelAndTubeAuthenticator
 from scraper.suppliers.steel_and_tube.page_fetcher import SteelAndTubePageFetcher
 from scraper.suppliers.steel_and_tube.parser import SteelAndTubeParser
@@ -24,13 +26,18 @@ def run(config):
 
     # Re-instantiate components using the config passed from supplier_manager
     authenticator = SteelAndTubeAuthenticator(config)
-    page_fetcher = SteelAndTubePageFetcher(config)
     parser = SteelAndTubeParser(config)
+    # With sitemaps or listing discovery configured, only new or changed
+    # product pages are fetched
+    if uses_incremental_discovery(config):
+        page_fetcher_class = IncrementalPageFetcher
+    else:
+        page_fetcher_class = SteelAndTubePageFetcher
 
     # Configure the scraper for Steel and Tube using the instantiated components
     steel_and_tube_config = {
         'authenticator_class': authenticator.__class__, # Pass the class reference
-        'page_fetcher_class': page_fetcher.__class__,   # Pass the class reference
+        'page_fetcher_class': page_fetcher_class,
         'parser_class': parser.__class__,       # Pass the class reference
         'name': config.get('name', 'steel_and_tube'), # Get name from config if available
         **config # Include all other config parameters
@@ -38,6 +45,13 @@ def run(config):
 
 
     scraper = Scraper()
+    # Stream the products to the exporter selected in suppliers.yaml, if any
+    exporter = create_exporter(steel_and_tube_config)
+    if exporter is not None:
+        exported = scraper.scrape_and_export(steel_and_tube_config, exporter)
+        logging.info(f"Steel and Tube scraper finished. Exported {exported} product(s).")
+        return
+
     scraped_data = scraper.scrape_supplier(steel_and_tube_config)
 
     logging.info(f"Steel and Tube scraper finished. Scraped {len(scraped_data)} product(s).")
@@ -0,0 +1,85 @@
+import threading
+import time
+from typing import AsyncIterator
+
+from scraper.core.scraper import Scraper, iter_pages
+from scraper.interfaces.async_page_fetcher import AsyncPageFetcher
+from scraper.suppliers.dummy.authenticator import DummyAuthenticator
+from scraper.suppliers.dummy.parser import DummyParser
+
+
+class FakeResponse:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.text = f"<html><body>{url}</body></html>"
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class FakeSession:
+    """
+    Stands in for requests.Session and records peak concurrency per call.
+    """
+
+    def __init__(self, delay: float = 0.02) -> None:
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str, **kwargs) -> FakeResponse:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return FakeResponse(url)
+
+
+class ListPageFetcher(AsyncPageFetcher):
+    def __init__(self, config: dict) -> None:
+        self.config = config
+
+    async def fetch_pages(self, session: FakeSession) -> AsyncIterator[str]:
+        async for response in self.fetch_all(session, self.config["urls"]):
+            yield response.text
+
+
+def test_fetch_all_respects_per_host_limit_and_keeps_order() -> None:
+    """
+    Test that no more than max_connections_per_host requests overlap and that
+    pages come back in the order they were requested.
+    """
+    urls = [f"https://example.test/page/{n}" for n in range(12)]
+    fetcher = ListPageFetcher({"urls": urls, "max_connections_per_host": 3})
+    session = FakeSession()
+
+    pages = list(iter_pages(fetcher, session, fetcher.config))
+
+    assert pages == [FakeResponse(url).text for url in urls]
+    assert session.peak == 3
+
+
+def test_scraper_drives_async_fetcher() -> None:
+    """
+    Test that Scraper.scrape_supplier accepts an async page fetcher.
+    """
+
+    class FakeSessionAuthenticator(DummyAuthenticator):
+        def login(self) -> FakeSession:
+            return FakeSession(delay=0)
+
+    config = {
+        "name": "async_dummy",
+        "authenticator_class": FakeSessionAuthenticator,
+        "page_fetcher_class": ListPageFetcher,
+        "parser_class": DummyParser,
+        "urls": ["https://example.test/a", "https://example.test/b"],
+    }
+
+    product_data_list = Scraper().scrape_supplier(config)
+
+    # DummyParser returns two products per page
+    assert len(product_data_list) == 4
@@ -0,0 +1,106 @@
+import os
+from typing import Iterator, List
+
+import pytest
+
+from scraper.core.scraper import Scraper
+from scraper.interfaces.page_fetcher import PageFetcher
+from scraper.interfaces.parser import Parser
+from scraper.models.product import ProductData
+from scraper.suppliers.dummy.authenticator import DummyAuthenticator
+
+PAGE_COUNT = 7
+
+
+class NumberedPageFetcher(PageFetcher):
+    """
+    Yields pages "0".."6", optionally failing before page `fail_at`.
+    Records every page it fetched in config['fetched'].
+    """
+
+    def __init__(self, config: dict) -> None:
+        self.config = config
+        self._next_page = 0
+
+    def fetch_pages(self, session) -> Iterator[str]:
+        while self._next_page < PAGE_COUNT:
+            if self._next_page == self.config.get("fail_at"):
+                raise ValueError("connection dropped")
+            self.config["fetched"].append(self._next_page)
+            self._next_page += 1
+            yield str(self._next_page - 1)
+
+
+class ResumableNumberedPageFetcher(NumberedPageFetcher):
+    def checkpoint_cursor(self) -> int:
+        return self._next_page
+
+    def resume_from(self, cursor: int) -> None:
+        self._next_page = cursor
+
+
+class NumberedParser(Parser):
+    def __init__(self, config: dict) -> None:
+        self.config = config
+
+    def parse(self, html_content: str) -> List[ProductData]:
+        page = int(html_content)
+        return [
+            ProductData(name=f"Item {page}.{n}", sku=f"SKU{page}{n}", price=page + n / 10)
+            for n in range(2)
+        ]
+
+
+def _config(tmp_path, page_fetcher_class, **extra) -> dict:
+    return {
+        "name": "numbered",
+        "authenticator_class": DummyAuthenticator,
+        "page_fetcher_class": page_fetcher_class,
+        "parser_class": NumberedParser,
+        "checkpoint_dir": str(tmp_path),
+        "checkpoint_interval": 2,
+        "fetched": [],
+        **extra,
+    }
+
+
+@pytest.mark.parametrize(
+    "page_fetcher_class", [ResumableNumberedPageFetcher, NumberedPageFetcher]
+)
+def test_resume_continues_from_last_checkpoint(tmp_path, page_fetcher_class) -> None:
+    """
+    Test that a resumed run returns the same products as an uninterrupted
+    one, only fetching pages after the checkpoint when the fetcher supports
+    cursors, and removes the checkpoint once it completes.
+    """
+    expected = Scraper().scrape_supplier(_config(tmp_path / "full", page_fetcher_class))
+
+    failing = _config(tmp_path, page_fetcher_class, fail_at=5)
+    with pytest.raises(ValueError):
+        Scraper().scrape_supplier(failing)
+    assert os.path.exists(tmp_path / "numbered.state.json")
+
+    resumed = _config(tmp_path, page_fetcher_class, resume=True)
+    products = Scraper().scrape_supplier(resumed)
+
+    assert products == expected
+    if page_fetcher_class is ResumableNumberedPageFetcher:
+        # Pages 0-3 were checkpointed; page 4 was parsed but not committed
+        assert resumed["fetched"] == [4, 5, 6]
+    else:
+        assert resumed["fetched"] == list(range(PAGE_COUNT))
+    assert os.listdir(tmp_path) == ["full"]
+
+
+def test_run_without_resume_starts_over(tmp_path) -> None:
+    """
+    Test that a leftover checkpoint is ignored and replaced unless resuming.
+    """
+    with pytest.raises(ValueError):
+        Scraper().scrape_supplier(_config(tmp_path, ResumableNumberedPageFetcher, fail_at=5))
+
+    config = _config(tmp_path, ResumableNumberedPageFetcher)
+    products = Scraper().scrape_supplier(config)
+
+    assert len(products) == 2 * PAGE_COUNT
+    assert config["fetched"] == list(range(PAGE_COUNT))
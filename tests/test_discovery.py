@@ -0,0 +1,136 @@
+import gzip
+
+import pytest
+
+from scraper.core.scraper import Scraper
+from scraper.discovery.incremental_fetcher import IncrementalPageFetcher
+from scraper.discovery.sitemap import SitemapEntry, parse_sitemap
+from scraper.models.product import ProductData
+from scraper.parsing.selector_parser import SelectorParser
+from scraper.suppliers.dummy.authenticator import DummyAuthenticator
+
+SITE = "https://steel.example"
+
+
+def _sitemap(lastmods: dict) -> str:
+    urls = "".join(
+        f"<url><loc>{SITE}/p/{sku}</loc><lastmod>{lastmod}</lastmod></url>"
+        for sku, lastmod in lastmods.items()
+    )
+    return (
+        '<?xml version="1.0"?>'
+        f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}'
+        f"<url><loc>{SITE}/about</loc></url></urlset>"
+    )
+
+
+class FakeResponse:
+    def __init__(self, url: str, text: str) -> None:
+        self.url = url
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.headers = {}
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class FakeSite:
+    """
+    Serves a sitemap index, a product sitemap and one page per product, and
+    records the URLs requested.
+    """
+
+    def __init__(self) -> None:
+        self.prices = {"A1": 10.0, "B1": 20.0, "C1": 30.0}
+        self.lastmods = {"A1": "2026-10-01", "B1": "2026-10-01", "C1": "2026-10-01"}
+        self.requested = []
+
+    def get(self, url: str, **kwargs) -> FakeResponse:
+        self.requested.append(url)
+        if url == f"{SITE}/sitemap.xml":
+            return FakeResponse(
+                url,
+                '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                f"<sitemap><loc>{SITE}/products.xml</loc></sitemap></sitemapindex>",
+            )
+        if url == f"{SITE}/products.xml":
+            return FakeResponse(url, _sitemap(self.lastmods))
+        sku = url.rsplit("/", 1)[-1]
+        return FakeResponse(
+            url,
+            f'<div class="product"><h1>Bar {sku}</h1><span class="sku">{sku}</span>'
+            f'<span class="price">${self.prices[sku]}</span></div>',
+        )
+
+
+def _config(tmp_path, site: FakeSite) -> dict:
+    class FakeSiteAuthenticator(DummyAuthenticator):
+        def login(self) -> FakeSite:
+            return site
+
+    return {
+        "name": "steel",
+        "authenticator_class": FakeSiteAuthenticator,
+        "page_fetcher_class": IncrementalPageFetcher,
+        "parser_class": SelectorParser,
+        "selectors": {"product": "div.product", "name": "h1", "sku": ".sku", "price": ".price"},
+        "sitemap_url": f"{SITE}/sitemap.xml",
+        "sitemap_url_pattern": r"/p/",
+        "discovery_state_dir": str(tmp_path / "discovery"),
+        "parse_cache_dir": str(tmp_path / "parse_cache"),
+    }
+
+
+def test_only_changed_product_pages_are_fetched(tmp_path) -> None:
+    """
+    Test that a second run fetches only the product page whose lastmod
+    changed, and still returns every product.
+    """
+    site = FakeSite()
+    config = _config(tmp_path, site)
+
+    first = Scraper().scrape_supplier(config)
+    site.requested.clear()
+    site.prices["B1"] = 25.0
+    site.lastmods["B1"] = "2026-10-18"
+    second = Scraper().scrape_supplier(config)
+
+    assert sorted(product.sku for product in first) == ["A1", "B1", "C1"]
+    assert site.requested == [f"{SITE}/sitemap.xml", f"{SITE}/products.xml", f"{SITE}/p/B1"]
+    assert sorted((p.sku, p.price) for p in second) == [
+        ("A1", 10.0), ("B1", 25.0), ("C1", 30.0)
+    ]
+
+
+def test_pages_missing_from_the_parse_cache_are_refetched(tmp_path) -> None:
+    site = FakeSite()
+    config = _config(tmp_path, site)
+    Scraper().scrape_supplier(config)
+
+    # A new parser version cannot reuse the old rows
+    site.requested.clear()
+    products = Scraper().scrape_supplier({**config, "parser_version": "2"})
+
+    assert len(products) == 3
+    assert f"{SITE}/p/A1" in site.requested
+    with pytest.raises(ValueError, match="discovery_state_dir"):
+        IncrementalPageFetcher({"sitemap_url": f"{SITE}/sitemap.xml"})
+
+
+def test_recording_an_archive_is_rejected(tmp_path) -> None:
+    """
+    Test that incremental discovery refuses to record a page archive, which
+    would be missing every unchanged page.
+    """
+    config = _config(tmp_path, FakeSite())
+
+    with pytest.raises(ValueError, match="page archive"):
+        IncrementalPageFetcher({**config, "record_archive": str(tmp_path / "pages.arc")})
+
+
+def test_parse_sitemap_reads_gzipped_sitemaps() -> None:
+    entries, sitemaps = parse_sitemap(gzip.compress(_sitemap({"A1": "2026-10-01"}).encode()))
+
+    assert entries == [SitemapEntry(f"{SITE}/p/A1", "2026-10-01"), SitemapEntry(f"{SITE}/about")]
+    assert sitemaps == []
@@ -0,0 +1,260 @@
+import os
+import threading
+import time
+from typing import Iterator, List
+
+import pytest
+
+from scraper.core.scraper import Scraper
+from scraper.distributed.coordinator import (
+    config_from_spec,
+    iter_distributed_products,
+    job_spec,
+)
+from scraper.distributed.work_queue import DONE, FAILED, WorkQueue
+from scraper.distributed.worker import run_worker
+from scraper.interfaces.page_fetcher import PageFetcher
+from scraper.interfaces.parser import Parser
+from scraper.models.product import ProductData
+from scraper.suppliers.dummy.authenticator import DummyAuthenticator
+
+PAGE_COUNT = 7
+
+
+class ShardedPageFetcher(PageFetcher):
+    """
+    Splits pages "0".."6" into units of two pages. Fails the first attempt
+    at a unit containing page config['flaky_page'].
+    """
+
+    def __init__(self, config: dict) -> None:
+        self.config = config
+
+    def fetch_pages(self, session) -> Iterator[str]:
+        for page in range(PAGE_COUNT):
+            yield str(page)
+
+    def plan_work_units(self, session) -> List[dict]:
+        return [
+            {"pages": list(range(start, min(start + 2, PAGE_COUNT)))}
+            for start in range(0, PAGE_COUNT, 2)
+        ]
+
+    def fetch_unit(self, session, unit: dict) -> Iterator[str]:
+        marker = os.path.join(self.config["marker_dir"], "failed_once")
+        if self.config.get("flaky_page") in unit["pages"] and not os.path.exists(marker):
+            open(marker, "w").close()
+            raise ValueError("connection dropped")
+        for page in unit["pages"]:
+            yield str(page)
+
+
+class NumberedParser(Parser):
+    def __init__(self, config: dict) -> None:
+        self.config = config
+
+    def parse(self, html_content: str) -> List[ProductData]:
+        page = int(html_content)
+        # Every page also lists a featured product
+        return [
+            ProductData(name=f"Item {page}", sku=f"SKU{page}", price=float(page)),
+            ProductData(name="Featured", sku="FEATURED", price=1.0),
+        ]
+
+
+def _config(tmp_path, **extra) -> dict:
+    return {
+        "name": "sharded",
+        "authenticator_class": DummyAuthenticator,
+        "page_fetcher_class": ShardedPageFetcher,
+        "parser_class": NumberedParser,
+        "work_queue": str(tmp_path / "queue.sqlite"),
+        "local_workers": 0,
+        "distributed_poll_interval": 0.01,
+        "distributed_timeout": 30,
+        "marker_dir": str(tmp_path),
+        **extra,
+    }
+
+
+def _start_workers(queue_path: str, count: int = 2) -> List[threading.Thread]:
+    workers = [
+        threading.Thread(
+            target=run_worker,
+            args=(queue_path,),
+            kwargs={"worker_id": f"worker-{n}", "poll_interval": 0.01, "idle_timeout": 1.0},
+        )
+        for n in range(count)
+    ]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+def test_distributed_scrape_matches_local_scrape(tmp_path) -> None:
+    """
+    Test that workers scrape every unit, a failed unit is retried, and the
+    merged products come back in page order with duplicate SKUs dropped.
+    """
+    config = _config(tmp_path, flaky_page=3)
+    workers = _start_workers(config["work_queue"])
+
+    products = Scraper().scrape_supplier(config)
+    for worker in workers:
+        worker.join()
+
+    assert [product.sku for product in products] == ["SKU0", "FEATURED"] + [
+        f"SKU{page}" for page in range(1, PAGE_COUNT)
+    ]
+    assert os.path.exists(tmp_path / "failed_once")
+    work_queue = WorkQueue(config["work_queue"])
+    assert work_queue.unfinished_job("sharded") is None
+
+
+def test_distributed_scrape_fails_after_max_attempts(tmp_path) -> None:
+    config = _config(tmp_path, flaky_page=3, max_attempts=1)
+    work_queue = WorkQueue(config["work_queue"])
+
+    def _worker() -> None:
+        run_worker(
+            config["work_queue"], max_attempts=1, poll_interval=0.01, idle_timeout=1.0
+        )
+
+    worker = threading.Thread(target=_worker)
+    worker.start()
+    with pytest.raises(ValueError, match="connection dropped"):
+        Scraper().scrape_supplier(config)
+    worker.join()
+
+    assert work_queue.unfinished_job("sharded") is not None
+
+    # Resuming retries the failed unit; the flaky page works this time
+    workers = _start_workers(config["work_queue"], count=1)
+    products = Scraper().scrape_supplier({**config, "resume": True})
+    for worker in workers:
+        worker.join()
+    assert len(products) == PAGE_COUNT + 1
+
+
+def test_expired_lease_is_handed_to_another_worker(tmp_path) -> None:
+    work_queue = WorkQueue(str(tmp_path / "queue.sqlite"))
+    job_id = work_queue.create_job("sharded", {}, [{"pages": [0]}])
+
+    stalled = work_queue.lease("stalled", lease_seconds=0)
+    retried = work_queue.lease("healthy")
+
+    assert retried.id == stalled.id and retried.attempts == 2
+    assert not work_queue.complete(stalled, "stalled", [])
+    assert work_queue.complete(retried, "healthy", [])
+    assert work_queue.job_counts(job_id)[DONE] == 1
+
+
+def test_unit_fails_after_its_last_lease_expires(tmp_path) -> None:
+    """
+    Test that a unit whose lease keeps expiring fails once it has used up
+    its attempts, instead of being leased forever.
+    """
+    work_queue = WorkQueue(str(tmp_path / "queue.sqlite"))
+    job_id = work_queue.create_job("sharded", {}, [{"pages": [0]}])
+
+    for attempt in range(2):
+        unit = work_queue.lease("stalled", lease_seconds=0, max_attempts=2)
+        assert unit.attempts == attempt + 1
+
+    assert work_queue.lease("healthy", max_attempts=2) is None
+    assert work_queue.job_counts(job_id)[FAILED] == 1
+    assert work_queue.job_errors(job_id) == ["Lease expired on attempt 2"]
+
+
+def test_job_spec_round_trip(tmp_path) -> None:
+    config = _config(tmp_path, session_factory=lambda: None)
+
+    spec = job_spec(config)
+
+    assert "session_factory" not in spec
+    assert config_from_spec(spec)["page_fetcher_class"] is ShardedPageFetcher
+
+
+def test_job_spec_leaves_out_credentials(tmp_path, monkeypatch) -> None:
+    """
+    Test that credentials are not stored on the queue, and that workers
+    load them from their own suppliers.yaml and environment.
+    """
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("config")
+    with open("config/suppliers.yaml", "w") as f:
+        f.write("sharded:\n  username: buyer\n  password: from-yaml\n")
+    monkeypatch.setenv("SCRAPER_SHARDED_PASSWORD", "from-env")
+    config = _config(tmp_path, username="buyer", password="hunter2", proxy_token="abc")
+
+    spec = job_spec(config)
+    rebuilt = config_from_spec(spec)
+
+    assert not {"username", "password", "proxy_token"} & set(spec)
+    assert (rebuilt["username"], rebuilt["password"]) == ("buyer", "from-env")
+    assert "proxy_token" not in rebuilt
+
+
+def test_units_are_yielded_as_they_finish(tmp_path) -> None:
+    """
+    Test that a unit's products are yielded while other units of the job
+    are still being scraped.
+    """
+    config = _config(tmp_path, resume=True)
+    work_queue = WorkQueue(config["work_queue"])
+    work_queue.create_job("sharded", {}, [{"pages": [0]}, {"pages": [1]}])
+    first = work_queue.lease("worker")
+    work_queue.complete(first, "worker", [ProductData(name="0", sku="0", price=0.0)])
+
+    results = iter_distributed_products(config, ShardedPageFetcher(config), None)
+
+    assert [product.sku for product in next(results)] == ["0"]
+    second = work_queue.lease("worker")
+    work_queue.complete(second, "worker", [ProductData(name="1", sku="1", price=1.0)])
+    assert [product.sku for product in next(results)] == ["1"]
+    assert next(results, None) is None
+    assert work_queue.unfinished_job("sharded") is None
+
+
+def test_job_max_attempts_applies_to_expired_leases(tmp_path) -> None:
+    work_queue = WorkQueue(str(tmp_path / "queue.sqlite"))
+    job_id = work_queue.create_job("sharded", {"max_attempts": 1}, [{"pages": [0]}])
+
+    work_queue.lease("stalled", lease_seconds=0, max_attempts=3)
+
+    assert work_queue.lease("healthy", max_attempts=3) is None
+    assert work_queue.job_counts(job_id)[FAILED] == 1
+
+
+SLOW_UNIT_RELEASED = threading.Event()
+
+
+class SlowPageFetcher(ShardedPageFetcher):
+    def fetch_unit(self, session, unit: dict) -> Iterator[str]:
+        SLOW_UNIT_RELEASED.wait(10)
+        yield from super().fetch_unit(session, unit)
+
+
+def test_worker_renews_lease_of_slow_unit(tmp_path) -> None:
+    """
+    Test that a worker holds a unit that takes longer than the job's
+    'lease_seconds' by renewing its lease.
+    """
+    SLOW_UNIT_RELEASED.clear()
+    config = _config(tmp_path, page_fetcher_class=SlowPageFetcher, lease_seconds=0.2)
+    work_queue = WorkQueue(config["work_queue"])
+    job_id = work_queue.create_job("sharded", job_spec(config), [{"pages": [0]}])
+    worker = threading.Thread(
+        target=run_worker,
+        args=(config["work_queue"],),
+        kwargs={"lease_seconds": 0.2, "poll_interval": 0.01, "idle_timeout": 0.5},
+    )
+    worker.start()
+    try:
+        time.sleep(0.6)
+        assert work_queue.lease("thief", lease_seconds=0) is None
+    finally:
+        SLOW_UNIT_RELEASED.set()
+        worker.join()
+
+    assert work_queue.job_counts(job_id)[DONE] == 1
@@ -0,0 +1,115 @@
+import csv
+import gzip
+import json
+
+import pytest
+
+from scraper.exporters.file_exporters import (
+    CsvExporter,
+    FileExporter,
+    JsonLinesExporter,
+    ParquetExporter,
+    pa,
+)
+from scraper.exporters.registry import create_exporter
+from scraper.models.product import ProductData
+from scraper.models.product_batch import ProductBatch
+
+PRODUCTS = [
+    ProductData(name="Angle, galvanised", sku="A1", price=10.5, stock=3),
+    ProductData(name="Bar \"flat\"", sku="B1", price=5.0),
+    ProductData(name="Channel", sku="C1", price=7.25, stock=0, unit="m", normalised_price=7.25),
+]
+BATCHES = [PRODUCTS[:2], ProductBatch.from_products(PRODUCTS[2:])]
+
+
+def test_csv_exporter_streams_compressed_batches(tmp_path) -> None:
+    path = tmp_path / "out" / "prices.csv.gz"
+
+    exported = CsvExporter(str(path)).export_stream(iter(BATCHES))
+
+    with gzip.open(path, "rt", newline="") as f:
+        rows = list(csv.reader(f))
+    assert exported == 3
+    assert rows == [
+        ["sku", "name", "price", "stock", "unit", "normalised_price"],
+        ["A1", "Angle, galvanised", "10.5", "3", "", ""],
+        ["B1", 'Bar "flat"', "5.0", "", "", ""],
+        ["C1", "Channel", "7.25", "0", "m", "7.25"],
+    ]
+    assert not (tmp_path / "out" / "prices.csv.gz.tmp").exists()
+
+
+def test_jsonl_exporter(tmp_path) -> None:
+    path = tmp_path / "prices.jsonl"
+
+    JsonLinesExporter(str(path)).export_data(PRODUCTS)
+
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert rows[1] == {
+        "sku": "B1",
+        "name": 'Bar "flat"',
+        "price": 5.0,
+        "stock": None,
+        "unit": None,
+        "normalised_price": None,
+    }
+    assert rows[2]["unit"] == "m" and rows[2]["normalised_price"] == 7.25
+    assert [row["sku"] for row in rows] == ["A1", "B1", "C1"]
+
+
+@pytest.mark.skipif(pa is None, reason="pyarrow is not installed")
+def test_parquet_exporter_writes_row_groups(tmp_path) -> None:
+    import pyarrow.parquet as pq
+
+    path = tmp_path / "prices.parquet"
+
+    exported = ParquetExporter(str(path), compression="zstd", row_group_size=2).export_stream(
+        BATCHES
+    )
+
+    parquet_file = pq.ParquetFile(str(path))
+    assert exported == 3
+    assert parquet_file.metadata.num_row_groups == 2
+    assert parquet_file.read().to_pylist()[1] == {
+        "sku": "B1",
+        "name": 'Bar "flat"',
+        "price": 5.0,
+        "stock": None,
+        "unit": None,
+        "normalised_price": None,
+    }
+    assert parquet_file.read().to_pylist()[2]["normalised_price"] == 7.25
+
+
+def test_failed_export_leaves_no_file(tmp_path) -> None:
+    path = tmp_path / "prices.csv"
+
+    def _batches():
+        yield PRODUCTS
+        raise ValueError("scrape failed")
+
+    with pytest.raises(ValueError):
+        CsvExporter(str(path)).export_stream(_batches())
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_exporter_selected_in_configuration(tmp_path) -> None:
+    config = {
+        "name": "steel",
+        "exporter": {"type": "csv", "path": str(tmp_path / "{name}.csv"), "buffer_size": 4096},
+    }
+
+    exporter = create_exporter(config)
+
+    assert isinstance(exporter, CsvExporter)
+    assert exporter.path == str(tmp_path / "steel.csv")
+    assert create_exporter({"name": "steel", "exporter": "jsonl"}).path == "exports/steel.jsonl"
+    assert create_exporter({"name": "steel"}) is None
+    with pytest.raises(ValueError, match="Unknown exporter type"):
+        create_exporter({"exporter": "xlsx"})
+
+
+def test_file_exporter_requires_write(tmp_path) -> None:
+    with pytest.raises(TypeError, match="_write"):
+        FileExporter(str(tmp_path / "prices.txt"))
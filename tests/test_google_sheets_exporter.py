@@ -0,0 +1,309 @@
+import re
+from typing import Callable, Dict, List, Optional
+
+import gspread
+import pytest
+import requests
+
+from scraper.exporters.google_sheets_exporter import (
+    CHANGES_HEADER_ROW,
+    HEADER_ROW,
+    GoogleSheetsExporter,
+)
+from scraper.models.product import ProductData
+from scraper.storage.price_history import CHANGED, REMOVED, PriceChange
+
+
+class FakeWorksheet:
+    """
+    In-memory stand-in for a gspread Worksheet that records API calls.
+    """
+
+    def __init__(
+        self,
+        rows: List[list],
+        title: str = "Sheet1",
+        id: int = 0,
+        formats: Optional[Dict[int, Callable[[float], str]]] = None,
+    ) -> None:
+        self.title = title
+        self.id = id
+        self.grid = [[str(cell) for cell in row] for row in rows]
+        self.row_count = max(len(self.grid), 10)
+        self.calls: List[str] = []
+        self.fail_next = 0
+        # Number formats by column index, applied to formatted reads
+        self.formats = formats or {}
+
+    def _cell(self, value) -> str:
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value)
+
+    def get_all_values(
+        self, value_render_option: str = "FORMATTED_VALUE"
+    ) -> List[list]:
+        self.calls.append("get_all_values")
+        rows = []
+        for row in self.grid:
+            cells = []
+            for column, cell in enumerate(row):
+                try:
+                    number = float(cell)
+                except ValueError:
+                    cells.append(cell)
+                    continue
+                if value_render_option == "UNFORMATTED_VALUE":
+                    cells.append(int(number) if number.is_integer() else number)
+                else:
+                    cells.append(self.formats.get(column, self._cell)(number))
+            rows.append(cells)
+        return rows
+
+    def clear(self) -> None:
+        self.calls.append("clear")
+        self.grid = []
+
+    def update(self, values, range_name) -> None:
+        self.calls.append("update")
+        self._write(1, values)
+
+    def append_rows(self, values, value_input_option=None) -> None:
+        self.calls.append("append_rows")
+        self._write(len(self.grid) + 1, values)
+
+    def add_rows(self, count: int) -> None:
+        self.calls.append("add_rows")
+        self.row_count += count
+
+    def batch_update(self, data, value_input_option=None) -> None:
+        if self.fail_next:
+            self.fail_next -= 1
+            response = requests.Response()
+            response.status_code = 429
+            response._content = b'{"error": {"code": 429, "message": "Quota"}}'
+            raise gspread.exceptions.APIError(response)
+        self.calls.append("batch_update")
+        for item in data:
+            first, last = map(int, re.findall(r"\d+", item["range"]))
+            assert last <= self.row_count
+            assert last - first + 1 == len(item["values"])
+            self._write(first, item["values"])
+
+    def _write(self, first_row: int, values) -> None:
+        for offset, row in enumerate(values):
+            index = first_row - 1 + offset
+            while len(self.grid) <= index:
+                self.grid.append([""] * len(HEADER_ROW))
+            self.grid[index] = [self._cell(value) for value in row]
+
+
+class FakeClient:
+    """
+    Stand-in for a gspread Client whose spreadsheet is the client itself.
+    """
+
+    def __init__(self, worksheet: FakeWorksheet) -> None:
+        self.sheet1 = worksheet
+        self.worksheets: Dict[str, FakeWorksheet] = {worksheet.title: worksheet}
+
+    def open(self, name: str) -> "FakeClient":
+        return self
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        if title not in self.worksheets:
+            raise gspread.exceptions.WorksheetNotFound(title)
+        return self.worksheets[title]
+
+    def add_worksheet(self, title: str, rows: int, cols: int) -> FakeWorksheet:
+        assert title not in self.worksheets
+        worksheet = FakeWorksheet([], title=title, id=len(self.worksheets) + 1)
+        self.worksheets[title] = worksheet
+        return worksheet
+
+    def del_worksheet(self, worksheet: FakeWorksheet) -> None:
+        del self.worksheets[worksheet.title]
+
+    def batch_update(self, body: dict) -> None:
+        sheets = {worksheet.id: worksheet for worksheet in self.worksheets.values()}
+        for request in body["requests"]:
+            if "updateCells" in request:
+                sheets[request["updateCells"]["range"]["sheetId"]].grid = []
+            elif "copyPaste" in request:
+                source = request["copyPaste"]["source"]
+                destination = request["copyPaste"]["destination"]
+                rows = sheets[source["sheetId"]].grid[: source["endRowIndex"]]
+                sheets[destination["sheetId"]]._write(1, rows)
+
+
+def _exporter(worksheet: FakeWorksheet, **kwargs) -> GoogleSheetsExporter:
+    exporter = GoogleSheetsExporter(
+        "prices", "unused.json", mode="diff", client=FakeClient(worksheet), **kwargs
+    )
+    exporter._sleep = lambda seconds: None
+    return exporter
+
+
+def test_diff_export_writes_only_changed_rows() -> None:
+    """
+    Test that diff mode updates changed prices, blanks removed SKUs, reuses
+    their rows for new SKUs and leaves unchanged rows alone.
+    """
+    worksheet = FakeWorksheet(
+        [
+            HEADER_ROW,
+            ["A1", "Angle", "10", ""],
+            ["B2", "Bar", "20", "5"],
+            ["C3", "Channel", "30", ""],
+            ["D4", "Dowel", "40", ""],
+        ]
+    )
+    products = [
+        ProductData(name="Angle", sku="A1", price=10.0),
+        ProductData(name="Bar", sku="B2", price=22.5, stock=5),
+        ProductData(name="Channel", sku="C3", price=30.0),
+        ProductData(name="Eyebolt", sku="E5", price=50.0),
+        ProductData(name="Flat", sku="F6", price=60.0),
+    ]
+
+    _exporter(worksheet).export_data(products)
+
+    assert "clear" not in worksheet.calls
+    assert worksheet.calls.count("batch_update") == 1
+    assert worksheet.grid == [
+        HEADER_ROW,
+        ["A1", "Angle", "10", ""],
+        ["B2", "Bar", "22.5", "5"],
+        ["C3", "Channel", "30", ""],
+        ["E5", "Eyebolt", "50", ""],
+        ["F6", "Flat", "60", ""],
+    ]
+
+
+def test_diff_export_chunks_requests_and_retries_quota_errors() -> None:
+    """
+    Test that large diffs are split into size-limited requests and that a
+    quota error is retried rather than failing the export.
+    """
+    worksheet = FakeWorksheet([HEADER_ROW])
+    worksheet.fail_next = 1
+    products = [
+        ProductData(name=f"Item {n}", sku=f"SKU{n}", price=float(n)) for n in range(25)
+    ]
+
+    _exporter(worksheet, max_cells_per_request=40).export_stream([products])
+
+    assert worksheet.calls.count("batch_update") == 3
+    assert [row[0] for row in worksheet.grid[1:]] == [f"SKU{n}" for n in range(25)]
+
+
+def _products(count: int, price: float = 10.0) -> List[ProductData]:
+    return [ProductData(name=f"Bar {i}", sku=f"B{i}", price=price) for i in range(count)]
+
+
+def test_replace_export_swaps_in_rows_after_the_stream_ends() -> None:
+    """
+    Test that replace mode leaves the sheet alone while batches arrive, then
+    replaces all of its rows, and removes the staging worksheet.
+    """
+    worksheet = FakeWorksheet([HEADER_ROW] + [[f"OLD{i}", "Old", "1", ""] for i in range(5)])
+    client = FakeClient(worksheet)
+    exporter = GoogleSheetsExporter("prices", "unused.json", client=client)
+
+    def batches():
+        for batch in (_products(2), _products(1)):
+            assert worksheet.grid[1][0] == "OLD0"
+            yield batch
+
+    assert exporter.export_stream(batches()) == 3
+    assert worksheet.grid == [
+        HEADER_ROW,
+        ["B0", "Bar 0", "10", ""],
+        ["B1", "Bar 1", "10", ""],
+        ["B0", "Bar 0", "10", ""],
+    ]
+    assert list(client.worksheets) == ["Sheet1"]
+
+
+def test_replace_export_leaves_sheet_intact_when_scrape_fails() -> None:
+    """
+    Test that an error raised by the scrape feeding the export propagates,
+    and the sheet keeps its previous rows.
+    """
+    rows = [HEADER_ROW, ["A1", "Angle", "10", ""]]
+    worksheet = FakeWorksheet(rows)
+    client = FakeClient(worksheet)
+    exporter = GoogleSheetsExporter("prices", "unused.json", client=client)
+
+    def batches():
+        yield _products(2)
+        raise ValueError("supplier failed")
+
+    with pytest.raises(ValueError, match="supplier failed"):
+        exporter.export_stream(batches())
+    assert worksheet.grid == rows
+    assert list(client.worksheets) == ["Sheet1"]
+
+
+def test_diff_export_logs_changes_to_changes_worksheet() -> None:
+    """
+    Test that diff mode appends the price history's changes to the changes
+    worksheet, creating it with a header row.
+    """
+    client = FakeClient(FakeWorksheet([HEADER_ROW]))
+    exporter = GoogleSheetsExporter("prices", "unused.json", mode="diff", client=client)
+
+    exporter.export_changes(
+        [
+            PriceChange(
+                CHANGED,
+                "A1",
+                ProductData(name="Angle", sku="A1", price=10.0, stock=3),
+                ProductData(name="Angle", sku="A1", price=9.5, stock=3),
+            ),
+            PriceChange(REMOVED, "B2", ProductData(name="Bar", sku="B2", price=20.0), None),
+        ]
+    )
+
+    changes = client.worksheet("Changes").grid
+    assert changes[0] == CHANGES_HEADER_ROW
+    assert [row[1:] for row in changes[1:]] == [
+        ["changed", "A1", "Angle", "10", "9.5", "3", "3"],
+        ["removed", "B2", "Bar", "20", "", "", ""],
+    ]
+
+
+def test_diff_export_ignores_number_formats() -> None:
+    """
+    Test that prices shown with a currency format are compared by value,
+    so an unchanged scrape writes nothing.
+    """
+    worksheet = FakeWorksheet(
+        [HEADER_ROW, ["A1", "Angle", "10", "3"], ["B2", "Bar", "22.5", ""]],
+        formats={2: lambda price: f"${price:,.2f}"},
+    )
+    products = [
+        ProductData(name="Angle", sku="A1", price=10.0, stock=3),
+        ProductData(name="Bar", sku="B2", price=22.5),
+    ]
+
+    _exporter(worksheet).export_data(products)
+
+    assert "batch_update" not in worksheet.calls
+
+
+def test_diff_export_leaves_sheet_intact_when_scrape_fails() -> None:
+    """
+    Test that diff mode writes nothing until the batches run out, even when
+    the changes pending exceed a request.
+    """
+    rows = [HEADER_ROW] + [[f"B{i}", f"Bar {i}", "1", ""] for i in range(20)]
+    worksheet = FakeWorksheet(rows)
+
+    def batches():
+        yield _products(20, price=2.0)
+        raise ValueError("supplier failed")
+
+    with pytest.raises(ValueError, match="supplier failed"):
+        _exporter(worksheet, max_cells_per_request=8).export_stream(batches())
+    assert worksheet.grid == rows
@@ -0,0 +1,55 @@
+import pytest
+
+from scraper.parsing.html_toolkit import (
+    DEFAULT_BACKEND,
+    HTML_PARSER,
+    LXML,
+    Selector,
+    extract_region,
+    parse_html,
+)
+
+PAGE = (
+    "<html><body><nav><a class='name'>Home</a></nav>"
+    "<ul class='products'>"
+    "<li class='product featured' data-id='1'><span class='name'>Angle\n  50x50</span>"
+    "<span class='price'>$12.50</span></li>"
+    "<li class='product' data-id='2'><span class='name'>Flat <b>Bar</b></span></li>"
+    "</ul><footer><ul><li>Terms</li></ul></footer></body></html>"
+)
+
+PRODUCT = Selector("li.product")
+NAME = Selector(".name")
+PRICE = Selector(".price")
+
+BACKENDS = [HTML_PARSER] + ([LXML] if DEFAULT_BACKEND == LXML else [])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_selectors_extract_the_same_fields_on_every_backend(backend) -> None:
+    """
+    Test that precompiled selectors give identical, whitespace-normalised
+    results whichever backend built the tree.
+    """
+    items = PRODUCT.select(parse_html(PAGE, backend))
+
+    assert [NAME.text(item) for item in items] == ["Angle 50x50", "Flat Bar"]
+    assert [PRICE.text(item, default="") for item in items] == ["$12.50", ""]
+    assert [PRODUCT.select_one(item) for item in items] == [None, None]
+    assert Selector("li").attr(parse_html(PAGE, backend), "class") == "product featured"
+
+
+def test_extract_region_keeps_only_the_listing() -> None:
+    """
+    Test that the listing region spans to the last end marker, and that the
+    whole page is used when the start marker is missing.
+    """
+    region = extract_region(PAGE, "<ul class='products'", "</ul>")
+
+    assert region.startswith("<ul class='products'")
+    assert "<nav>" not in region
+    assert [NAME.text(item) for item in PRODUCT.select(parse_html(region))] == [
+        "Angle 50x50",
+        "Flat Bar",
+    ]
+    assert extract_region(PAGE, "<table") == PAGE
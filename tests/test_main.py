@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_list_suppliers_does_not_import_scraping_stack() -> None:
+    """
+    Test that listing suppliers does not import the HTTP client, the scraper
+    or its numeric dependencies.
+    """
+    script = (
+        "import runpy, sys\n"
+        "sys.argv = ['main.py', '--list-suppliers']\n"
+        "runpy.run_path('main.py', run_name='__main__')\n"
+        "heavy = ('requests', 'scraper.core.scraper', 'numpy')\n"
+        "print(','.join(name for name in heavy if name in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+    assert result.stdout.strip() == ""
@@ -0,0 +1,52 @@
+from typing import Iterator
+
+import pytest
+
+from scraper.core.metrics import metrics
+from scraper.core.scraper import Scraper
+from scraper.suppliers.dummy.authenticator import DummyAuthenticator
+from scraper.suppliers.dummy.page_fetcher import DummyPageFetcher
+from scraper.suppliers.dummy.parser import DummyParser
+
+dummy_supplier_config = {
+    "name": "dummy_supplier",
+    "authenticator_class": DummyAuthenticator,
+    "page_fetcher_class": DummyPageFetcher,
+    "parser_class": DummyParser,
+}
+
+
+@pytest.fixture
+def enabled_metrics() -> Iterator[None]:
+    metrics.enable()
+    metrics.reset()
+    yield
+    metrics.enabled = False
+    metrics.reset()
+
+
+def test_scrape_records_stage_timers_and_counters(enabled_metrics: None) -> None:
+    """
+    Test that a scrape records login/fetch/parse timings and page and
+    product counts for the supplier.
+    """
+    Scraper().scrape_supplier(dummy_supplier_config)
+
+    recorded = metrics.to_dict()["dummy_supplier"]
+    assert set(recorded["timers"]) == {"login", "fetch", "parse"}
+    assert recorded["timers"]["parse"]["count"] == 1
+    assert recorded["counters"]["pages"] == 1
+    assert recorded["counters"]["products"] == 2
+
+    prometheus = metrics.to_prometheus()
+    assert "# TYPE scraper_stage_seconds_total counter" in prometheus
+    assert 'scraper_products_total{supplier="dummy_supplier"} 2' in prometheus
+
+
+def test_disabled_metrics_record_nothing() -> None:
+    """
+    Test that nothing is collected while metrics are disabled.
+    """
+    Scraper().scrape_supplier(dummy_supplier_config)
+
+    assert metrics.to_dict() == {}
@@ -0,0 +1,103 @@
+import pytest
+
+from scraper.core.replay import ReplayPageFetcher
+from scraper.core.scraper import Scraper
+from scraper.models.page import Page
+from scraper.storage.page_archive import PageArchive, PageArchiveWriter
+from scraper.suppliers.dummy.authenticator import DummyAuthenticator
+from scraper.suppliers.dummy.page_fetcher import DummyPageFetcher
+from scraper.suppliers.dummy.parser import DummyParser
+
+PAGES = [
+    Page("<ul><li>Ångle</li></ul>", url="https://example.test/1", headers={"ETag": '"a"'}),
+    "plain content",
+]
+
+
+@pytest.mark.parametrize("level", [0, 6])
+def test_archive_round_trip_and_resume(tmp_path, level) -> None:
+    """
+    Test that pages come back with their URL and headers, and that reading
+    can resume from the offset reported after any page.
+    """
+    path = str(tmp_path / "pages.arc")
+    writer = PageArchiveWriter(path, compression_level=level)
+    for page in PAGES:
+        writer.write(page)
+    writer.close()
+
+    archive = PageArchive(path)
+    try:
+        (first, offset), (second, _) = list(archive.iter_pages())
+        assert first == PAGES[0]
+        assert first.url == "https://example.test/1" and first.headers == {"ETag": '"a"'}
+        assert second == "plain content" and second.url is None
+        assert list(archive.iter_pages(offset))[0][0] == "plain content"
+    finally:
+        archive.close()
+
+
+def test_incomplete_recording_is_discarded(tmp_path) -> None:
+    path = tmp_path / "pages.arc"
+    writer = PageArchiveWriter(str(path))
+    writer.write("page")
+    writer.close(complete=False)
+
+    assert list(tmp_path.iterdir()) == []
+    (tmp_path / "other").write_bytes(b"not an archive")
+    with pytest.raises(ValueError, match="not a page archive"):
+        PageArchive(str(tmp_path / "other"))
+
+
+def test_recorded_run_replays_without_fetcher(tmp_path) -> None:
+    config = {
+        "name": "dummy_supplier",
+        "authenticator_class": DummyAuthenticator,
+        "page_fetcher_class": DummyPageFetcher,
+        "parser_class": DummyParser,
+    }
+    archive = str(tmp_path / "{name}.arc")
+
+    recorded = Scraper().scrape_supplier({**config, "record_archive": archive})
+    replayed = Scraper().scrape_supplier(
+        {"name": "dummy_supplier", "parser_class": DummyParser, "replay_archive": archive}
+    )
+
+    assert replayed == recorded
+    fetcher = ReplayPageFetcher({"name": "dummy_supplier", "replay_archive": archive})
+    assert len(list(fetcher.fetch_pages(session=None))) > 0
+    assert fetcher.checkpoint_cursor() == (tmp_path / "dummy_supplier.arc").stat().st_size
+
+
+def test_resumed_run_keeps_previous_recording(tmp_path) -> None:
+    """
+    Test that a run resumed from a checkpoint cursor, which does not fetch
+    the pages before it, does not replace the recording with a partial one.
+    """
+    source = str(tmp_path / "source.arc")
+    recording = str(tmp_path / "recording.arc")
+    for path in (source, recording):
+        writer = PageArchiveWriter(path)
+        for page in ("page 1", "page 2", "page 3"):
+            writer.write(page)
+        writer.close()
+    config = {
+        "name": "dummy_supplier",
+        "parser_class": DummyParser,
+        "replay_archive": source,
+        "record_archive": recording,
+        "checkpoint_dir": str(tmp_path / "checkpoints"),
+        "checkpoint_interval": 1,
+    }
+
+    batches = Scraper().iter_products(config)
+    next(batches)
+    next(batches)
+    batches.close()
+    Scraper().scrape_supplier({**config, "resume": True})
+
+    archive = PageArchive(recording)
+    try:
+        assert list(archive) == ["page 1", "page 2", "page 3"]
+    finally:
+        archive.close()
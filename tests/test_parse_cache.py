@@ -0,0 +1,66 @@
+from typing import List
+
+from scraper.core.scraper import Scraper
+from scraper.models.page import Page
+from scraper.models.product import ProductData
+from scraper.suppliers.dummy.authenticator import DummyAuthenticator
+from scraper.suppliers.dummy.page_fetcher import DummyPageFetcher
+from scraper.suppliers.dummy.parser import DummyParser
+
+
+class CountingParser(DummyParser):
+    calls = 0
+
+    def parse(self, html_content: str) -> List[ProductData]:
+        CountingParser.calls += 1
+        return super().parse(html_content)
+
+
+class UrlPageFetcher(DummyPageFetcher):
+    content = "<html>v1</html>"
+
+    def fetch_pages(self, session):
+        yield Page(self.content, url="https://example.test/catalogue")
+
+
+def _config(tmp_path, **overrides) -> dict:
+    return {
+        "name": "dummy_supplier",
+        "authenticator_class": DummyAuthenticator,
+        "page_fetcher_class": DummyPageFetcher,
+        "parser_class": CountingParser,
+        "parse_cache_dir": str(tmp_path),
+        **overrides,
+    }
+
+
+def test_unchanged_pages_are_not_parsed_again(tmp_path) -> None:
+    """
+    Test that a second run over identical pages reuses the cached rows.
+    """
+    CountingParser.calls = 0
+    scraper = Scraper()
+
+    first = scraper.scrape_supplier(_config(tmp_path))
+    second = scraper.scrape_supplier(_config(tmp_path))
+
+    assert second == first
+    assert CountingParser.calls == 1
+
+
+def test_changed_page_or_parser_version_is_parsed_again(tmp_path, monkeypatch) -> None:
+    """
+    Test that new page content at the same URL, or a bumped parser_version,
+    invalidates the cached rows.
+    """
+    CountingParser.calls = 0
+    scraper = Scraper()
+    config = _config(tmp_path, page_fetcher_class=UrlPageFetcher)
+
+    scraper.scrape_supplier(config)
+    monkeypatch.setattr(UrlPageFetcher, "content", "<html>v2</html>")
+    scraper.scrape_supplier(config)
+    scraper.scrape_supplier(config)
+    scraper.scrape_supplier({**config, "parser_version": "2"})
+
+    assert CountingParser.calls == 3
@@ -0,0 +1,124 @@
+import json
+
+from scraper.core.scraper import Scraper
+from scraper.exporters.file_exporters import JsonLinesExporter
+from scraper.models.product import ProductData
+from scraper.models.product_batch import ProductBatch
+from scraper.storage.price_history import ADDED, CHANGED, REMOVED, PriceHistory
+from scraper.suppliers.dummy.authenticator import DummyAuthenticator
+from scraper.suppliers.dummy.page_fetcher import DummyPageFetcher
+from scraper.suppliers.dummy.parser import DummyParser
+
+ANGLE = ProductData(name="Angle", sku="A1", price=10.0, stock=3)
+BAR = ProductData(name="Bar", sku="B1", price=5.0)
+CHANNEL = ProductData(name="Channel", sku="C1", price=7.5, stock=1)
+
+
+def _record(history: PriceHistory, products, complete: bool = True) -> int:
+    run = history.start_run("steel")
+    run.add(products)
+    run.finish(complete=complete)
+    return run.run_id
+
+
+def test_changes_between_runs(tmp_path) -> None:
+    """
+    Test that a run's change set lists new, changed and removed SKUs against
+    the previous state, and that unchanged SKUs are not stored again.
+    """
+    history = PriceHistory(str(tmp_path / "history.sqlite"))
+    first = _record(history, [ANGLE, BAR])
+    cheaper_angle = ProductData(name="Angle", sku="A1", price=9.5, stock=3)
+    second = _record(history, ProductBatch.from_products([cheaper_angle, CHANNEL]))
+
+    changes = {change.sku: change for change in history.changes("steel")}
+
+    assert {sku: change.kind for sku, change in changes.items()} == {
+        "A1": CHANGED,
+        "B1": REMOVED,
+        "C1": ADDED,
+    }
+    assert (changes["A1"].old, changes["A1"].new) == (ANGLE, cheaper_angle)
+    assert changes["B1"].old == BAR and changes["B1"].new is None
+    assert [change.kind for change in history.changes("steel", first)] == [ADDED, ADDED]
+    assert history.latest("steel") == {"A1": cheaper_angle, "C1": CHANNEL}
+    assert history.latest("steel", ["C1", "B1"]) == {"C1": CHANNEL}
+    assert [product for _, product in history.history("steel", "A1")] == [
+        ANGLE,
+        cheaper_angle,
+    ]
+
+    # A repeat of the same catalogue changes nothing
+    _record(history, [cheaper_angle, CHANNEL])
+    assert history.changes("steel") == []
+    assert second == history.last_run_id("steel") - 1
+
+
+def test_incomplete_runs_do_not_remove_products(tmp_path) -> None:
+    history = PriceHistory(str(tmp_path / "history.sqlite"))
+    _record(history, [ANGLE, BAR])
+    _record(history, [CHANNEL], complete=False)
+
+    assert set(history.latest("steel")) == {"A1", "B1", "C1"}
+
+
+def test_scraper_records_completed_runs(tmp_path) -> None:
+    """
+    Test that scraping with 'price_history_path' records the run.
+    """
+    path = str(tmp_path / "history.sqlite")
+    config = {
+        "name": "dummy_supplier",
+        "authenticator_class": DummyAuthenticator,
+        "page_fetcher_class": DummyPageFetcher,
+        "parser_class": DummyParser,
+        "price_history_path": path,
+    }
+
+    products = Scraper().scrape_supplier(config)
+
+    history = PriceHistory(path)
+    assert history.latest("dummy_supplier") == {product.sku: product for product in products}
+    assert len(history.changes("dummy_supplier")) == len(products)
+
+
+def test_scrape_and_export_passes_changes_to_exporter(tmp_path) -> None:
+    """
+    Test that scrape_and_export gives the exporter each completed run's
+    changes, and that file exporters write them beside the export.
+    """
+    config = {
+        "name": "dummy_supplier",
+        "authenticator_class": DummyAuthenticator,
+        "page_fetcher_class": DummyPageFetcher,
+        "parser_class": DummyParser,
+        "price_history_path": str(tmp_path / "history.sqlite"),
+    }
+    exporter = JsonLinesExporter(str(tmp_path / "prices.jsonl.gz"))
+    received = []
+    export_changes = exporter.export_changes
+
+    def _export_changes(changes) -> None:
+        received.append(changes)
+        export_changes(changes)
+
+    exporter.export_changes = _export_changes
+
+    Scraper().scrape_and_export(config, exporter)
+    with open(tmp_path / "prices.changes.jsonl") as f:
+        first = [json.loads(line) for line in f]
+    Scraper().scrape_and_export(config, exporter)
+
+    assert [change.kind for change in received[0]] == [ADDED, ADDED]
+    assert first[0] == {
+        "kind": ADDED,
+        "sku": "DP001",
+        "name": "Dummy Product 1",
+        "old_price": None,
+        "price": 10.0,
+        "old_stock": None,
+        "stock": None,
+    }
+    # The same catalogue again changes nothing
+    assert received[1] == []
+    assert (tmp_path / "prices.changes.jsonl").read_text() == ""
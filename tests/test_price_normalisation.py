@@ -0,0 +1,87 @@
+import math
+
+import pytest
+
+from scraper.core import price_normalisation
+from scraper.core.price_normalisation import PriceNormaliser
+from scraper.core.scraper import Scraper
+from scraper.models.product import ProductData
+from scraper.models.product_batch import ProductBatch
+from scraper.parsing.selector_parser import SelectorParser
+from scraper.suppliers.dummy.authenticator import DummyAuthenticator
+from scraper.suppliers.dummy.page_fetcher import DummyPageFetcher
+from scraper.suppliers.dummy.parser import DummyParser
+
+OPTIONS = {
+    "gst_inclusive": True,
+    "default_unit": "length",
+    "unit_sizes": {"m": 1, "Length": 6},
+    "decimals": 4,
+}
+
+
+def _products():
+    return [
+        ProductData(name="Angle", sku="A1", price=69.0, unit="length"),
+        ProductData(name="Bar", sku="B1", price=11.5, unit="m"),
+        ProductData(name="Channel", sku="C1", price=138.0),
+        ProductData(name="Plate", sku="P1", price=50.0, unit="sheet"),
+    ]
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_batches_and_lists_are_normalised_alike(numpy, monkeypatch) -> None:
+    """
+    Test that GST is removed, prices are divided by the unit's size, products
+    with no unit use the default and unknown units get no normalised price.
+    """
+    if not numpy:
+        monkeypatch.setattr(price_normalisation, "_numpy", lambda: None)
+    elif price_normalisation._numpy() is None:
+        pytest.skip("numpy is not installed")
+    normaliser = PriceNormaliser.from_config({"price_normalisation": OPTIONS})
+
+    products = normaliser.normalise(_products())
+    batch = normaliser.normalise(ProductBatch.from_products(_products()))
+
+    expected = [10.0, 10.0, 20.0, None]
+    assert [product.normalised_price for product in products] == expected
+    assert [product.normalised_price for product in batch] == expected
+    assert list(batch) == products
+
+
+def test_gst_only_without_unit_sizes() -> None:
+    normaliser = PriceNormaliser(gst_inclusive=True, gst_rate=0.25)
+
+    batch = normaliser.normalise(ProductBatch.from_products(_products()))
+
+    assert list(batch.normalised_prices) == pytest.approx([55.2, 9.2, 110.4, 40.0])
+    assert PriceNormaliser.from_config({}) is None
+    with pytest.raises(ValueError, match="positive"):
+        PriceNormaliser(unit_sizes={"m": 0})
+
+
+def test_scraper_normalises_batches_and_parses_units() -> None:
+    products = Scraper().scrape_supplier(
+        config={
+            "name": "dummy_supplier",
+            "authenticator_class": DummyAuthenticator,
+            "page_fetcher_class": DummyPageFetcher,
+            "parser_class": DummyParser,
+            "batch_size": 10,
+            "columnar": True,
+            "price_normalisation": {"gst_inclusive": True},
+        }
+    )
+    assert products
+    for product in products:
+        assert math.isclose(product.normalised_price, product.price / 1.15)
+
+    parser = SelectorParser(
+        {
+            "selectors": {"product": "li", "name": "b", "sku": "i", "price": "s", "unit": "u"},
+            "normalise": {"unit": {"map": {"per 6m length": "Length"}}},
+        }
+    )
+    page = "<ul><li><b>Angle</b><i>A1</i><s>$69</s><u>Per 6m Length</u></li></ul>"
+    assert parser.parse(page)[0].unit == "length"
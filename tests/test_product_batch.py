@@ -0,0 +1,59 @@
+import pickle
+
+from scraper.core.scraper import Scraper
+from scraper.models.page import Page
+from scraper.models.product import ProductData
+from scraper.models.product_batch import ProductBatch, iter_product_rows
+from scraper.suppliers.dummy.authenticator import DummyAuthenticator
+from scraper.suppliers.dummy.page_fetcher import DummyPageFetcher
+from scraper.suppliers.dummy.parser import DummyParser
+
+
+def test_product_batch_round_trips_products() -> None:
+    """
+    Test that a batch gives back the same products, rows and pickles intact.
+    """
+    products = [
+        ProductData(name="Angle", sku="A1", price=10.5),
+        ProductData(name="Bar", sku="B2", price=20.0, stock=0),
+    ]
+    batch = ProductBatch.from_products(products)
+
+    assert len(batch) == 2
+    assert list(batch) == products
+    assert batch[1].stock == 0 and batch[0].stock is None
+    assert list(iter_product_rows(batch)) == list(iter_product_rows(products))
+    assert pickle.loads(pickle.dumps(batch)) == batch
+
+
+def test_scraper_yields_columnar_batches() -> None:
+    """
+    Test that iter_products yields ProductBatch objects when 'columnar' is set.
+    """
+    config = {
+        "name": "dummy_supplier",
+        "authenticator_class": DummyAuthenticator,
+        "page_fetcher_class": DummyPageFetcher,
+        "parser_class": DummyParser,
+        "batch_size": 1,
+        "columnar": True,
+    }
+
+    batches = list(Scraper().iter_products(config))
+
+    assert all(isinstance(batch, ProductBatch) for batch in batches)
+    assert [batch.skus for batch in batches] == [["DP001"], ["DP002"]]
+
+
+def test_product_batch_accepts_str_subclasses() -> None:
+    """
+    Test that names, SKUs and units given as str subclasses (such as Page)
+    are stored as plain strings.
+    """
+    batch = ProductBatch()
+    batch.append(
+        Page("Angle", url="https://example.com/a1"), Page("A1"), 10.0, unit=Page("m")
+    )
+
+    assert list(batch) == [ProductData(name="Angle", sku="A1", price=10.0, unit="m")]
+    assert type(batch.names[0]) is str and type(batch.skus[0]) is str
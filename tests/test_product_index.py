@@ -0,0 +1,89 @@
+import pytest
+
+from scraper.models.product import ProductData
+from scraper.models.product_batch import ProductBatch
+from scraper.storage.price_history import PriceHistory
+from scraper.storage.product_index import (
+    ProductIndex,
+    ProductIndexBuilder,
+    name_trigrams,
+    normalise_sku,
+)
+
+
+@pytest.fixture
+def index(tmp_path):
+    builder = ProductIndexBuilder()
+    builder.add(
+        "steel_and_tube",
+        [
+            ProductData(name="Galvanised Angle 50x50x5", sku="ANG-505", price=42.0, stock=3),
+            ProductData(name="Mild Steel Flat Bar 50x6", sku="FB506", price=18.5),
+        ],
+    )
+    builder.add(
+        "wakefield",
+        ProductBatch.from_products(
+            [
+                ProductData(name="Angle galv 50 x 50 x 5", sku="ang 505", price=39.9, stock=0),
+                ProductData(name="Stainless Sheet 1200x2400", sku="SS-1224", price=310.0, stock=2),
+            ]
+        ),
+    )
+    path = str(tmp_path / "products.idx")
+    builder.write(path)
+    index = ProductIndex.open(path)
+    yield index
+    index.close()
+
+
+def test_sku_lookup_matches_across_suppliers(index) -> None:
+    listings = index.lookup("ang505")
+
+    assert [(listing.supplier, listing.product.price) for listing in listings] == [
+        ("wakefield", 39.9),
+        ("steel_and_tube", 42.0),
+    ]
+    assert index.cheapest("ANG-505").supplier == "wakefield"
+    assert index.cheapest("ANG-505", in_stock=True).supplier == "steel_and_tube"
+    assert index.cheapest("FB506").product == ProductData(
+        name="Mild Steel Flat Bar 50x6", sku="FB506", price=18.5
+    )
+    assert index.lookup("missing") == [] and index.cheapest("missing") is None
+
+
+def test_name_search_ranks_similar_names(index) -> None:
+    results = index.search("galvanised angle 50x50x5")
+
+    assert [result.product.sku for _, result in results] == ["ANG-505", "ang 505"]
+    assert results[0][0] == 1.0
+    assert index.search("sheet stainless")[0][1].product.sku == "SS-1224"
+    assert index.search("") == []
+
+
+def test_index_built_from_price_history(tmp_path) -> None:
+    history = PriceHistory(str(tmp_path / "history.sqlite"))
+    run = history.start_run("steel")
+    run.add([ProductData(name="Angle", sku="A1", price=10.0)])
+    run.finish()
+    path = str(tmp_path / "products.idx")
+
+    ProductIndexBuilder.from_price_history(history).write(path)
+
+    index = ProductIndex.open(path)
+    assert index.suppliers == ["steel"] and len(index) == 1
+    assert index.cheapest("a-1").product.name == "Angle"
+    index.close()
+
+
+def test_normalisation() -> None:
+    assert normalise_sku(" ab-100/x ") == "AB100X"
+    assert name_trigrams("Bar") == {"  b", " ba", "bar", "ar "}
+
+
+def test_rejects_other_files(tmp_path) -> None:
+    path = tmp_path / "products.idx"
+    path.write_bytes(b"not an index" * 10)
+
+    with pytest.raises(ValueError):
+        ProductIndex.open(str(path))
@@ -0,0 +1,58 @@
+import pstats
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from scraper.core.profiling import SupplierProfiler, component_times
+from scraper.core.scraper import Scraper
+from scraper.suppliers.dummy.authenticator import DummyAuthenticator
+from scraper.suppliers.dummy.page_fetcher import DummyPageFetcher
+from scraper.suppliers.dummy.parser import DummyParser
+
+
+def test_profiler_covers_worker_threads(tmp_path) -> None:
+    """
+    Test that a profiled run writes the profile, allocation snapshot and
+    report, including parsing done in a worker thread.
+    """
+    config = {
+        "name": "dummy_supplier",
+        "authenticator_class": DummyAuthenticator,
+        "page_fetcher_class": DummyPageFetcher,
+        "parser_class": DummyParser,
+        "parse_workers": 1,
+        "parse_executor": "thread",
+    }
+
+    with SupplierProfiler(str(tmp_path), "dummy_supplier", top=5) as profiler:
+        Scraper().scrape_supplier(config)
+
+    stats = pstats.Stats(str(tmp_path / "dummy_supplier.prof"))
+    parsed_in = {
+        filename for (filename, _, function_name) in stats.stats if function_name == "parse"
+    }
+    assert any(filename.endswith("dummy/parser.py") for filename in parsed_in)
+    assert component_times(stats)["parser"] > 0
+    assert tracemalloc.Snapshot.load(str(tmp_path / "dummy_supplier.tracemalloc")).traces
+    assert "Top 5 allocation sites" in (tmp_path / "dummy_supplier.txt").read_text()
+    assert profiler.report.startswith("Profile of dummy_supplier")
+    assert not tracemalloc.is_tracing()
+
+
+def _sum_in_thread(count: int) -> int:
+    return sum(range(count))
+
+
+def test_profiler_covers_thread_pool(tmp_path) -> None:
+    """
+    Test that work done in a thread pool is profiled and the pool's threads
+    run normally. From Python 3.12 only one profiler may be active, so the
+    run's own profiler has to cover the pool's threads.
+    """
+    with SupplierProfiler(str(tmp_path), "pool") as profiler:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(_sum_in_thread, [1000] * 4, timeout=10))
+
+    assert results == [sum(range(1000))] * 4
+    stats = pstats.Stats(str(tmp_path / "pool.prof"))
+    assert any(function_name == "_sum_in_thread" for (_, _, function_name) in stats.stats)
+    assert profiler.report.startswith("Profile of pool")
@@ -0,0 +1,120 @@
+from typing import List, Optional
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from scraper.http.resilience import CircuitOpenError, install_resilience, parse_retry_after
+
+
+class ScriptedAdapter(BaseAdapter):
+    """
+    Answers each request with the next status code from a script.
+    """
+
+    def __init__(self, statuses: List[int], headers: dict = None) -> None:
+        super().__init__()
+        self.statuses = list(statuses)
+        self.headers = headers or {}
+        self.sent = 0
+        # Raised by the next send instead of answering
+        self.error: Optional[BaseException] = None
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        self.sent += 1
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+        response = requests.Response()
+        response.status_code = self.statuses.pop(0) if self.statuses else 200
+        response.headers.update(self.headers)
+        response._content = b"ok"
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def _session(adapter: ScriptedAdapter, sleeps: List[float], **config) -> requests.Session:
+    session = requests.Session()
+    session.mount("https://", adapter)
+    install_resilience(session, {"name": "test", **config})
+    session.get_adapter("https://example.test").sleep = sleeps.append
+    return session
+
+
+def test_transient_errors_are_retried_honouring_retry_after() -> None:
+    """
+    Test that 503s are retried, waiting as long as Retry-After asks.
+    """
+    sleeps: List[float] = []
+    adapter = ScriptedAdapter([503, 503, 200], headers={"Retry-After": "3"})
+    session = _session(adapter, sleeps)
+
+    response = session.get("https://example.test/catalogue")
+
+    assert response.status_code == 200
+    assert adapter.sent == 3
+    # Two Retry-After waits, plus any adaptive rate limiting pauses
+    assert sleeps.count(3.0) == 2
+
+
+def test_non_idempotent_requests_are_not_retried_on_server_errors() -> None:
+    """
+    Test that a POST is not replayed after a 500, which may have applied it.
+    """
+    adapter = ScriptedAdapter([500, 200])
+    session = _session(adapter, [])
+
+    response = session.post("https://example.test/login", data={"user": "x"})
+
+    assert response.status_code == 500
+    assert adapter.sent == 1
+
+
+def test_circuit_opens_after_repeated_failures() -> None:
+    """
+    Test that once a host keeps failing, requests fail fast without being sent.
+    """
+    adapter = ScriptedAdapter([500] * 10)
+    session = _session(
+        adapter, [], http_max_retries=0, circuit_failure_threshold=2
+    )
+
+    session.get("https://example.test/a")
+    session.get("https://example.test/a")
+    with pytest.raises(CircuitOpenError):
+        session.get("https://example.test/a")
+
+    assert adapter.sent == 2
+
+
+def test_trial_request_that_raises_does_not_keep_circuit_open() -> None:
+    """
+    Test that a half-open trial ending in an unexpected exception lets the
+    next request through as a new trial.
+    """
+    adapter = ScriptedAdapter([500])
+    session = _session(
+        adapter,
+        [],
+        http_max_retries=0,
+        circuit_failure_threshold=1,
+        circuit_reset_timeout=0,
+    )
+    session.get("https://example.test/a")
+
+    adapter.error = KeyboardInterrupt()
+    with pytest.raises(KeyboardInterrupt):
+        session.get("https://example.test/a")
+
+    assert session.get("https://example.test/a").status_code == 200
+
+
+def test_parse_retry_after_accepts_seconds_and_dates() -> None:
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
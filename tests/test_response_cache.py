@@ -0,0 +1,133 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, List
+
+import pytest
+import requests
+
+from scraper.http import response_cache
+from scraper.http.response_cache import ResponseCache, install_response_cache
+
+
+class EtagHandler(BaseHTTPRequestHandler):
+    """
+    Serves a fixed page with an ETag and answers conditional GETs with 304.
+    """
+
+    requests_seen: List[str] = []
+
+    def do_GET(self) -> None:
+        etag = '"v1"'
+        conditional = self.headers.get("If-None-Match") == etag
+        self.requests_seen.append("304" if conditional else "200")
+        if conditional:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = f"<html>{self.path}</html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server_url() -> Iterator[str]:
+    EtagHandler.requests_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EtagHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_conditional_get_served_from_cache(server_url: str, tmp_path) -> None:
+    """
+    Test that a revalidated page is served from disk when the server
+    answers 304 Not Modified.
+    """
+    session = requests.Session()
+    install_response_cache(session, {"name": "test", "http_cache_dir": str(tmp_path)})
+
+    first = session.get(f"{server_url}/catalogue?page=1")
+    second = session.get(f"{server_url}/catalogue?page=1")
+
+    assert first.from_cache is False
+    assert second.from_cache is True
+    assert second.status_code == 200
+    assert second.text == first.text == "<html>/catalogue?page=1</html>"
+    assert EtagHandler.requests_seen == ["200", "304"]
+
+
+def test_cached_response_can_be_streamed(server_url: str, tmp_path) -> None:
+    session = requests.Session()
+    install_response_cache(session, {"name": "test", "http_cache_dir": str(tmp_path)})
+    session.get(f"{server_url}/catalogue")
+
+    cached = session.get(f"{server_url}/catalogue", stream=True)
+
+    assert cached.from_cache is True
+    assert b"".join(cached.iter_content(chunk_size=4)) == b"<html>/catalogue</html>"
+    assert list(cached.iter_lines()) == [b"<html>/catalogue</html>"]
+    cached.close()
+
+
+def test_fresh_entries_skip_the_network(server_url: str, tmp_path) -> None:
+    """
+    Test that entries within the TTL are served without any request.
+    """
+    config = {"name": "test", "http_cache_dir": str(tmp_path), "http_cache_ttl": 60}
+    session = requests.Session()
+    install_response_cache(session, config)
+
+    session.get(f"{server_url}/a")
+    cached = session.get(f"{server_url}/a")
+
+    assert cached.from_cache is True
+    assert EtagHandler.requests_seen == ["200"]
+
+
+def test_cache_evicts_least_recently_used(server_url: str, tmp_path) -> None:
+    """
+    Test that the cache stays under its size limit by dropping the entry
+    that was used least recently.
+    """
+    cache = ResponseCache(str(tmp_path), max_bytes=40)
+    for path in ("/a", "/b"):
+        cache.put(requests.get(f"{server_url}{path}"))
+    cache.get(f"{server_url}/a")
+    cache.put(requests.get(f"{server_url}/c"))
+
+    assert cache.get(f"{server_url}/a") is not None
+    assert cache.get(f"{server_url}/b") is None
+    assert cache.get(f"{server_url}/c") is not None
+
+
+def test_installing_twice_opens_one_cache(tmp_path, monkeypatch) -> None:
+    """
+    Test that installing the cache on a session that already has one does
+    not open another (whose connection would never be closed).
+    """
+    opened = []
+
+    class CountingCache(ResponseCache):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            opened.append(self)
+
+    monkeypatch.setattr(response_cache, "ResponseCache", CountingCache)
+    config = {"name": "etag", "http_cache_dir": str(tmp_path)}
+    session = requests.Session()
+
+    install_response_cache(session, config)
+    install_response_cache(session, config)
+
+    assert len(opened) == 1
+    session.close()
@@ -0,0 +1,80 @@
+from concurrent.futures import wait
+
+import pytest
+
+from scraper.scheduler import DEFAULT_INTERVAL, Scheduler, parse_interval
+
+CONFIGS = {
+    "steel": {"schedule_interval": "1h", "schedule_priority": 10},
+    "slow": {"schedule_interval": "1d"},
+    "hourly_low": {"schedule_interval": 3600},
+    "unscheduled": {},
+}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _run_due(scheduler: Scheduler) -> None:
+    wait(scheduler.run_due())
+
+
+def test_suppliers_run_on_their_intervals_by_priority() -> None:
+    """
+    Test that due suppliers take a limited concurrency budget in priority
+    order, and each is rescheduled one interval after it started.
+    """
+    clock = FakeClock()
+    runs = []
+    scheduler = Scheduler.from_configs(CONFIGS, runs.append, max_concurrency=1, clock=clock)
+    try:
+        _run_due(scheduler)
+        assert runs == ["steel"]
+
+        # The rest of the first round, one at a time
+        for _ in range(3):
+            _run_due(scheduler)
+        assert sorted(runs[1:]) == ["hourly_low", "slow", "unscheduled"]
+
+        clock.now += 3600
+        _run_due(scheduler)
+        _run_due(scheduler)
+        _run_due(scheduler)
+        assert runs[4:] == ["steel", "hourly_low"]
+
+        assert dict(scheduler.schedule()) == {
+            "steel": 3600,
+            "hourly_low": 3600,
+            "slow": DEFAULT_INTERVAL - 3600,
+            "unscheduled": DEFAULT_INTERVAL - 3600,
+        }
+    finally:
+        scheduler.close()
+
+
+def test_failed_runs_are_rescheduled() -> None:
+    clock = FakeClock()
+
+    def _fail(name: str) -> None:
+        raise ValueError("supplier down")
+
+    scheduler = Scheduler.from_configs({"steel": {"schedule_interval": "30m"}}, _fail, clock=clock)
+    try:
+        _run_due(scheduler)
+        assert scheduler.schedule() == [("steel", 1800)]
+        assert scheduler.seconds_until_next() == 1800
+    finally:
+        scheduler.close()
+
+
+def test_parse_interval() -> None:
+    assert parse_interval("90s") == 90
+    assert parse_interval("1.5h") == 5400
+    assert parse_interval(60) == 60
+    with pytest.raises(ValueError):
+        parse_interval("hourly")
@@ -1,4 +1,8 @@
+from typing import List
+
 from scraper.core.scraper import Scraper
+from scraper.interfaces.exporter import Exporter
+from scraper.models.product import ProductData
 from scraper.suppliers.dummy.authenticator import DummyAuthenticator
 from scraper.suppliers.dummy.page_fetcher import DummyPageFetcher
 from scraper.suppliers.dummy.parser import DummyParser
@@ -39,5 +43,62 @@ def test_dummy_scraper_returns_expected_number_of_products() -> None:
     assert len(product_data_list) == expected_product_count
 
 
+def test_dummy_scraper_pipelined_parsing_matches_inline() -> None:
+    """
+    Test that parsing in a pool of worker processes or threads returns the
+    same products as parsing inline.
+    """
+    scraper = Scraper()
+    inline = scraper.scrape_supplier(config=dummy_supplier_config)
+
+    for executor in ("process", "thread"):
+        pipelined = scraper.scrape_supplier(
+            config={
+                **dummy_supplier_config,
+                "parse_workers": 2,
+                "parse_executor": executor,
+            }
+        )
+        assert pipelined == inline
+
+
+def test_dummy_scraper_iter_products_yields_batches() -> None:
+    """
+    Test that iter_products streams the products in batches of the
+    configured size.
+    """
+    scraper = Scraper()
+    batches = list(
+        scraper.iter_products(config={**dummy_supplier_config, "batch_size": 1})
+    )
+
+    assert [len(batch) for batch in batches] == [1, 1]
+    assert [batch[0].sku for batch in batches] == ["DP001", "DP002"]
+
+
+def test_scrape_and_export_streams_batches_to_exporter() -> None:
+    """
+    Test that scrape_and_export hands each batch to the exporter.
+    """
+
+    class CollectingExporter(Exporter):
+        def __init__(self) -> None:
+            self.batches: List[List[ProductData]] = []
+
+        def export_data(self, product_data: List[ProductData]) -> None:
+            self.batches.append(product_data)
+
+        def export_stream(self, batches) -> int:
+            for batch in batches:
+                self.batches.append(batch)
+            return sum(len(batch) for batch in self.batches)
+
+    exporter = CollectingExporter()
+    exported = Scraper().scrape_and_export(dummy_supplier_config, exporter)
+
+    assert exported == 2
+    assert len(exporter.batches) == 1
+
+
 # Add more tests here to cover different aspects of the dummy scraper,
 # or tests for other components/suppliers as you add them.
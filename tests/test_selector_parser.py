@@ -0,0 +1,85 @@
+import pytest
+
+from scraper import supplier_manager
+from scraper.models.product import ProductData
+from scraper.parsing.html_toolkit import DEFAULT_BACKEND, HTML_PARSER, LXML
+from scraper.parsing.selector_parser import SelectorParser, parse_number
+
+PAGE = """
+<html><body><nav><div class="item">Not a product</div></nav>
+<div class="listing">
+  <div class="item" data-sku="ab-1"><h2> Angle
+      50x50 </h2><p class="price">1.234,50 €</p><p class="stock">Out of stock</p></div>
+  <div class="item" data-sku="ab-2"><h2>Flat Bar</h2><p class="price">12,00 €</p>
+      <p class="stock">In stock: 7</p></div>
+  <div class="item" data-sku="ab-3"><h2>No price</h2></div>
+</div></body></html>
+"""
+
+CONFIG = {
+    "name": "configured_supplier",
+    "listing_region": {"start": '<div class="listing"', "end": "</div></body>"},
+    "selectors": {
+        "product": "div.item",
+        "name": "h2",
+        "sku": {"attr": "data-sku"},
+        "price": ".price",
+        "stock": ".stock",
+    },
+    "normalise": {
+        "price": {"decimal_separator": ","},
+        "stock": {"map": {"Out of stock": 0}},
+        "sku": {"upper": True},
+    },
+}
+
+BACKENDS = [HTML_PARSER] + ([LXML] if DEFAULT_BACKEND == LXML else [])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_selector_parser_extracts_and_normalises(backend) -> None:
+    """
+    Test that products are extracted from the listing region only, fields
+    are normalised, and products missing a price are skipped.
+    """
+    parser = SelectorParser({**CONFIG, "html_backend": backend})
+
+    assert parser.parse(PAGE) == [
+        ProductData(name="Angle 50x50", sku="AB-1", price=1234.5, stock=0),
+        ProductData(name="Flat Bar", sku="AB-2", price=12.0, stock=7),
+    ]
+
+
+def test_parse_number_handles_currency_and_separators() -> None:
+    assert parse_number("NZD $1,234.50 ex GST") == 1234.5
+    assert parse_number("1 234,5", decimal_separator=",") == 1234.5
+    assert parse_number("Call for price") is None
+
+
+def test_selector_parser_rejects_incomplete_configuration() -> None:
+    with pytest.raises(ValueError, match="price"):
+        SelectorParser({"selectors": {"product": "li", "name": ".n", "sku": ".s"}})
+
+
+def test_suppliers_configured_only_in_yaml_are_discovered(tmp_path, monkeypatch) -> None:
+    """
+    Test that a supplier with selectors but no directory uses the generic
+    scraper, alongside suppliers that have their own module.
+    """
+    (tmp_path / "scraper" / "suppliers" / "handmade").mkdir(parents=True)
+    (tmp_path / "scraper" / "suppliers" / "handmade" / "scrape.py").write_text("")
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "suppliers.yaml").write_text(
+        "configured:\n  selectors: {product: li, name: .n, sku: .s, price: .p}\n"
+        "unconfigured:\n  username: someone\n"
+    )
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(supplier_manager, "_loaded_suppliers", {})
+
+    supplier_manager.load_all_suppliers()
+
+    assert supplier_manager.get_available_suppliers() == ["configured", "handmade"]
+    assert (
+        supplier_manager._loaded_suppliers["configured"]["module_path"]
+        == supplier_manager.GENERIC_SUPPLIER_MODULE
+    )
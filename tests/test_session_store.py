@@ -0,0 +1,230 @@
+import os
+from typing import Iterator, List
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from scraper.core.scraper import Scraper
+from scraper.http import session_store
+from scraper.http.session_store import login_with_cache
+from scraper.interfaces.authenticator import Authenticator
+from scraper.interfaces.page_fetcher import PageFetcher
+from scraper.interfaces.parser import Parser
+from scraper.models.product import ProductData
+
+
+class SiteAdapter(BaseAdapter):
+    """
+    Answers the session check with 200 while the session cookie is accepted,
+    and redirects to the login form otherwise.
+    """
+
+    def __init__(self, accept_sessions: bool = True) -> None:
+        super().__init__()
+        self.accept_sessions = accept_sessions
+        self.checks = 0
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        self.checks += 1
+        response = requests.Response()
+        logged_in = "sid=abc" in (request.headers.get("Cookie") or "")
+        response.status_code = 200 if logged_in and self.accept_sessions else 302
+        response._content = b""
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+class CountingAuthenticator(Authenticator):
+    def __init__(self, config: dict) -> None:
+        self.config = config
+        self.logins = 0
+        self._session = requests.Session()
+        self._session.mount("https://", config["adapter"])
+
+    def login(self) -> requests.Session:
+        self.logins += 1
+        self._session.cookies.set("sid", "abc", domain="example.test", path="/")
+        self._session.headers["Authorization"] = "Bearer token"
+        return self._session
+
+    def get_session(self) -> requests.Session:
+        return self._session
+
+
+@pytest.fixture(autouse=True)
+def empty_memory_cache(monkeypatch) -> None:
+    monkeypatch.setattr(session_store, "_memory", {})
+
+
+def _config(tmp_path, adapter: SiteAdapter, **extra) -> dict:
+    return {
+        "name": "cached_supplier",
+        "session_cache_dir": str(tmp_path),
+        "session_check_url": "https://example.test/account",
+        "adapter": adapter,
+        **extra,
+    }
+
+
+def test_session_is_reused_from_disk_across_runs(tmp_path, monkeypatch) -> None:
+    """
+    Test that a later run restores the saved cookies and headers instead of
+    logging in again, and that the cache file is private.
+    """
+    adapter = SiteAdapter()
+    first = CountingAuthenticator(_config(tmp_path, adapter))
+    login_with_cache(first, first.config)
+    assert first.logins == 1
+    assert oct(os.stat(tmp_path / "cached_supplier.session.json").st_mode & 0o777) == "0o600"
+
+    # A new process only has the file
+    monkeypatch.setattr(session_store, "_memory", {})
+    second = CountingAuthenticator(_config(tmp_path, adapter))
+    session = login_with_cache(second, second.config)
+
+    assert second.logins == 0
+    assert session is second.get_session()
+    assert session.headers["Authorization"] == "Bearer token"
+    assert adapter.checks == 1
+
+
+def test_rejected_session_logs_in_again(tmp_path) -> None:
+    """
+    Test that a cached session the site no longer accepts is replaced.
+    """
+    adapter = SiteAdapter()
+    first = CountingAuthenticator(_config(tmp_path, adapter))
+    login_with_cache(first, first.config)
+
+    adapter.accept_sessions = False
+    second = CountingAuthenticator(_config(tmp_path, adapter))
+    login_with_cache(second, second.config)
+
+    assert second.logins == 1
+
+
+def test_expired_session_is_not_reused(tmp_path) -> None:
+    """
+    Test that sessions older than the TTL are not even checked.
+    """
+    adapter = SiteAdapter()
+    first = CountingAuthenticator(_config(tmp_path, adapter, session_ttl=0))
+    login_with_cache(first, first.config)
+
+    second = CountingAuthenticator(_config(tmp_path, adapter, session_ttl=0))
+    login_with_cache(second, second.config)
+
+    assert second.logins == 1
+    assert adapter.checks == 0
+
+
+class HookAuthenticator(CountingAuthenticator):
+    """
+    Checks restored sessions itself, without a check URL.
+    """
+
+    def is_logged_in(self, session: requests.Session) -> bool:
+        return self.config["adapter"].accept_sessions
+
+
+def test_sessions_that_cannot_be_checked_are_not_reused_by_default(tmp_path) -> None:
+    """
+    Test that without a check URL or is_logged_in a fresh login is made
+    every time, unless 'session_cache' is set explicitly.
+    """
+    adapter = SiteAdapter()
+    config = _config(tmp_path, adapter, session_check_url=None)
+    for _ in range(2):
+        authenticator = CountingAuthenticator(config)
+        login_with_cache(authenticator, config)
+        assert authenticator.logins == 1
+
+    trusted_config = {**config, "session_cache": True}
+    login_with_cache(CountingAuthenticator(trusted_config), trusted_config)
+    trusted = CountingAuthenticator(trusted_config)
+    session = login_with_cache(trusted, trusted_config)
+    assert trusted.logins == 0 and session.from_session_cache
+
+
+def test_authenticator_checks_restored_session(tmp_path) -> None:
+    adapter = SiteAdapter()
+    config = _config(tmp_path, adapter, session_check_url=None)
+    login_with_cache(HookAuthenticator(config), config)
+
+    reused = HookAuthenticator(config)
+    login_with_cache(reused, config)
+    adapter.accept_sessions = False
+    rejected = HookAuthenticator(config)
+    login_with_cache(rejected, config)
+
+    assert (reused.logins, rejected.logins) == (0, 1)
+    assert adapter.checks == 0
+
+
+class SitePageFetcher(PageFetcher):
+    """
+    Serves a product page to the current login and a login form otherwise.
+    """
+
+    def __init__(self, config: dict) -> None:
+        self.config = config
+
+    def fetch_pages(self, session: requests.Session) -> Iterator[str]:
+        if session.cookies.get("sid") == self.config["site"]["sid"]:
+            yield "products"
+        else:
+            yield "login form"
+
+
+class SiteParser(Parser):
+    def __init__(self, config: dict) -> None:
+        pass
+
+    def parse(self, html_content: str) -> List[ProductData]:
+        if html_content != "products":
+            return []
+        return [ProductData(name="Angle", sku="A1", price=10.0)]
+
+
+class RotatingAuthenticator(CountingAuthenticator):
+    """
+    Each login gets a new session id; the site only accepts the latest.
+    """
+
+    def login(self) -> requests.Session:
+        site = self.config["site"]
+        site["sid"] = f"sid{int(site['sid'][3:]) + 1}"
+        self._session.cookies.set("sid", site["sid"], domain="", path="/")
+        return self._session
+
+
+def test_empty_run_with_cached_session_logs_in_again(tmp_path) -> None:
+    """
+    Test that a run finding no products with a reused session discards it,
+    logs in again and scrapes with the new session.
+    """
+    site = {"sid": "sid0"}
+    config = _config(
+        tmp_path,
+        SiteAdapter(),
+        session_check_url=None,
+        session_cache=True,
+        site=site,
+        authenticator_class=RotatingAuthenticator,
+        page_fetcher_class=SitePageFetcher,
+        parser_class=SiteParser,
+    )
+    assert len(Scraper().scrape_supplier(config)) == 1
+
+    # The site expires the cached session
+    site["sid"] = "sid5"
+    products = Scraper().scrape_supplier(config)
+
+    assert [product.sku for product in products] == ["A1"]
+    assert site["sid"] == "sid6"
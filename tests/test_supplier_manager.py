@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from scraper import supplier_manager
+
+
+@pytest.fixture
+def fake_suppliers(monkeypatch: pytest.MonkeyPatch) -> dict:
+    """
+    Replaces the loaded supplier registry with an empty one for the test.
+    """
+    registry: dict = {}
+    monkeypatch.setattr(supplier_manager, "_loaded_suppliers", registry)
+    return registry
+
+
+def test_run_suppliers_isolates_failures(fake_suppliers: dict) -> None:
+    """
+    Test that one failing supplier does not stop the others from running.
+    """
+    ran = []
+
+    def ok_run(config: dict) -> None:
+        ran.append(config["name"])
+
+    def failing_run(config: dict) -> None:
+        raise RuntimeError("supplier site is down")
+
+    fake_suppliers["good"] = {"run_function": ok_run, "config": {"name": "good"}}
+    fake_suppliers["bad"] = {"run_function": failing_run, "config": {"name": "bad"}}
+
+    results = supplier_manager.run_suppliers(["bad", "good"], max_workers=2)
+
+    assert list(results) == ["bad", "good"]
+    assert isinstance(results["bad"], RuntimeError)
+    assert results["good"] is None
+    assert ran == ["good"]
+
+
+def test_run_suppliers_runs_in_parallel(fake_suppliers: dict) -> None:
+    """
+    Test that suppliers overlap when more than one worker is allowed.
+    """
+    barrier = threading.Barrier(3, timeout=5)
+
+    def waiting_run(config: dict) -> None:
+        # Only passes if all three suppliers are running at the same time
+        barrier.wait()
+
+    for name in ("a", "b", "c"):
+        fake_suppliers[name] = {"run_function": waiting_run, "config": {}}
+
+    results = supplier_manager.run_suppliers(["a", "b", "c"], max_workers=3)
+
+    assert all(error is None for error in results.values())